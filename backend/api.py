@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from backend.data_refresher import refresh_data, get_minutes_since_refresh
 from backend.historical_tracker import HistoricalTracker
+from backend.metrics_store import MetricsStore
 
 app = FastAPI(
     title="SignalVane API",
@@ -55,6 +56,8 @@ def root():
             "/trends": "Get trend indicators for all narratives",
             "/ideas": "Get build ideas for all narratives",
             "/snapshot": "Get current data snapshot with metadata",
+            "/metrics": "Get numeric metrics with percent changes and sparklines",
+            "/metrics/{name}": "Get the time series for one metric",
             "/refresh": "Trigger data refresh (POST)",
             "/health": "API health check"
         },
@@ -140,24 +143,59 @@ def get_snapshot() -> Dict[str, Any]:
     """
     return load_json_file("snapshot.json")
 
+@app.get("/metrics")
+def get_metrics(window_days: int = 14) -> List[Dict[str, Any]]:
+    """
+    Get latest metric values with percent change and sparkline over the window
+
+    Query params:
+        - window_days: Window for percent change / sparkline (default 14)
+    """
+    return MetricsStore().summaries(window_days=window_days)
+
+@app.get("/metrics/{metric_name}")
+def get_metric_series(metric_name: str, window_days: int = 14) -> Dict[str, Any]:
+    """Get the numeric time series for one metric"""
+    store = MetricsStore()
+    for metric in store.catalog:
+        if metric.lower() == metric_name.lower():
+            timestamps, values = store.read(metric, since=datetime.now().timestamp() - window_days * 86400)
+            return {
+                "metric": metric,
+                "unit": store.catalog[metric]["unit"],
+                "timestamps": list(timestamps),
+                "values": list(values)
+            }
+
+    raise HTTPException(status_code=404, detail=f"Metric '{metric_name}' not found")
+
 @app.post("/refresh")
-def trigger_refresh(regenerate: bool = False) -> Dict[str, Any]:
+def trigger_refresh(regenerate: bool = False, force_regenerate: bool = False) -> Dict[str, Any]:
     """
     Trigger data refresh
 
     Query params:
-        - regenerate: If true, regenerate narratives with AI (slower)
+        - regenerate: If true, regenerate narratives with AI (slower) when signals changed
+        - force_regenerate: If true, regenerate even if signals are unchanged
     """
     try:
-        success, timestamp = refresh_data(force=True, regenerate_narratives=regenerate)
+        regenerate = regenerate or force_regenerate
+        success, timestamp, outcome = refresh_data(force=True, regenerate_narratives=regenerate,
+                                                   force_regenerate=force_regenerate)
 
         if success:
-            return {
+            response = {
                 "status": "success",
                 "timestamp": timestamp,
-                "regenerated": regenerate,
+                # The generator reuses narratives when signals have not materially
+                # changed, and a failed generation falls back to a quick refresh
+                "regenerated": outcome["narratives"] == "regenerated",
+                "narratives": outcome["narratives"],
                 "message": "Data refreshed successfully"
             }
+            if regenerate:
+                response["signal_similarity"] = outcome["signal_similarity"]
+            return response
         else:
             raise HTTPException(status_code=500, detail="Refresh failed")
 
@@ -0,0 +1,160 @@
+"""
+Burst Detection for SignalVane
+Scores keywords by how far their current-bucket frequency rises above
+their own baseline, so surging terms outrank always-popular ones.
+
+Each time bucket (default: one day) holds a Count-Min sketch of term
+counts plus a bounded set of heavy-hitter candidates, so memory stays
+fixed however large the vocabulary grows.
+"""
+import os
+import sys
+import json
+import math
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.sketches import CountMinSketch
+from backend.text_signals import extract_terms
+
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(__file__), "data", "burst_state.json")
+
+# Candidate terms tracked per bucket (pruned by sketch estimate)
+MAX_CANDIDATES = 500
+# Document IDs remembered per bucket so re-fetched posts/repos are counted once
+MAX_SEEN_DOCS = 20000
+
+class BurstDetector:
+    def __init__(self, state_file=DEFAULT_STATE_FILE, bucket_hours=24, baseline_buckets=7,
+                 sketch_width=1024, sketch_depth=4):
+        self.state_file = state_file
+        self.bucket_seconds = bucket_hours * 3600
+        self.baseline_buckets = baseline_buckets
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.buckets = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {
+            int(start): {
+                "sketch": CountMinSketch.from_dict(bucket["sketch"]),
+                "candidates": bucket["candidates"],
+                "seen": set(bucket["seen"])
+            }
+            for start, bucket in data.get("buckets", {}).items()
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        data = {
+            "buckets": {
+                str(start): {
+                    "sketch": bucket["sketch"].to_dict(),
+                    "candidates": bucket["candidates"],
+                    "seen": list(bucket["seen"])
+                }
+                for start, bucket in self.buckets.items()
+            }
+        }
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _bucket(self, timestamp):
+        start = int(timestamp // self.bucket_seconds * self.bucket_seconds)
+        if start not in self.buckets:
+            bucket = {
+                "sketch": CountMinSketch(self.sketch_width, self.sketch_depth),
+                "candidates": {},
+                "seen": set()
+            }
+            self.buckets[start] = bucket
+            # Keep the newest bucket plus the baseline window; a bucket older than
+            # that is returned detached so late documents are simply dropped
+            for old in sorted(self.buckets)[:-(self.baseline_buckets + 1)]:
+                del self.buckets[old]
+            return bucket
+        return self.buckets[start]
+
+    def add_terms(self, terms, timestamp=None, bucket=None):
+        """Count already-extracted terms into the bucket for `timestamp`"""
+        bucket = bucket or self._bucket(timestamp or time.time())
+        sketch, candidates = bucket["sketch"], bucket["candidates"]
+        for term in terms:
+            sketch.add(term)
+            candidates[term] = candidates.get(term, 0) + 1
+
+        if len(candidates) > 2 * MAX_CANDIDATES:
+            keep = sorted(candidates, key=sketch.estimate, reverse=True)[:MAX_CANDIDATES]
+            bucket["candidates"] = {term: candidates[term] for term in keep}
+
+    def add_documents(self, documents, timestamp=None):
+        """
+        Count (doc_id, text, created_at) documents into the bucket of their
+        creation time (or `timestamp` / now when created_at is None), skipping
+        IDs already counted in that bucket.
+
+        Returns: number of documents counted
+        """
+        counted = 0
+        for doc_id, text, created_at in documents:
+            bucket = self._bucket(created_at or timestamp or time.time())
+            if not text or doc_id in bucket["seen"]:
+                continue
+            if len(bucket["seen"]) < MAX_SEEN_DOCS:
+                bucket["seen"].add(doc_id)
+            self.add_terms(extract_terms(text), bucket=bucket)
+            counted += 1
+        return counted
+
+    def emerging_terms(self, n=10, min_count=3, timestamp=None):
+        """
+        Rank current-bucket terms by burst z-score against the baseline buckets.
+
+        The expected count is the term's mean baseline rate scaled to the current
+        bucket's volume; variance is floored at the Poisson variance.
+
+        Returns:
+            list of dicts with term, count, expected, growth and score
+        """
+        current_start = int((timestamp or time.time()) // self.bucket_seconds * self.bucket_seconds)
+        current = self.buckets.get(current_start)
+        if not current or not current["sketch"].total:
+            return []
+
+        baseline = [b for start, b in self.buckets.items() if start < current_start and b["sketch"].total]
+        current_total = current["sketch"].total
+
+        scored = []
+        for term in current["candidates"]:
+            count = current["sketch"].estimate(term)
+            if count < min_count:
+                continue
+
+            rates = [b["sketch"].estimate(term) / b["sketch"].total for b in baseline]
+            mean_rate = sum(rates) / len(rates) if rates else 0.0
+            var_rate = (sum((r - mean_rate) ** 2 for r in rates) / (len(rates) - 1)) if len(rates) > 1 else 0.0
+
+            expected = mean_rate * current_total
+            variance = max(var_rate * current_total ** 2, expected) + 1
+            score = (count - expected) / math.sqrt(variance)
+
+            scored.append({
+                "term": term,
+                "count": count,
+                "expected": round(expected, 1),
+                "growth": round(count / expected, 2) if expected else None,
+                "score": round(score, 2)
+            })
+
+        scored.sort(key=lambda t: t["score"], reverse=True)
+        return scored[:n]
@@ -0,0 +1,258 @@
+"""
+Commit Velocity Engine for SignalVane
+Backs the ">20 commits in 14 days" ranking with real commit counts.
+
+Commit histories are fetched with batched GitHub GraphQL queries (one query
+covers `batch_size` repos, following history pages until exhausted) and
+cached per repo as {commit oid: commit day} with a watermark, so each
+refresh only asks GitHub for commits near or after the previous run.
+
+history(since:) filters on committedDate, so a commit pushed after the last
+run but committed before it would be missed. Each refresh therefore re-reads
+`overlap_days` before the watermark and drops commits already counted.
+"""
+import os
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend import http_client
+from backend.rate_limiter import get_token_pool, PRIORITY_LOW
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(__file__), "data", "commit_velocity.json")
+
+# Methodology threshold from the README
+VELOCITY_THRESHOLD = 20
+# Commits per history page (GraphQL maximum)
+HISTORY_PAGE_SIZE = 100
+# Pages followed per repo per refresh (bounds cost for extremely busy repos)
+MAX_HISTORY_PAGES = 10
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+def _iso(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class CommitVelocityTracker:
+    def __init__(self, state_file=DEFAULT_STATE_FILE, endpoint=None, token=None,
+                 window_days=14, batch_size=25, max_workers=4, timeout=30, overlap_days=3,
+                 page_size=HISTORY_PAGE_SIZE):
+        """
+        Args:
+            state_file: JSON file holding per-repo commit days and watermarks
+            endpoint: GraphQL endpoint (GITHUB_GRAPHQL_URL env or api.github.com);
+                point it at a local fixture server for tests
+            token: Fixed GitHub token (defaults to the shared rate-limited token pool)
+            window_days: Velocity window
+            batch_size: Repos per GraphQL query
+            max_workers: Concurrent GraphQL queries
+            overlap_days: Days re-read before the watermark to catch commits
+                pushed after their commit date
+            page_size: Commits per history page
+        """
+        self.state_file = state_file
+        self.endpoint = endpoint or os.getenv("GITHUB_GRAPHQL_URL", GITHUB_GRAPHQL_URL)
+        self.token = token
+        self.token_pool = get_token_pool()
+        self.window_days = window_days
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.overlap_days = overlap_days
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {"repos": {}}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _build_query(self, batch):
+        """
+        Build one GraphQL query covering every repo in the batch.
+        batch: list of (full_name, since_iso, after_cursor or None)
+        """
+        parts = []
+        for i, (full_name, since, after) in enumerate(batch):
+            owner, _, name = full_name.partition("/")
+            after_arg = f", after: {json.dumps(after)}" if after else ""
+            parts.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{\n"
+                f"  defaultBranchRef {{ target {{ ... on Commit {{\n"
+                f"    history(since: {json.dumps(since)}, first: {self.page_size}{after_arg}) {{\n"
+                f"      nodes {{ oid committedDate }} pageInfo {{ hasNextPage endCursor }}\n"
+                f"    }}\n"
+                f"  }} }} }}\n"
+                f"}}"
+            )
+        return "query {\n" + "\n".join(parts) + "\n}"
+
+    def _fetch_batch(self, batch):
+        """
+        Run one batched query.
+        Returns {full_name: ([(oid, committedDate), ...], next_cursor or None)}
+        """
+        headers = {"Content-Type": "application/json"}
+        token = self.token or self.token_pool.acquire("graphql", PRIORITY_LOW)
+        if token:
+            headers["Authorization"] = f"bearer {token}"
+
+        response = http_client.post(
+            self.endpoint,
+            json={"query": self._build_query(batch)},
+            headers=headers,
+            timeout=self.timeout
+        )
+        if not self.token:
+            self.token_pool.update(token, response.headers)
+        response.raise_for_status()
+        data = response.json().get("data") or {}
+
+        results = {}
+        for i, (full_name, _, _) in enumerate(batch):
+            repo = data.get(f"r{i}")
+            # Missing / renamed / empty repos come back as null
+            try:
+                history = repo["defaultBranchRef"]["target"]["history"]
+            except (TypeError, KeyError):
+                continue
+            commits = [(node["oid"], node["committedDate"]) for node in history.get("nodes", [])]
+            page_info = history.get("pageInfo") or {}
+            cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
+            results[full_name] = (commits, cursor)
+        return results
+
+    def _fetch_histories(self, pending):
+        """
+        Fetch every page of history for the pending repos, batching each round
+        of pages across repos.
+        pending: list of (full_name, since_iso)
+        Returns ({full_name: [(oid, committedDate), ...]}, {repos with pages failed or left unread})
+        """
+        histories = {}
+        partial = set()
+        queue = [(full_name, since, None) for full_name, since in pending]
+        pages = 0
+
+        while queue and pages < MAX_HISTORY_PAGES:
+            pages += 1
+            batches = [queue[i:i + self.batch_size] for i in range(0, len(queue), self.batch_size)]
+            next_queue = []
+
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as executor:
+                futures = {executor.submit(self._fetch_batch, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        print(f"Error fetching commit history batch: {e}")
+                        partial.update(full_name for full_name, _, after in futures[future] if after)
+                        continue
+                    since_by_repo = {full_name: since for full_name, since, _ in futures[future]}
+                    for full_name, (commits, cursor) in results.items():
+                        histories.setdefault(full_name, []).extend(commits)
+                        if cursor:
+                            next_queue.append((full_name, since_by_repo[full_name], cursor))
+            queue = next_queue
+
+        if queue:
+            # Busy repos past the page cap keep what was read (a lower bound) but
+            # not a new watermark, so the next run reads from the old one again
+            print(f"⚠️  Commit history truncated at {MAX_HISTORY_PAGES} pages for {len(queue)} repos")
+            partial.update(full_name for full_name, _, _ in queue)
+        return histories, partial
+
+    def _apply(self, full_name, commits, fetched_at, complete=True):
+        """
+        Fold newly fetched commits into the repo's commit days (oids dedupe the overlap).
+        The watermark only advances when every page was read.
+        """
+        entry = self.state["repos"].setdefault(full_name, {"commits": {}})
+        known = entry.setdefault("commits", {})
+
+        for oid, committed in commits:
+            known[oid] = committed[:10]
+
+        cutoff = (_utcnow() - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        entry["commits"] = {oid: day for oid, day in known.items() if day >= cutoff}
+        entry.pop("daily", None)
+        if complete:
+            entry["watermark"] = fetched_at
+
+    def update(self, repo_names):
+        """
+        Fetch commits since each repo's watermark (minus the overlap), in concurrent batches.
+
+        Returns: number of repos refreshed
+        """
+        if not self.token and not self.token_pool.has_auth() and self.endpoint == GITHUB_GRAPHQL_URL:
+            print("⚠️  Commit velocity needs GITHUB_TOKEN (GraphQL API requires auth)")
+            return 0
+
+        now = _utcnow()
+        fetched_at = _iso(now)
+        window_start = _iso(now - timedelta(days=self.window_days))
+
+        pending = []
+        for full_name in dict.fromkeys(repo_names):
+            entry = self.state["repos"].get(full_name, {})
+            watermark = entry.get("watermark") if "commits" in entry else None
+            if watermark:
+                # Re-read a little before the watermark; already counted oids are skipped
+                overlap_start = datetime.strptime(watermark, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+                since = max(_iso(overlap_start - timedelta(days=self.overlap_days)), window_start)
+            else:
+                since = window_start
+            pending.append((full_name, since))
+
+        histories, partial = self._fetch_histories(pending)
+        with self._lock:
+            for full_name, commits in histories.items():
+                self._apply(full_name, commits, fetched_at, complete=full_name not in partial)
+
+        self.save()
+        return len(histories)
+
+    def commits_in_window(self, full_name):
+        """Commits in the last window_days from the cached commit days (None if never fetched)"""
+        entry = self.state["repos"].get(full_name)
+        if entry is None or "watermark" not in entry or "commits" not in entry:
+            return None
+        cutoff = (_utcnow() - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        return sum(1 for day in entry["commits"].values() if day >= cutoff)
+
+    def attach(self, repos):
+        """
+        Refresh velocity for the given repo dicts and attach fields in place:
+        commits_14d, commit_velocity (commits/day), high_velocity (> VELOCITY_THRESHOLD)
+        """
+        self.update([repo["name"] for repo in repos])
+
+        for repo in repos:
+            commits = self.commits_in_window(repo["name"])
+            repo["commits_14d"] = commits
+            repo["commit_velocity"] = round(commits / self.window_days, 2) if commits is not None else None
+            repo["high_velocity"] = commits is not None and commits > VELOCITY_THRESHOLD
+        return repos
+
+def add_commit_velocity(repos, **kwargs):
+    """Commit-velocity stage: attach commit fields to scout repo dicts"""
+    return CommitVelocityTracker(**kwargs).attach(repos)
@@ -11,8 +11,9 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from backend.scout import fetch_github_signals, fetch_onchain_metrics
+from backend.scout import collect_github_signals, fetch_onchain_metrics
 from backend.historical_tracker import HistoricalTracker
+from backend.metrics_store import MetricsStore, refresh_observations
 
 try:
     from backend.reddit_scraper import fetch_reddit_signals, get_reddit_narrative_evidence
@@ -28,16 +29,23 @@ except ImportError:
     NARRATIVE_GEN_AVAILABLE = False
     print("Narrative generator not available")
 
-def refresh_data(force=False, regenerate_narratives=False):
+def refresh_data(force=False, regenerate_narratives=False, force_regenerate=False):
     """
     Refresh all data sources and update historical tracking
 
     Args:
         force: Force refresh ignoring cache
         regenerate_narratives: Use AI to generate completely fresh narratives from current data
-
-    Returns: (success: bool, last_updated: str)
+            (skipped, keeping the current narratives, when signals are unchanged)
+        force_regenerate: Regenerate even if signals are unchanged since the last generation
+
+    Returns: (success: bool, last_updated: str, outcome: dict) where outcome has
+        "narratives" and "signal_similarity" (from the generator, when it ran).
+        "narratives" is "regenerated", "reused" (signals unchanged), "fallback"
+        (generation failed and a quick refresh ran instead) or "kept" (no
+        regeneration requested)
     """
+    outcome = {"narratives": "kept", "signal_similarity": None}
     try:
         # Check if we need to refresh (cache for 5 minutes - real-time updates)
         cache_file = "backend/data/.last_refresh"
@@ -47,23 +55,26 @@ def refresh_data(force=False, regenerate_narratives=False):
                 minutes_since = (datetime.now() - last_refresh).seconds / 60
                 if minutes_since < 5:
                     print(f"Using cached data (last refresh: {minutes_since:.1f} min ago)")
-                    return True, last_refresh.isoformat()
+                    return True, last_refresh.isoformat(), outcome
 
         print("Fetching fresh data...")
 
         # Option 1: Regenerate narratives with AI (takes longer but truly fresh)
         if regenerate_narratives and NARRATIVE_GEN_AVAILABLE:
             print("🤖 Regenerating narratives with AI...")
-            success, count = generate_fresh_narratives()
+            success, count, generated = generate_fresh_narratives(force=force_regenerate)
+            outcome["signal_similarity"] = generated["signal_similarity"]
             if not success:
                 print("⚠️  AI generation failed, using existing narratives")
+                outcome["narratives"] = "fallback"
             else:
-                print(f"✅ Generated {count} fresh narratives")
-                return True, datetime.now().isoformat()
+                print(f"✅ {count} narratives up to date")
+                outcome["narratives"] = generated["narratives"]
+                return True, datetime.now().isoformat(), outcome
 
         # Option 2: Quick refresh - just update data, keep existing narratives
         # Fetch GitHub signals
-        github_repos = fetch_github_signals(query="solana", days=14)
+        github_repos = collect_github_signals(days=14, with_velocity=True)
 
         # Fetch on-chain metrics
         onchain_metrics = fetch_onchain_metrics()
@@ -73,7 +84,7 @@ def refresh_data(force=False, regenerate_narratives=False):
         if REDDIT_AVAILABLE:
             try:
                 print("Fetching Reddit data...")
-                reddit_data = fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7)
+                reddit_data = fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7, incremental=True)
                 print(f"✅ Found {reddit_data['post_count']} Reddit posts")
             except Exception as e:
                 print(f"⚠️  Reddit fetch failed: {e}")
@@ -96,6 +107,9 @@ def refresh_data(force=False, regenerate_narratives=False):
         with open("data/snapshot.json", 'w') as f:
             json.dump(snapshot, f, indent=2)
 
+        # Record numeric metric values for percent changes and sparklines
+        MetricsStore().append_many(refresh_observations(onchain_metrics, github_repos, reddit_data))
+
         # Track history
         tracker = HistoricalTracker()
         tracker.add_snapshot(narratives, metrics={"github_repos": len(github_repos)})
@@ -106,11 +120,11 @@ def refresh_data(force=False, regenerate_narratives=False):
             f.write(datetime.now().isoformat())
 
         print("✅ Data refreshed successfully")
-        return True, datetime.now().isoformat()
+        return True, datetime.now().isoformat(), outcome
 
     except Exception as e:
         print(f"❌ Error refreshing data: {e}")
-        return False, None
+        return False, None, outcome
 
 def get_last_refresh_time():
     """Get the last refresh timestamp"""
@@ -131,10 +145,16 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--force', action='store_true', help='Force refresh ignoring cache')
+    parser.add_argument('--regenerate', action='store_true', help='Regenerate narratives with AI if signals changed')
+    parser.add_argument('--force-regenerate', action='store_true', help='Regenerate narratives even if signals are unchanged')
     args = parser.parse_args()
 
-    success, timestamp = refresh_data(force=args.force)
+    success, timestamp, outcome = refresh_data(
+        force=args.force,
+        regenerate_narratives=args.regenerate or args.force_regenerate,
+        force_regenerate=args.force_regenerate
+    )
     if success:
-        print(f"Last updated: {timestamp}")
+        print(f"Last updated: {timestamp} (narratives {outcome['narratives']})")
     else:
         print("Refresh failed")
@@ -0,0 +1,24 @@
+"""
+Gemini Endpoint Configuration for SignalVane
+Single place that decides which Gemini endpoint the SDK and REST call
+sites talk to. Setting GEMINI_BASE_URL (e.g. http://127.0.0.1:8765 for
+backend/mock_gemini_server.py) redirects every LLM call.
+"""
+import os
+import google.generativeai as genai
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+
+def base_url():
+    return os.getenv("GEMINI_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+def configure_sdk(api_key):
+    """genai.configure, switching to the REST transport when a custom endpoint is set"""
+    if os.getenv("GEMINI_BASE_URL"):
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": base_url()})
+    else:
+        genai.configure(api_key=api_key)
+
+def rest_url(model, method="generateContent", api_key=None):
+    """REST endpoint URL for a model method"""
+    return f"{base_url()}/v1beta/models/{model}:{method}?key={api_key}"
@@ -10,8 +10,14 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from backend.scout import fetch_github_signals, fetch_onchain_metrics
+from backend.scout import collect_github_signals, fetch_onchain_metrics
 from backend.llm_analyzer import NarrativeAnalyzer
+from backend.burst_detector import BurstDetector
+from backend.metrics_store import MetricsStore, refresh_observations
+from backend.historical_tracker import HistoricalTracker
+from backend.llm_json import parse_stats
+from backend.signal_fingerprint import SignalFingerprintStore, signal_features, fingerprint_digest, SIMILARITY_THRESHOLD
+from backend.idea_generation import generate_ideas_concurrently, generate_ideas_pipelined, DEFAULT_CONCURRENCY
 
 try:
     from backend.reddit_scraper import fetch_reddit_signals
@@ -20,19 +26,65 @@ except ImportError:
     REDDIT_AVAILABLE = False
     print("⚠️  Reddit scraper not available")
 
-def generate_fresh_narratives():
+def _record_history(narratives, github_repos, onchain_metrics, reddit_data):
+    """Same metric and narrative history a quick refresh records (data_refresher)"""
+    MetricsStore().append_many(refresh_observations(onchain_metrics, github_repos, reddit_data))
+    HistoricalTracker().add_snapshot(narratives, metrics={"github_repos": len(github_repos)})
+
+def _reuse_narratives(github_repos, onchain_metrics, reddit_data, similarity, features):
+    """
+    Keep the current narratives and ideas, refreshing only the snapshot.
+    Returns: narrative count, or None if there are no narratives to reuse
+    """
+    try:
+        with open("data/narratives.json", 'r') as f:
+            narratives = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not narratives:
+        return None
+
+    snapshot = {
+        "timestamp": datetime.now().isoformat(),
+        "github_signals": len(github_repos),
+        "reddit_signals": reddit_data['post_count'] if reddit_data else 0,
+        "narratives_count": len(narratives),
+        "metrics": onchain_metrics,
+        "reddit_data": reddit_data,
+        "generation_method": "Reused (signals unchanged since last generation)",
+        "signal_similarity": round(similarity, 3),
+        "signal_fingerprint": fingerprint_digest(features)
+    }
+    with open("data/snapshot.json", 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    _record_history(narratives, github_repos, onchain_metrics, reddit_data)
+    return len(narratives)
+
+def generate_fresh_narratives(idea_concurrency=DEFAULT_CONCURRENCY, stream=True, force=False,
+                              similarity_threshold=SIMILARITY_THRESHOLD):
     """
     Generate completely fresh narratives from current week's data
-    Returns: (success: bool, narrative_count: int)
+
+    Args:
+        idea_concurrency: parallel build-idea calls
+        stream: start idea generation as narratives stream in
+        force: regenerate even if the signals match the last generation's inputs
+        similarity_threshold: signal similarity at or above which the current
+            narratives are reused instead of calling the LLM
+
+    Returns: (success: bool, narrative_count: int, outcome: dict) where outcome
+        has "narratives" ("regenerated", "reused" when the signals matched the
+        last generation, or None on failure) and "signal_similarity"
     """
     print("\n" + "="*60)
     print("🚀 GENERATING FRESH NARRATIVES FROM CURRENT DATA")
     print("="*60 + "\n")
 
+    outcome = {"narratives": None, "signal_similarity": None}
     try:
         # Step 1: Fetch all signal sources
         print("📊 Step 1/5: Fetching GitHub signals...")
-        github_repos = fetch_github_signals(query="solana", days=14)
+        github_repos = collect_github_signals(days=14, with_velocity=True)
         print(f"   ✅ Found {len(github_repos)} active repos")
 
         print("\n📊 Step 2/5: Fetching on-chain metrics...")
@@ -43,7 +95,7 @@ def generate_fresh_narratives():
         reddit_data = None
         if REDDIT_AVAILABLE:
             try:
-                reddit_data = fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7)
+                reddit_data = fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7, incremental=True)
                 print(f"   ✅ Found {reddit_data['post_count']} Reddit posts")
                 print(f"   ✅ Top keywords: {', '.join([kw for kw, _ in reddit_data['top_keywords'][:5]])}")
             except Exception as e:
@@ -55,26 +107,66 @@ def generate_fresh_narratives():
         # Step 2: Prepare signals for LLM
         print("\n🤖 Step 4/5: Analyzing signals with Gemini AI...")
         signals_data = {
-            "github_momentum": github_repos[:15],  # Top 15 repos
+            "github_momentum": github_repos,  # Trimmed to the token budget by the prompt builder
             "onchain_metrics": onchain_metrics,
             "market_intelligence": []
         }
 
-        # Add Reddit intelligence if available
+        # Feed GitHub descriptions into burst detection (Reddit titles are fed by the scraper)
+        detector = BurstDetector()
+        detector.add_documents(
+            (f"github:{repo['name']}", repo.get('description'), None) for repo in github_repos
+        )
+        detector.save()
+        emerging_terms = detector.emerging_terms(n=15)
+
+        # Surging terms first, then raw Reddit keyword counts (the prompt builder
+        # drops keywords already covered by a surging term)
+        if emerging_terms:
+            print(f"   ✅ Emerging terms: {', '.join(t['term'] for t in emerging_terms[:5])}")
+            for term in emerging_terms:
+                growth = f"{term['growth']}x baseline" if term['growth'] else "new this period"
+                signals_data["market_intelligence"].append({
+                    "source": "Reddit + GitHub burst detection",
+                    "term": term['term'],
+                    "summary": f"{term['term']} surging: {term['count']} mentions ({growth}, z={term['score']})"
+                })
         if reddit_data and reddit_data.get('top_keywords'):
-            for keyword, count in reddit_data['top_keywords'][:5]:
+            for keyword, count in reddit_data['top_keywords']:
                 signals_data["market_intelligence"].append({
                     "source": "Reddit r/solana",
+                    "term": keyword,
                     "summary": f"{keyword} mentioned {count} times in discussions"
                 })
 
+        # Skip the LLM when the inputs have barely moved since the last generation
+        fingerprints = SignalFingerprintStore()
+        features = signal_features(signals_data)
+        regenerate, similarity = fingerprints.should_regenerate(features, similarity_threshold, force=force)
+        outcome["signal_similarity"] = round(similarity, 3) if similarity is not None else None
+        if similarity is not None:
+            print(f"   📏 Signal similarity to last generation: {similarity:.3f} (threshold {similarity_threshold})")
+        if not regenerate:
+            count = _reuse_narratives(github_repos, onchain_metrics, reddit_data, similarity, features)
+            if count is not None:
+                print(f"   ♻️  Signals unchanged - reusing {count} existing narratives (use --force to regenerate)")
+                outcome["narratives"] = "reused"
+                return True, count, outcome
+            print("   ⚠️  No existing narratives to reuse, regenerating")
+
         # Step 3: Generate narratives using LLM
         analyzer = NarrativeAnalyzer()
-        narratives = analyzer.extract_narratives(signals_data)
+        if stream:
+            # Idea generation starts as each narrative arrives in the stream
+            narratives, all_ideas = generate_ideas_pipelined(
+                analyzer.stream_narratives(signals_data), analyzer.generate_build_ideas, max_workers=idea_concurrency
+            )
+        else:
+            narratives = analyzer.extract_narratives(signals_data)
 
         if not narratives:
             print("   ❌ Failed to generate narratives")
-            return False, 0
+            return False, 0, outcome
 
         print(f"   ✅ Generated {len(narratives)} narratives:")
         for n in narratives:
@@ -82,10 +174,9 @@ def generate_fresh_narratives():
 
         # Step 4: Generate build ideas for each narrative
         print(f"\n💡 Step 5/5: Generating build ideas...")
-        all_ideas = []
-        for narrative in narratives:
-            ideas_obj = analyzer.generate_build_ideas(narrative)
-            all_ideas.append(ideas_obj)
+        if not stream:
+            all_ideas = generate_ideas_concurrently(narratives, analyzer.generate_build_ideas, max_workers=idea_concurrency)
+        for narrative, ideas_obj in zip(narratives, all_ideas):
             print(f"   ✅ {narrative['narrative_name']}: {len(ideas_obj.get('ideas', []))} ideas")
 
         # Step 5: Save everything to data files
@@ -112,35 +203,46 @@ def generate_fresh_narratives():
             "narratives_count": len(narratives),
             "metrics": onchain_metrics,
             "reddit_data": reddit_data,
-            "generation_method": "AI-powered (Gemini 2.5 Flash)"
+            "generation_method": "AI-powered (Gemini 2.5 Flash)",
+            "signal_similarity": outcome["signal_similarity"],
+            "signal_fingerprint": fingerprint_digest(features),
+            "llm_parse_stats": parse_stats()
         }
 
         with open("data/snapshot.json", 'w') as f:
             json.dump(snapshot, f, indent=2)
         print("   ✅ Saved snapshot.json")
 
+        _record_history(narratives, github_repos, onchain_metrics, reddit_data)
+        fingerprints.record(features)
+
         print("\n" + "="*60)
         print(f"🎉 SUCCESS! Generated {len(narratives)} fresh narratives")
         print("="*60 + "\n")
 
-        return True, len(narratives)
+        outcome["narratives"] = "regenerated"
+        return True, len(narratives), outcome
 
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         import traceback
         traceback.print_exc()
-        return False, 0
+        return False, 0, outcome
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Generate fresh narratives from current data")
     parser.add_argument('--dry-run', action='store_true', help='Show what would be generated without saving')
+    parser.add_argument('--no-stream', action='store_true', help='Wait for the full narrative response before generating ideas')
+    parser.add_argument('--idea-concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Parallel build-idea calls (1 = serial)')
+    parser.add_argument('--force', action='store_true', help='Regenerate even if signals are unchanged since the last generation')
     args = parser.parse_args()
 
     if args.dry_run:
         print("🔍 DRY RUN MODE - No files will be saved\n")
 
-    success, count = generate_fresh_narratives()
+    success, count, _ = generate_fresh_narratives(idea_concurrency=args.idea_concurrency, stream=not args.no_stream,
+                                               force=args.force)
 
     if success:
         print(f"\n✅ Generated {count} narratives successfully!")
@@ -12,8 +12,9 @@ import os
 import json
 from datetime import datetime
 from dotenv import load_dotenv
-from scout import fetch_github_signals, fetch_onchain_metrics
+from scout import collect_github_signals, fetch_onchain_metrics
 from llm_analyzer_simple import extract_narratives, generate_build_ideas
+from idea_generation import generate_ideas_concurrently
 
 # Load environment variables
 load_dotenv()
@@ -38,7 +39,7 @@ def main():
 
     # Step 1: Fetch Real GitHub Data
     print("\n📊 Step 1: Fetching GitHub signals...")
-    github_data = fetch_github_signals(query="solana", days=14)
+    github_data = collect_github_signals(days=14, with_velocity=True)
     print(f"✅ Found {len(github_data)} Solana repositories")
 
     # Step 2: Get Onchain Metrics
@@ -81,11 +82,7 @@ def main():
 
         # Step 6: Generate Build Ideas for Each Narrative
         print("\n💡 Step 6: Generating build ideas...")
-        all_ideas = []
-
-        for narrative in narratives:
-            ideas_obj = generate_build_ideas(narrative)
-            all_ideas.append(ideas_obj)
+        all_ideas = generate_ideas_concurrently(narratives, generate_build_ideas)
 
         # Save build ideas
         with open("data/ideas.json", "w") as f:
@@ -0,0 +1,124 @@
+"""
+Conditional-request HTTP cache for SignalVane
+Stores ETag / Last-Modified validators and response bodies on disk so that
+unchanged GitHub API responses come back as 304s (no body, no rate-limit cost)
+"""
+import os
+import json
+import hashlib
+import sys
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend import http_client
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "data", "http_cache")
+
+class CachedResponse:
+    """Minimal response object returned by HTTPCache.get"""
+
+    def __init__(self, status_code, data, headers, links, from_cache):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers
+        self.links = links
+        self.from_cache = from_cache
+
+    def json(self):
+        return self.data
+
+class HTTPCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, url):
+        """Return the cached entry for a URL, or None"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save(self, url, response):
+        """
+        Persist the body and validators of a 200 response. Bodies without a
+        validator are kept too, for the stale fallback; they just never get
+        conditional headers.
+        """
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "links": response.links,
+            "data": response.json(),
+            "cached_at": datetime.now().isoformat()
+        }
+
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        return entry
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers from a cache entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url, headers=None, timeout=30):
+        """
+        GET a URL with conditional headers, reusing the cached body on 304
+
+        Args:
+            url: Full request URL (used as the cache key)
+            headers: Extra request headers (auth, accept, ...)
+            timeout: Request timeout in seconds
+
+        Returns:
+            CachedResponse; raises requests.HTTPError on error statuses
+        """
+        entry = self.load(url)
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(entry))
+
+        response = http_client.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.hits += 1
+            return CachedResponse(304, entry["data"], response.headers, entry.get("links", {}), True)
+
+        response.raise_for_status()
+        with self._lock:
+            self.misses += 1
+        entry = self.save(url, response)
+        return CachedResponse(response.status_code, entry["data"], response.headers, response.links, False)
+
+    def stale(self, url):
+        """Last cached body for a URL regardless of freshness (None if never cached)"""
+        entry = self.load(url)
+        if entry is None:
+            return None
+        return CachedResponse(200, entry["data"], {}, entry.get("links", {}), True)
+
+    def stats(self):
+        """Hit/miss counters for this process"""
+        return {"hits": self.hits, "misses": self.misses}
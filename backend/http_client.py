@@ -0,0 +1,109 @@
+"""
+Shared HTTP client for SignalVane
+One pooled keep-alive requests.Session for every backend fetcher, with
+default timeouts, jittered-backoff retries and per-host concurrency limits.
+
+Tuning (environment variables):
+    HTTP_TIMEOUT              default request timeout in seconds (30)
+    HTTP_MAX_RETRIES          retries on connection errors / 429 / 5xx (3)
+    HTTP_POOL_MAXSIZE         keep-alive connections kept per host (16)
+    HTTP_PER_HOST_CONCURRENCY max in-flight requests per host (8)
+"""
+import os
+import time
+import random
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+DEFAULT_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+PER_HOST_CONCURRENCY = int(os.getenv("HTTP_PER_HOST_CONCURRENCY", "8"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 10.0
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+def new_session():
+    """Pooled session with the shared adapter settings, for clients that manage their own headers"""
+    session = requests.Session()
+    # Retries are handled in request() so they can honor Retry-After and jitter
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "SignalVane/1.0"
+    return session
+
+def get_session():
+    """Process-wide pooled session (keep-alive connections reused across calls)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+def _host_limit(url):
+    host = urlparse(url).netloc
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(PER_HOST_CONCURRENCY)
+        return _host_limits[host]
+
+def _backoff_delay(attempt, response=None):
+    """Full-jitter exponential backoff, honoring Retry-After when the server sends one"""
+    if response is not None and response.headers.get("Retry-After"):
+        try:
+            return float(response.headers["Retry-After"])
+        except ValueError:
+            pass
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * (2 ** attempt)))
+
+def request(method, url, timeout=None, retries=None, **kwargs):
+    """
+    Send a request through the shared session.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        timeout: Seconds (defaults to HTTP_TIMEOUT)
+        retries: Retries on connection errors and retryable statuses
+            (defaults to HTTP_MAX_RETRIES; pass 0 for non-idempotent calls)
+        **kwargs: Passed through to requests (headers, json, params, ...)
+
+    Returns:
+        requests.Response (the last one if retries ran out)
+    """
+    timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+    retries = retries if retries is not None else DEFAULT_RETRIES
+    limit = _host_limit(url)
+
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            with limit:
+                response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+        delay = _backoff_delay(attempt, response)
+        if delay > MAX_BACKOFF and response is not None:
+            # Server asked us to back off longer than we are willing to block
+            return response
+        time.sleep(delay)
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
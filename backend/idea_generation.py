@@ -0,0 +1,89 @@
+"""
+Build Idea Generation for SignalVane
+Runs the per-narrative build-idea LLM calls concurrently so the idea phase
+costs roughly one round trip instead of one per narrative. Calls can also be
+pipelined with a streamed narrative response.
+
+Tuning (environment variables):
+    IDEA_CONCURRENCY  max simultaneous idea calls (5)
+    IDEA_TIMEOUT      seconds before a single idea call is abandoned (90)
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_CONCURRENCY = int(os.getenv("IDEA_CONCURRENCY", "5"))
+DEFAULT_TIMEOUT = float(os.getenv("IDEA_TIMEOUT", "90"))
+POLL_INTERVAL = 0.25
+
+def empty_ideas(narrative):
+    """Fallback result used when idea generation fails for a narrative"""
+    return {"narrative_name": narrative.get("narrative_name", "Unknown"), "ideas": []}
+
+def generate_ideas_concurrently(narratives, generate_fn, max_workers=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    Call generate_fn(narrative) for every narrative in parallel.
+
+    Args:
+        narratives: list of narrative dicts
+        generate_fn: callable returning an ideas dict for one narrative
+        max_workers: concurrency limit (1 = serial)
+        timeout: per-call timeout in seconds, measured from when the call starts
+
+    Returns:
+        list of ideas dicts in the same order as narratives. Calls that raise,
+        return nothing or time out get the empty-ideas fallback.
+    """
+    if not narratives:
+        return []
+    _, ideas = generate_ideas_pipelined(narratives, generate_fn, min(max_workers, len(narratives)), timeout)
+    return ideas
+
+def generate_ideas_pipelined(narrative_stream, generate_fn, max_workers=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    Start idea generation for each narrative as soon as the stream yields it,
+    overlapping the idea calls with the rest of the narrative stream.
+
+    Args:
+        narrative_stream: iterable of narrative dicts (e.g. a streaming LLM parse)
+        generate_fn, max_workers, timeout: as for generate_ideas_concurrently
+
+    Returns:
+        (narratives, ideas) lists in stream order
+    """
+    narratives = []
+    started = {}
+
+    def run(index, narrative):
+        started[index] = time.monotonic()
+        return generate_fn(narrative)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = {}
+    for narrative in narrative_stream:
+        futures[executor.submit(run, len(narratives), narrative)] = len(narratives)
+        narratives.append(narrative)
+
+    results = [None] * len(narratives)
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        for future in done:
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"❌ Idea generation failed for {narratives[i].get('narrative_name', 'Unknown')}: {e}")
+
+        now = time.monotonic()
+        for future in list(pending):
+            i = futures[future]
+            if i in started and now - started[i] > timeout:
+                print(f"⚠️ Idea generation timed out for {narratives[i].get('narrative_name', 'Unknown')} after {timeout}s")
+                pending.discard(future)
+
+    # Do not block the run on abandoned calls
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    ideas = [result if result else empty_ideas(narrative) for result, narrative in zip(results, narratives)]
+    return narratives, ideas
@@ -1,20 +1,53 @@
 import os
+import sys
 import json
+from itertools import chain
 import google.generativeai as genai
 from dotenv import load_dotenv
 from prompts import NARRATIVE_EXTRACTION_PROMPT, BUILD_IDEA_PROMPT
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.gemini_client import configure_sdk
+from backend.llm_cache import get_llm_cache, make_key
+from backend.prompt_builder import build_signal_prompt, format_report
+from backend.llm_json import JSONArrayStream, parse_llm_json
+from backend.llm_schemas import (
+    NARRATIVES_SCHEMA, IDEAS_SCHEMA, generation_config, cache_params,
+    valid_items, validate_narrative, validate_idea
+)
+from backend.llm_resilience import get_caller, resilient_call, is_transient, CircuitOpenError
+
 # Load .env from parent directory
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+MODEL_NAME = 'gemini-2.5-flash'
+
 class NarrativeAnalyzer:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, use_cache=True):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Set it in .env file or pass as parameter.")
 
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        configure_sdk(self.api_key)
+        self.model = genai.GenerativeModel(MODEL_NAME)
+        self.use_cache = use_cache
+        self.cache = get_llm_cache()
+
+    def _generate(self, prompt, site, schema):
+        """
+        Generate text for a prompt, serving repeats from the LLM cache.
+        Retries, hedging and the circuit breaker come from llm_resilience;
+        the response schema is enforced when structured output is enabled.
+        """
+        return self.cache.get_or_call(
+            MODEL_NAME, prompt,
+            lambda: resilient_call(site, lambda timeout: self.model.generate_content(
+                prompt, generation_config=generation_config(schema), request_options={"timeout": timeout}
+            ).text),
+            params=cache_params(schema),
+            bypass=not self.use_cache
+        )
 
     def extract_narratives(self, signals_data):
         """
@@ -22,38 +55,83 @@ class NarrativeAnalyzer:
         """
         print("🤖 Calling Gemini to extract narratives...")
 
-        # Format the signals into a readable prompt
-        context = self._format_signals_for_llm(signals_data)
-
-        full_prompt = f"""
-{NARRATIVE_EXTRACTION_PROMPT}
-
-Here is the signal data to analyze:
-
-{context}
-
-Respond ONLY with valid JSON array. No markdown, no explanations, just the JSON array.
-"""
+        full_prompt = self._narrative_prompt(signals_data)
 
+        text = None
         try:
-            response = self.model.generate_content(full_prompt)
-            text = response.text.strip()
-
-            # Clean up markdown if present
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
-            elif text.startswith("```"):
-                text = text.replace("```", "").strip()
-
-            narratives = json.loads(text)
+            text = self._generate(full_prompt, "narratives", NARRATIVES_SCHEMA)
+            narratives = valid_items(parse_llm_json(text, "narratives", expect='['), validate_narrative, "narratives")
             print(f"✅ Generated {len(narratives)} narratives")
             return narratives
 
         except Exception as e:
             print(f"❌ Error extracting narratives: {e}")
-            print(f"Response text: {response.text if 'response' in locals() else 'No response'}")
+            print(f"Response text: {text if text is not None else 'No response'}")
+            self.cache.discard(MODEL_NAME, full_prompt, cache_params(NARRATIVES_SCHEMA))
             return []
 
+    def stream_narratives(self, signals_data):
+        """
+        Streaming variant of extract_narratives.
+        Yields each narrative as soon as its JSON object is complete in the stream.
+        """
+        print("🤖 Streaming narratives from Gemini...")
+
+        full_prompt = self._narrative_prompt(signals_data)
+        cache_key = make_key(MODEL_NAME, full_prompt, cache_params(NARRATIVES_SCHEMA))
+        parser = JSONArrayStream()
+
+        cached = None if not self.use_cache or self.cache.bypass else self.cache.get(cache_key)
+        if cached is not None:
+            yield from valid_items(parser.feed(cached), validate_narrative, "narratives")
+            return
+
+        def open_stream(timeout):
+            # The first chunk is read here so connection errors, slow first
+            # tokens and 429s on setup go through retries, hedging and the breaker
+            stream = iter(self.model.generate_content(
+                full_prompt, stream=True, generation_config=generation_config(NARRATIVES_SCHEMA),
+                request_options={"timeout": timeout}
+            ))
+            return next(stream, None), stream
+
+        caller = get_caller("narratives")
+        try:
+            first, stream = caller.call(open_stream)
+        except CircuitOpenError as e:
+            print(f"⚠️ Skipping Gemini call: {e}")
+            return
+        except Exception as e:
+            # Retries were already spent on setup, as extract_narratives would
+            print(f"❌ Error streaming narratives: {e}")
+            return
+
+        chunks = []
+        count = 0
+        try:
+            for chunk in chain([first] if first is not None else [], stream):
+                chunks.append(chunk.text)
+                for narrative in valid_items(parser.feed(chunk.text), validate_narrative, "narratives"):
+                    count += 1
+                    yield narrative
+        except Exception as e:
+            print(f"❌ Error streaming narratives: {e}")
+            if is_transient(e):
+                caller.breaker.record_failure()
+            if count == 0:
+                # Nothing consumed yet, so the retrying non-streaming path is safe
+                yield from self.extract_narratives(signals_data)
+            return
+
+        if not parser.finished:
+            print(f"⚠️ Narrative stream ended without a complete JSON array ({count} narratives parsed)")
+            if count == 0:
+                yield from self.extract_narratives(signals_data)
+            return
+        print(f"✅ Streamed {count} narratives")
+        if self.use_cache and count:
+            self.cache.put(cache_key, ''.join(chunks))
+
     def generate_build_ideas(self, narrative):
         """
         Takes a narrative and generates 3-5 build ideas.
@@ -83,44 +161,37 @@ Respond ONLY with valid JSON object in this format:
 No markdown, no explanations, just the JSON object.
 """
 
+        text = None
         try:
-            response = self.model.generate_content(full_prompt)
-            text = response.text.strip()
-
-            # Clean up markdown
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
-            elif text.startswith("```"):
-                text = text.replace("```", "").strip()
-
-            ideas_obj = json.loads(text)
-            print(f"✅ Generated {len(ideas_obj.get('ideas', []))} build ideas")
+            text = self._generate(full_prompt, "build_ideas", IDEAS_SCHEMA)
+            ideas_obj = parse_llm_json(text, "build_ideas", expect='{')
+            ideas_obj = {
+                "narrative_name": ideas_obj.get("narrative_name") or narrative.get("narrative_name", "Unknown"),
+                "ideas": valid_items(ideas_obj.get("ideas"), validate_idea, "build_ideas")
+            }
+            print(f"✅ Generated {len(ideas_obj['ideas'])} build ideas")
             return ideas_obj
 
         except Exception as e:
             print(f"❌ Error generating build ideas: {e}")
-            print(f"Response text: {response.text if 'response' in locals() else 'No response'}")
+            print(f"Response text: {text if text is not None else 'No response'}")
+            self.cache.discard(MODEL_NAME, full_prompt, cache_params(IDEAS_SCHEMA))
             return {"narrative_name": narrative.get("narrative_name", "Unknown"), "ideas": []}
 
-    def _format_signals_for_llm(self, signals_data):
-        """Format raw signals into readable text for the LLM."""
-        github = signals_data.get("github_momentum", [])
-        onchain = signals_data.get("onchain_metrics", [])
-        intel = signals_data.get("market_intelligence", [])
+    def _narrative_prompt(self, signals_data):
+        # Format the signals into a readable prompt within the token budget
+        context, report = build_signal_prompt(signals_data)
+        print(f"📏 Signal context: {format_report(report)}")
 
-        formatted = "## GitHub Activity (Last 14 Days)\n"
-        for repo in github[:10]:  # Top 10 repos
-            formatted += f"- {repo['name']}: {repo['stars']} stars, {repo.get('language', 'Unknown')} | {repo.get('description', 'No description')[:80]}...\n"
+        return f"""
+{NARRATIVE_EXTRACTION_PROMPT}
 
-        formatted += "\n## On-chain Metrics\n"
-        for metric in onchain:
-            formatted += f"- {metric['metric']}: {metric['value']} ({metric['change']})\n"
+Here is the signal data to analyze:
 
-        formatted += "\n## Market Intelligence\n"
-        for signal in intel[:5]:
-            formatted += f"- {signal.get('source', 'Unknown')}: {signal.get('summary', signal)}\n"
+{context}
 
-        return formatted
+Respond ONLY with valid JSON array. No markdown, no explanations, just the JSON array.
+"""
 
 if __name__ == "__main__":
     # Test the analyzer
@@ -2,43 +2,78 @@
 Simple Gemini API integration using REST API (no SDK issues)
 """
 import os
+import sys
 import json
-import requests
 from dotenv import load_dotenv
 from prompts import NARRATIVE_EXTRACTION_PROMPT, BUILD_IDEA_PROMPT
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend import http_client
+from backend.gemini_client import rest_url
+from backend.llm_cache import get_llm_cache
+from backend.llm_resilience import resilient_call, CircuitOpenError
+from backend.prompt_builder import build_signal_prompt, format_report
+from backend.llm_json import parse_llm_json
+from backend.llm_schemas import (
+    NARRATIVES_SCHEMA, IDEAS_SCHEMA, rest_generation_config, cache_params,
+    valid_items, validate_narrative, validate_idea
+)
+
 # Load environment
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 API_KEY = os.getenv("GEMINI_API_KEY")
 # Use v1beta API with gemini-2.5-flash (latest fast model)
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={API_KEY}"
+GEMINI_MODEL = "gemini-2.5-flash"
+# GEMINI_BASE_URL can point this at a local mock (see mock_gemini_server.py)
+GEMINI_API_URL = rest_url(GEMINI_MODEL, "generateContent", API_KEY)
+
+def call_gemini(prompt, use_cache=True, site="gemini_rest", schema=None):
+    """
+    Call Gemini API via REST, serving repeated prompts from the LLM cache.
+    Retries, hedging and the circuit breaker come from llm_resilience;
+    `schema` constrains the response when structured output is enabled.
+    """
+    try:
+        return get_llm_cache().get_or_call(
+            GEMINI_MODEL, prompt,
+            lambda: resilient_call(site, lambda timeout: _post_gemini(prompt, timeout, schema)),
+            params=cache_params(schema) if schema else None,
+            bypass=not use_cache
+        )
+    except CircuitOpenError as e:
+        print(f"⚠️ Skipping Gemini call: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ API Error: {e}")
+        response = getattr(e, "response", None)
+        if response is not None:
+            print(f"Response: {response.text}")
+        return None
 
-def call_gemini(prompt):
-    """Call Gemini API via REST"""
+def _post_gemini(prompt, timeout, schema=None):
     payload = {
         "contents": [{
             "parts": [{"text": prompt}]
         }]
     }
+    config = rest_generation_config(schema) if schema else None
+    if config:
+        payload["generationConfig"] = config
 
-    try:
-        response = requests.post(GEMINI_API_URL, json=payload, timeout=60)
-        response.raise_for_status()
-        data = response.json()
-        text = data['candidates'][0]['content']['parts'][0]['text']
-        return text
-    except Exception as e:
-        print(f"❌ API Error: {e}")
-        if hasattr(response, 'text'):
-            print(f"Response: {response.text}")
-        return None
+    # Retries are handled by the resilience layer
+    response = http_client.post(GEMINI_API_URL, json=payload, timeout=timeout, retries=0)
+    response.raise_for_status()
+    data = response.json()
+    return data['candidates'][0]['content']['parts'][0]['text']
 
 def extract_narratives(signals_data):
     """Generate narratives from signals"""
     print("🤖 Calling Gemini to extract narratives...")
 
-    context = format_signals(signals_data)
+    context, report = build_signal_prompt(signals_data)
+    print(f"📏 Signal context: {format_report(report)}")
     full_prompt = f"""{NARRATIVE_EXTRACTION_PROMPT}
 
 Here is the signal data to analyze:
@@ -47,24 +82,18 @@ Here is the signal data to analyze:
 
 Respond ONLY with valid JSON array. No markdown, no explanations, just the JSON array."""
 
-    text = call_gemini(full_prompt)
+    text = call_gemini(full_prompt, site="narratives", schema=NARRATIVES_SCHEMA)
     if not text:
         return []
 
-    # Clean up markdown
-    text = text.strip()
-    if text.startswith("```json"):
-        text = text.replace("```json", "").replace("```", "").strip()
-    elif text.startswith("```"):
-        text = text.replace("```", "").strip()
-
     try:
-        narratives = json.loads(text)
+        narratives = valid_items(parse_llm_json(text, "narratives", expect='['), validate_narrative, "narratives")
         print(f"✅ Generated {len(narratives)} narratives")
         return narratives
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"❌ JSON parse error: {e}")
         print(f"Raw response: {text[:200]}...")
+        get_llm_cache().discard(GEMINI_MODEL, full_prompt, cache_params(NARRATIVES_SCHEMA))
         return []
 
 def generate_build_ideas(narrative):
@@ -92,45 +121,23 @@ Respond ONLY with valid JSON object in this format:
 
 No markdown, no explanations, just the JSON object."""
 
-    text = call_gemini(full_prompt)
+    text = call_gemini(full_prompt, site="build_ideas", schema=IDEAS_SCHEMA)
     if not text:
         return {"narrative_name": narrative.get("narrative_name", "Unknown"), "ideas": []}
 
-    # Clean up markdown
-    text = text.strip()
-    if text.startswith("```json"):
-        text = text.replace("```json", "").replace("```", "").strip()
-    elif text.startswith("```"):
-        text = text.replace("```", "").strip()
-
     try:
-        ideas_obj = json.loads(text)
-        print(f"✅ Generated {len(ideas_obj.get('ideas', []))} build ideas")
+        ideas_obj = parse_llm_json(text, "build_ideas", expect='{')
+        ideas_obj = {
+            "narrative_name": ideas_obj.get("narrative_name") or narrative.get("narrative_name", "Unknown"),
+            "ideas": valid_items(ideas_obj.get("ideas"), validate_idea, "build_ideas")
+        }
+        print(f"✅ Generated {len(ideas_obj['ideas'])} build ideas")
         return ideas_obj
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"❌ JSON parse error: {e}")
+        get_llm_cache().discard(GEMINI_MODEL, full_prompt, cache_params(IDEAS_SCHEMA))
         return {"narrative_name": narrative.get("narrative_name", "Unknown"), "ideas": []}
 
-def format_signals(signals_data):
-    """Format signals for LLM"""
-    github = signals_data.get("github_momentum", [])
-    onchain = signals_data.get("onchain_metrics", [])
-    intel = signals_data.get("market_intelligence", [])
-
-    formatted = "## GitHub Activity (Last 14 Days)\n"
-    for repo in github[:10]:
-        formatted += f"- {repo['name']}: {repo['stars']} stars, {repo.get('language', 'Unknown')} | {repo.get('description', 'No description')[:80]}...\n"
-
-    formatted += "\n## On-chain Metrics\n"
-    for metric in onchain:
-        formatted += f"- {metric['metric']}: {metric['value']} ({metric['change']})\n"
-
-    formatted += "\n## Market Intelligence\n"
-    for signal in intel[:5]:
-        formatted += f"- {signal.get('source', 'Unknown')}: {signal.get('summary', signal)}\n"
-
-    return formatted
-
 if __name__ == "__main__":
     print("🧪 Testing Gemini REST API...")
 
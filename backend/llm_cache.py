@@ -0,0 +1,110 @@
+"""
+LLM Response Cache for SignalVane
+Content-addressed cache shared by every Gemini call site. Entries are keyed
+by the hash of (model, prompt, generation params), expire after a TTL and
+are evicted least-recently-used beyond a size bound.
+
+Tuning (environment variables):
+    LLM_CACHE_TTL          entry lifetime in seconds (86400)
+    LLM_CACHE_MAX_ENTRIES  max cached responses (500)
+    LLM_CACHE_BYPASS       set to 1 to always call the model
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(__file__), "data", "llm_cache.json")
+DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+
+def make_key(model, prompt, params=None):
+    """Content hash of one generation request"""
+    payload = json.dumps([model, prompt, params or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, bypass=None):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass if bypass is not None else os.getenv("LLM_CACHE_BYPASS") == "1"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return OrderedDict(json.load(f).get("entries", []))
+            except (OSError, json.JSONDecodeError):
+                pass
+        return OrderedDict()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = f"{self.cache_file}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"entries": list(self.entries.items())}, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def get(self, key):
+        """Cached value for a key, or None if missing / expired"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry["created"] > self.ttl:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, key, value):
+        with self._lock:
+            self.entries[key] = {"value": value, "created": time.time()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._save()
+
+    def discard(self, model, prompt, params=None):
+        """Drop an entry (e.g. a response that turned out to be unusable)"""
+        with self._lock:
+            if self.entries.pop(make_key(model, prompt, params), None) is not None:
+                self._save()
+
+    def get_or_call(self, model, prompt, call, params=None, bypass=False):
+        """
+        Return the cached response for (model, prompt, params), or run `call()`
+        and cache its result. None results are never cached.
+        """
+        if bypass or self.bypass:
+            return call()
+
+        key = make_key(model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        value = call()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """Process-wide cache shared by all Gemini call sites"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
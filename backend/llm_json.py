@@ -0,0 +1,198 @@
+"""
+LLM JSON Parsing for SignalVane
+Helpers for turning Gemini text output into JSON: incremental parsing of a
+streamed JSON array, a tolerant repair parser for fenced, truncated or
+trailing-garbage responses, and parse outcome counters per call site.
+"""
+import json
+import threading
+from collections import Counter
+
+class JSONArrayStream:
+    """
+    Incremental parser for a streamed top-level JSON array of objects.
+
+    Feed text chunks as they arrive; every object element is returned as
+    soon as its closing brace has been seen. Text before the opening '['
+    (e.g. a ```json fence) and after the closing ']' is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._buffer = []
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk: next piece of response text
+
+        Returns:
+            list of objects completed by this chunk
+        """
+        completed = []
+        for ch in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                if ch == '[':
+                    self.started = True
+                continue
+
+            if self._depth == 0:
+                # Between elements: commas and whitespace
+                if ch == '{':
+                    self._buffer = [ch]
+                    self._depth = 1
+                elif ch == ']':
+                    self.finished = True
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(json.loads(''.join(self._buffer)))
+                    except json.JSONDecodeError as e:
+                        print(f"⚠️ Skipping malformed streamed element: {e}")
+                    self._buffer = []
+        return completed
+
+_parse_stats = Counter()
+_parse_stats_lock = threading.Lock()
+
+def _count(site, outcome):
+    with _parse_stats_lock:
+        _parse_stats[(site, outcome)] += 1
+
+def parse_stats():
+    """Parse outcomes per call site: {site: {"ok": n, "repaired": n, "failed": n, "invalid": n}}"""
+    with _parse_stats_lock:
+        stats = {}
+        for (site, outcome), count in _parse_stats.items():
+            stats.setdefault(site, {"ok": 0, "repaired": 0, "failed": 0, "invalid": 0})[outcome] = count
+        return stats
+
+def record_invalid(site, count=1):
+    """Count elements dropped by schema validation"""
+    if count:
+        with _parse_stats_lock:
+            _parse_stats[(site, "invalid")] += count
+
+def strip_code_fences(text):
+    """Remove a surrounding markdown code block (```json ... ```) if present"""
+    text = text.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")[1:]
+        if lines and lines[-1].strip().startswith("```"):
+            lines = lines[:-1]
+        text = "\n".join(lines).strip()
+    return text
+
+def _scan(text, start):
+    """
+    Walk a JSON value starting at text[start].
+
+    Returns:
+        (end, cut_points): end is the index just past the value or None if it
+        is truncated; cut_points are (index, open_brackets) pairs where the
+        text can be cut and closed to leave only complete members.
+    """
+    stack = []
+    cut_points = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if not stack:
+                return i, cut_points
+            stack.pop()
+            if not stack:
+                return i + 1, cut_points
+            cut_points.append((i + 1, ''.join(reversed(stack))))
+        elif ch == ',':
+            cut_points.append((i, ''.join(reversed(stack))))
+    return None, cut_points
+
+def repair_json(text, expect=None):
+    """
+    Best-effort recovery of a JSON value from model output: skips leading
+    prose, drops trailing garbage and closes truncated arrays/objects after
+    their last complete member.
+
+    Args:
+        text: raw model output
+        expect: '[' or '{' to look for a specific top-level type
+
+    Returns:
+        parsed value, or raises ValueError
+    """
+    text = strip_code_fences(text)
+    openers = expect or '[{'
+    start = next((i for i, ch in enumerate(text) if ch in openers), None)
+    if start is None:
+        raise ValueError("no JSON value found in response")
+
+    end, cut_points = _scan(text, start)
+    if end is not None:
+        return json.loads(text[start:end])
+
+    # Truncated: cut at the latest point that still parses
+    for index, closers in reversed(cut_points[-50:]):
+        try:
+            return json.loads(text[start:index] + closers)
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("truncated JSON could not be repaired")
+
+def parse_llm_json(text, site, expect=None):
+    """
+    Parse a model response, repairing it when strict parsing fails.
+    Outcomes are counted per call site (see parse_stats).
+
+    Raises:
+        ValueError when nothing usable can be recovered
+    """
+    try:
+        value = json.loads(strip_code_fences(text))
+        if expect is None or (expect == '[') == isinstance(value, list):
+            _count(site, "ok")
+            return value
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        value = repair_json(text, expect)
+    except (ValueError, json.JSONDecodeError) as e:
+        _count(site, "failed")
+        raise ValueError(f"unparseable {site} response: {e}")
+    _count(site, "repaired")
+    print(f"⚠️ Repaired malformed JSON from {site} response")
+    return value
@@ -0,0 +1,271 @@
+"""
+LLM Call Resilience for SignalVane
+Retry, hedging and circuit-breaker policy shared by every Gemini call site.
+
+- Deadline-aware retries: jittered exponential backoff (or the server's
+  Retry-After) as long as the next attempt still fits in the deadline.
+- Hedging: when an attempt runs past the call site's observed p95 latency,
+  an identical second request is fired and the first success wins.
+- Circuit breaker: after repeated transient failures the endpoint is treated
+  as degraded and calls fail fast (CircuitOpenError) so callers drop to
+  their heuristic fallbacks until the cool-down has passed.
+
+Tuning (environment variables):
+    LLM_DEADLINE           total seconds per logical call, retries included (90)
+    LLM_MAX_RETRIES        retries on 429 / 5xx / timeouts (3)
+    LLM_HEDGE              set to 0 to disable hedged requests
+    LLM_BREAKER_THRESHOLD  consecutive transient failures that open the circuit (5)
+    LLM_BREAKER_RESET      seconds the circuit stays open before a trial call (60)
+"""
+import os
+import sys
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.http_client import RETRY_STATUSES
+
+DEFAULT_DEADLINE = float(os.getenv("LLM_DEADLINE", "90"))
+DEFAULT_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "1") != "0"
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "60"))
+
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 20.0
+MIN_LATENCY_SAMPLES = 10
+MIN_HEDGE_DELAY = 2.0
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model endpoint that is currently degraded"""
+    def __init__(self, name, retry_in):
+        super().__init__(f"LLM circuit '{name}' is open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+def _status_and_retry_after(error):
+    """HTTP status and Retry-After (seconds) of a REST or SDK error, if any"""
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        retry_after = response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        return response.status_code, retry_after
+    # google.api_core exceptions carry the HTTP status as .code
+    code = getattr(error, "code", None)
+    return (int(code), None) if isinstance(code, int) else (None, None)
+
+def is_transient(error):
+    """True for errors worth retrying: rate limits, 5xx, timeouts, connection drops"""
+    if isinstance(error, (TimeoutError, requests.Timeout, requests.ConnectionError)):
+        return True
+    status, _ = _status_and_retry_after(error)
+    return status in RETRY_STATUSES
+
+class LatencyTracker:
+    """Recent successful latencies of one call site"""
+
+    def __init__(self, size=100):
+        self.samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def p95(self):
+        """95th percentile latency, or None until enough samples exist"""
+        with self._lock:
+            if len(self.samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures -> half-open trial after `reset_timeout`"""
+
+    def __init__(self, name, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            now = time.monotonic()
+            waited = now - self.opened_at
+            trial_running = self._trial_started is not None and now - self._trial_started < self.reset_timeout
+            if waited >= self.reset_timeout and not trial_running:
+                # Half-open: let a single trial call probe the endpoint
+                self._trial_started = now
+                return
+            raise CircuitOpenError(self.name, max(0, self.reset_timeout - waited))
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                print(f"✅ LLM circuit '{self.name}' closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_started is not None:
+                # Trial call failed: stay open for another cool-down
+                self._trial_started = None
+                self.opened_at = time.monotonic()
+            elif self.opened_at is None and self.failures >= self.threshold:
+                print(f"⚠️ LLM circuit '{self.name}' opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+class ResilientCaller:
+    """
+    Runs one logical LLM call with retries, hedging and the circuit breaker.
+
+    Args:
+        name: call site name (latency percentiles are tracked per site)
+        breaker: CircuitBreaker shared by call sites hitting the same endpoint
+        deadline: total seconds for the call including retries
+        max_retries: retries on transient errors
+        hedge: fire a second request once an attempt exceeds the site's p95
+    """
+
+    _pool = ThreadPoolExecutor(max_workers=16)
+
+    def __init__(self, name, breaker, deadline=DEFAULT_DEADLINE, max_retries=DEFAULT_RETRIES, hedge=HEDGE_ENABLED):
+        self.name = name
+        self.breaker = breaker
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.latency = LatencyTracker()
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "failures": 0, "short_circuited": 0}
+
+    def call(self, fn):
+        """
+        Args:
+            fn: callable(timeout) performing one request; timeout is the
+                number of seconds left before the deadline
+
+        Returns:
+            fn's result. Raises CircuitOpenError when the circuit is open and
+            the last error once retries or the deadline are exhausted.
+        """
+        self.stats["calls"] += 1
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.stats["short_circuited"] += 1
+            raise
+
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError(f"LLM call '{self.name}' exceeded its {self.deadline:.0f}s deadline")
+                result = self._attempt(fn, remaining)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                if not is_transient(e):
+                    # The endpoint answered; the request itself is at fault
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+
+                _, retry_after = _status_and_retry_after(e)
+                delay = retry_after if retry_after is not None else random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * (2 ** attempt)))
+                if attempt >= self.max_retries or time.monotonic() + delay >= deadline or self.breaker.state == "open":
+                    self.stats["failures"] += 1
+                    raise
+                print(f"⚠️ LLM call '{self.name}' failed ({e}), retrying in {delay:.1f}s")
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                attempt += 1
+
+    def _timed(self, fn, timeout):
+        start = time.monotonic()
+        result = fn(timeout)
+        self.latency.add(time.monotonic() - start)
+        return result
+
+    def _attempt(self, fn, remaining):
+        hedge_after = self.latency.p95() if self.hedge else None
+        if hedge_after is not None:
+            hedge_after = max(hedge_after, MIN_HEDGE_DELAY)
+        if hedge_after is None or hedge_after >= remaining:
+            return self._timed(fn, remaining)
+
+        start = time.monotonic()
+        futures = [self._pool.submit(self._timed, fn, remaining)]
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            self.stats["hedges"] += 1
+            futures.append(self._pool.submit(self._timed, fn, remaining - hedge_after))
+
+        pending = set(futures)
+        first_error = None
+        while pending:
+            left = remaining - (time.monotonic() - start)
+            if left <= 0:
+                break
+            done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    first_error = first_error or e
+        if first_error is not None and not pending:
+            raise first_error
+        raise TimeoutError(f"LLM call '{self.name}' timed out after {remaining:.0f}s")
+
+_breakers = {}
+_callers = {}
+_registry_lock = threading.Lock()
+
+def get_caller(name, endpoint="gemini", **kwargs):
+    """
+    Process-wide ResilientCaller for a call site. Call sites on the same
+    endpoint share one circuit breaker.
+    """
+    with _registry_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        if name not in _callers:
+            _callers[name] = ResilientCaller(name, _breakers[endpoint], **kwargs)
+        return _callers[name]
+
+def resilient_call(name, fn, **kwargs):
+    """Shorthand for get_caller(name).call(fn)"""
+    return get_caller(name, **kwargs).call(fn)
+
+def resilience_stats():
+    """Per call site counters plus circuit states"""
+    with _registry_lock:
+        return {
+            "call_sites": {name: dict(c.stats, p95=c.latency.p95()) for name, c in _callers.items()},
+            "circuits": {name: b.state for name, b in _breakers.items()},
+        }
@@ -0,0 +1,171 @@
+"""
+LLM Response Schemas for SignalVane
+Response schemas sent to Gemini in structured-output mode, and validators
+compiled from the same schemas to check what comes back.
+
+Set LLM_STRUCTURED_OUTPUT=0 to fall back to prompt-only JSON instructions.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.llm_json import record_invalid
+
+STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "1") != "0"
+
+_STRING = {"type": "STRING"}
+_STRING_LIST = {"type": "ARRAY", "items": _STRING}
+
+NARRATIVE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "narrative_name": _STRING,
+        "explanation": _STRING,
+        "evidence": {
+            "type": "OBJECT",
+            "properties": {
+                "github": _STRING_LIST,
+                "onchain": _STRING_LIST,
+                "market_intel": _STRING_LIST,
+            },
+            "required": ["github", "market_intel"],
+        },
+        "novelty_score": {"type": "NUMBER"},
+    },
+    "required": ["narrative_name", "explanation", "evidence", "novelty_score"],
+}
+
+NARRATIVES_SCHEMA = {"type": "ARRAY", "items": NARRATIVE_SCHEMA}
+
+IDEA_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": _STRING,
+        "description": _STRING,
+        "tech_stack": _STRING,
+        "target_user": _STRING,
+        "feasibility": _STRING,
+    },
+    "required": ["title", "description"],
+}
+
+IDEAS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "narrative_name": _STRING,
+        "ideas": {"type": "ARRAY", "items": IDEA_SCHEMA},
+    },
+    "required": ["narrative_name", "ideas"],
+}
+
+SENTIMENT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "sentiment": {"type": "STRING", "enum": ["positive", "neutral", "negative"]},
+        "confidence": {"type": "NUMBER"},
+        "reasoning": _STRING,
+        "momentum_score": {"type": "NUMBER"},
+    },
+    "required": ["sentiment", "confidence", "reasoning", "momentum_score"],
+}
+
+# Batch sentiment: one entry per narrative, matched back by index
+SENTIMENT_BATCH_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": dict(SENTIMENT_SCHEMA["properties"], index={"type": "INTEGER"}),
+        "required": ["index"] + SENTIMENT_SCHEMA["required"],
+    },
+}
+
+def generation_config(schema):
+    """SDK generation_config for structured output (None when the mode is off)"""
+    if not STRUCTURED_OUTPUT:
+        return None
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+def rest_generation_config(schema):
+    """REST generationConfig for structured output (None when the mode is off)"""
+    if not STRUCTURED_OUTPUT:
+        return None
+    return {"responseMimeType": "application/json", "responseSchema": schema}
+
+def cache_params(schema):
+    """Generation params that distinguish structured-output responses in the LLM cache"""
+    return {"response_schema": schema} if STRUCTURED_OUTPUT else None
+
+_TYPE_CHECKS = {
+    "STRING": lambda v: isinstance(v, str),
+    "INTEGER": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "NUMBER": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "BOOLEAN": lambda v: isinstance(v, bool),
+    "ARRAY": lambda v: isinstance(v, list),
+    "OBJECT": lambda v: isinstance(v, dict),
+}
+
+def compile_schema(schema):
+    """
+    Compile a response schema into a validator function.
+
+    The schema is walked once; the returned validate(value) only runs the
+    pre-built checks and returns a list of error strings (empty when valid).
+    """
+    check_type = _TYPE_CHECKS[schema["type"]]
+    type_name = schema["type"].lower()
+    enum = set(schema["enum"]) if "enum" in schema else None
+    children = []
+
+    if schema["type"] == "OBJECT":
+        required = tuple(schema.get("required", ()))
+        properties = [(key, compile_schema(sub)) for key, sub in schema.get("properties", {}).items()]
+
+        def check_children(value, path):
+            errors = [f"{path}.{key}: missing" for key in required if key not in value]
+            for key, validate in properties:
+                if key in value:
+                    errors.extend(validate(value[key], f"{path}.{key}"))
+            return errors
+        children.append(check_children)
+
+    elif schema["type"] == "ARRAY" and "items" in schema:
+        validate_item = compile_schema(schema["items"])
+
+        def check_children(value, path):
+            errors = []
+            for i, item in enumerate(value):
+                errors.extend(validate_item(item, f"{path}[{i}]"))
+            return errors
+        children.append(check_children)
+
+    def validate(value, path="$"):
+        if not check_type(value):
+            return [f"{path}: expected {type_name}"]
+        if enum is not None and value not in enum:
+            return [f"{path}: {value!r} not one of {sorted(enum)}"]
+        errors = []
+        for check in children:
+            errors.extend(check(value, path))
+        return errors
+
+    return validate
+
+validate_narrative = compile_schema(NARRATIVE_SCHEMA)
+validate_idea = compile_schema(IDEA_SCHEMA)
+validate_sentiment = compile_schema(SENTIMENT_SCHEMA)
+
+def valid_items(items, validate, site):
+    """Keep the elements that pass `validate`, counting the rest as invalid for `site`"""
+    if not isinstance(items, list):
+        record_invalid(site)
+        return []
+    valid = []
+    for item in items:
+        errors = validate(item)
+        if errors:
+            print(f"⚠️ Dropping invalid {site} element: {'; '.join(errors[:3])}")
+        else:
+            valid.append(item)
+    record_invalid(site, len(items) - len(valid))
+    return valid
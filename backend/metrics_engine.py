@@ -0,0 +1,165 @@
+"""
+Streaming Metrics Engine for SignalVane
+Keeps a rolling 14-day window per on-chain metric with Welford-style running
+mean / variance (O(1) per observation, no history re-scans) and flags values
+beyond 2σ of the window mean, as described in the README methodology.
+"""
+import os
+import json
+import math
+import time
+from collections import deque
+
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(__file__), "data", "metrics_engine.json")
+
+WINDOW_DAYS = 14
+Z_THRESHOLD = 2.0
+DAY_SECONDS = 24 * 60 * 60
+# Observations closer together than this are one sample: a refresh that
+# fetches the metrics more than once replaces its point instead of adding one
+OBSERVATION_INTERVAL = 5 * 60
+
+class RollingMetric:
+    """Sliding-window running mean / variance for one metric"""
+
+    def __init__(self, window_seconds, points=None):
+        self.window_seconds = window_seconds
+        self.points = deque()
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        for ts, value in points or []:
+            self._add(ts, value)
+
+    def _add(self, ts, value):
+        self.points.append((ts, value))
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def _remove_oldest(self):
+        _, value = self.points.popleft()
+        self._remove(value)
+
+    def _remove_newest(self):
+        _, value = self.points.pop()
+        self._remove(value)
+
+    def _remove(self, value):
+        self.n -= 1
+        if self.n == 0:
+            self.mean, self.m2 = 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.n
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def observe(self, ts, value, replace_within=0):
+        """
+        Score a new value against the current window, then add it.
+        A point less than `replace_within` seconds older than `ts` is replaced
+        (the new value is scored without it).
+        Returns (z_score, pct_change_vs_window_mean)
+        """
+        cutoff = ts - self.window_seconds
+        while self.points and self.points[0][0] < cutoff:
+            self._remove_oldest()
+        if self.points and 0 <= ts - self.points[-1][0] < replace_within:
+            self._remove_newest()
+
+        z_score, pct_change = 0.0, 0.0
+        if self.n > 0:
+            std = self.std()
+            z_score = (value - self.mean) / std if std > 0 else 0.0
+            pct_change = (value - self.mean) / abs(self.mean) * 100 if self.mean else 0.0
+
+        self._add(ts, value)
+        return z_score, pct_change
+
+def metric_status(z_score):
+    """Map a z-score onto the dashboard status labels"""
+    if z_score >= Z_THRESHOLD:
+        return "Hot"
+    if z_score <= -Z_THRESHOLD:
+        return "Cooling"
+    if z_score >= 1:
+        return "Growing"
+    return "Stable"
+
+def format_value(value):
+    if float(value).is_integer():
+        return f"{value:,.0f}"
+    return f"{value:,.2f}"
+
+class MetricsEngine:
+    def __init__(self, state_file=DEFAULT_STATE_FILE, window_days=WINDOW_DAYS,
+                 observation_interval=OBSERVATION_INTERVAL):
+        self.state_file = state_file
+        self.window_seconds = window_days * DAY_SECONDS
+        self.observation_interval = observation_interval
+        self.metrics = self._load_state()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {
+            name: RollingMetric(self.window_seconds, [tuple(p) for p in points])
+            for name, points in data.get("metrics", {}).items()
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        data = {"metrics": {name: list(m.points) for name, m in self.metrics.items()}}
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_file)
+
+    def ingest(self, observations, timestamp=None, units=None):
+        """
+        Ingest one numeric observation per metric. Re-ingesting within
+        observation_interval of the last point replaces it, so fetching the
+        metrics twice in one refresh counts as a single observation.
+
+        Args:
+            observations: dict mapping metric name -> numeric value
+            timestamp: Unix time of the observations (defaults to now)
+            units: Optional dict mapping metric name -> unit label
+
+        Returns:
+            list of metric dicts in the fetch_onchain_metrics shape
+            (metric, value, change, status) plus z_score / anomaly and the
+            numeric raw_value / unit
+        """
+        units = units or {}
+        ts = timestamp or time.time()
+        results = []
+
+        for name, value in observations.items():
+            rolling = self.metrics.get(name)
+            if rolling is None:
+                rolling = self.metrics[name] = RollingMetric(self.window_seconds)
+
+            z_score, pct_change = rolling.observe(ts, float(value), self.observation_interval)
+            results.append({
+                "metric": name,
+                "value": format_value(value),
+                "change": f"{pct_change:+.0f}%",
+                "status": metric_status(z_score),
+                "z_score": round(z_score, 2),
+                "anomaly": abs(z_score) >= Z_THRESHOLD,
+                "raw_value": float(value),
+                "unit": units.get(name, "")
+            })
+
+        self.save()
+        return results
@@ -0,0 +1,165 @@
+"""
+Numeric Metrics Store for SignalVane
+Typed time series for on-chain and pipeline metrics: float64 timestamps and
+values in separate append-only column files (one pair per metric), plus a
+small JSON catalog with units. Columns are contiguous little-endian float64,
+so numpy.frombuffer / numpy.fromfile read them without any parsing.
+"""
+import os
+import re
+import json
+import time
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(__file__), "data", "metrics_store")
+DAY_SECONDS = 24 * 60 * 60
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def _slug(metric):
+    return re.sub(r'[^a-z0-9]+', '_', metric.lower()).strip('_')
+
+def sparkline_text(values):
+    """Render a list of numbers as a unicode sparkline"""
+    values = list(values)
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return "".join(SPARK_CHARS[int((v - low) / span * (len(SPARK_CHARS) - 1))] for v in values)
+
+class MetricsStore:
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.catalog_file = os.path.join(store_dir, "catalog.json")
+        os.makedirs(store_dir, exist_ok=True)
+        self.catalog = self._load_catalog()
+
+    def _load_catalog(self):
+        if os.path.exists(self.catalog_file):
+            with open(self.catalog_file, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_catalog(self):
+        tmp_path = f"{self.catalog_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.catalog, f, indent=2)
+        os.replace(tmp_path, self.catalog_file)
+
+    def _column_path(self, metric, column):
+        return os.path.join(self.store_dir, f"{self.catalog[metric]['slug']}.{column}.f64")
+
+    def append(self, metric, value, unit="", timestamp=None):
+        """Append one observation"""
+        self.append_many([{"metric": metric, "value": value, "unit": unit}], timestamp=timestamp)
+
+    def append_many(self, records, timestamp=None):
+        """
+        Append observations sharing one timestamp.
+
+        Args:
+            records: list of dicts with metric, value (number) and optional unit
+            timestamp: Unix time (defaults to now)
+        """
+        ts = timestamp or time.time()
+        changed = False
+
+        for record in records:
+            metric = record["metric"]
+            if metric not in self.catalog:
+                self.catalog[metric] = {"slug": _slug(metric), "unit": record.get("unit", "")}
+                changed = True
+            elif record.get("unit") and self.catalog[metric]["unit"] != record["unit"]:
+                self.catalog[metric]["unit"] = record["unit"]
+                changed = True
+
+            with open(self._column_path(metric, "ts"), 'ab') as f:
+                array('d', [ts]).tofile(f)
+            with open(self._column_path(metric, "value"), 'ab') as f:
+                array('d', [float(record["value"])]).tofile(f)
+
+        if changed:
+            self._save_catalog()
+
+    def _read_column(self, metric, column):
+        path = self._column_path(metric, column)
+        column_data = array('d')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                column_data.frombytes(f.read())
+        return column_data
+
+    def read(self, metric, since=None, as_numpy=False):
+        """
+        Read a metric's series.
+
+        Args:
+            metric: Metric name
+            since: Optional Unix time lower bound
+            as_numpy: Return numpy arrays (when numpy is installed)
+
+        Returns:
+            (timestamps, values) as float64 arrays
+        """
+        if metric not in self.catalog:
+            return array('d'), array('d')
+
+        timestamps = self._read_column(metric, "ts")
+        values = self._read_column(metric, "value")
+        # A crash between the two appends can leave the columns one row apart
+        rows = min(len(timestamps), len(values))
+        start = bisect_left(timestamps, since, 0, rows) if since else 0
+        timestamps, values = timestamps[start:rows], values[start:rows]
+
+        if as_numpy and NUMPY_AVAILABLE:
+            return np.frombuffer(timestamps, dtype=np.float64), np.frombuffer(values, dtype=np.float64)
+        return timestamps, values
+
+    def summary(self, metric, window_days=14, sparkline_points=20):
+        """
+        Latest value, percent change over the window and a sparkline for one metric.
+        Returns None when the metric has no data.
+        """
+        timestamps, values = self.read(metric, since=time.time() - window_days * DAY_SECONDS)
+        if not values:
+            return None
+
+        first, latest = values[0], values[-1]
+        change_pct = (latest - first) / abs(first) * 100 if first else 0.0
+        step = max(1, len(values) // sparkline_points)
+        spark = list(values[::step])[-sparkline_points:]
+
+        return {
+            "metric": metric,
+            "value": latest,
+            "unit": self.catalog[metric]["unit"],
+            "change_pct": round(change_pct, 2),
+            "timestamp": timestamps[-1],
+            "points": len(values),
+            "sparkline": spark,
+            "sparkline_text": sparkline_text(spark)
+        }
+
+    def summaries(self, window_days=14):
+        return [s for s in (self.summary(m, window_days) for m in self.catalog) if s]
+
+def refresh_observations(onchain_metrics, github_repos, reddit_data=None):
+    """
+    Numeric records observed by one refresh: live on-chain values (placeholder
+    metrics carry no raw_value and are skipped), active repos and Reddit posts.
+    """
+    records = [
+        {"metric": m["metric"], "value": m["raw_value"], "unit": m.get("unit", "")}
+        for m in onchain_metrics if m.get("raw_value") is not None
+    ]
+    records.append({"metric": "GitHub Active Repos", "value": len(github_repos), "unit": "repos"})
+    if reddit_data:
+        records.append({"metric": "Reddit Posts", "value": reddit_data['post_count'], "unit": "posts"})
+    return records
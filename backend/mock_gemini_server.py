@@ -0,0 +1,321 @@
+"""
+Mock Gemini Server for SignalVane
+Local stand-in for the Gemini generateContent / streamGenerateContent
+endpoints, so the narrative pipeline can run and be benchmarked without an
+API key or network access.
+
+Responses are templated per call site (narratives, build ideas, sentiment,
+batch sentiment) and seeded by the prompt, so identical prompts get
+identical answers. Latency follows a log-normal distribution and a
+configurable fraction of requests fail with 429/503.
+
+Usage:
+    python backend/mock_gemini_server.py --port 8765 --latency-median 1.5 --error-rate 0.05
+    GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=mock python backend/generate_fresh_narratives.py
+
+Canned responses can override the templates with --responses FILE, a JSON
+object mapping a kind (narratives, ideas, sentiment, sentiment_batch, text)
+to the response text.
+"""
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+THEMES = [
+    "ZK Compression at Scale", "Autonomous On-chain Agents", "DePIN Data Markets",
+    "SVM Rollups", "Stablecoin Payment Rails", "Restaking and Shared Security",
+    "Token-2022 Extensions", "Consumer Mobile dApps",
+]
+SENTIMENTS = ["positive", "neutral", "negative"]
+ENDPOINT_PATTERN = re.compile(r"^/v1(?:beta)?/models/([^/:]+):(generateContent|streamGenerateContent)$")
+
+class MockConfig:
+    """
+    Args:
+        latency_median: median response latency in seconds
+        latency_sigma: log-normal sigma (0 = fixed latency)
+        error_rate: fraction of requests answered with an error status
+        error_statuses: statuses to pick errors from
+        retry_after: Retry-After seconds sent with 429 responses
+        stream_chunk_chars: characters per streamed chunk
+        seed: base seed for latency, errors and content
+        responses: dict of canned response text by kind
+    """
+
+    def __init__(self, latency_median=0.5, latency_sigma=0.3, error_rate=0.0, error_statuses=(429, 503),
+                 retry_after=1, stream_chunk_chars=120, seed=0, responses=None):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.stream_chunk_chars = stream_chunk_chars
+        self.seed = seed
+        self.responses = responses or {}
+
+def classify_prompt(prompt):
+    """Which call site produced a prompt"""
+    if "each of these" in prompt and "narratives" in prompt:
+        return "sentiment_batch"
+    if "Analyze the sentiment" in prompt:
+        return "sentiment"
+    if "Ideator Agent" in prompt or '"ideas"' in prompt:
+        return "ideas"
+    if "Lead Analyst" in prompt or "narrative_name" in prompt:
+        return "narratives"
+    return "text"
+
+def _evidence_lines(prompt, heading, n=3):
+    """Bullet lines from a '## heading' section of the signal context"""
+    match = re.search(rf"## {re.escape(heading)}[^\n]*\n((?:- [^\n]*\n?)+)", prompt)
+    if not match:
+        return []
+    return [line[2:].split(" | ")[0] for line in match.group(1).splitlines()[:n]]
+
+def render_response(kind, prompt, rng):
+    """Templated JSON (or plain text) answer for a prompt"""
+    if kind == "narratives":
+        github = _evidence_lines(prompt, "GitHub Activity") or _evidence_lines(prompt, "Signal Clusters")
+        onchain = _evidence_lines(prompt, "On-chain Metrics")
+        intel = _evidence_lines(prompt, "Market Intelligence")
+        return json.dumps([{
+            "narrative_name": theme,
+            "explanation": f"Signals point to growing builder activity around {theme.lower()}.",
+            "evidence": {"github": github, "onchain": onchain, "market_intel": intel},
+            "novelty_score": rng.randint(5, 9),
+        } for theme in rng.sample(THEMES, 3)], indent=2)
+
+    if kind == "ideas":
+        match = re.search(r'"narrative_name":\s*"([^"]+)"', prompt)
+        name = match.group(1) if match else "Unknown"
+        return json.dumps({
+            "narrative_name": name,
+            "ideas": [{
+                "title": f"{name} Toolkit #{i + 1}",
+                "description": f"A developer tool that makes {name.lower()} easier to ship.",
+                "tech_stack": "Anchor, Helius, Token-2022",
+                "target_user": "Solana developers",
+                "feasibility": "Builds on existing open-source SDKs.",
+            } for i in range(rng.randint(3, 5))]
+        }, indent=2)
+
+    if kind == "sentiment":
+        return json.dumps(_sentiment(rng))
+
+    if kind == "sentiment_batch":
+        match = re.search(r"each of these (\d+)", prompt)
+        count = int(match.group(1)) if match else 1
+        return json.dumps([dict(_sentiment(rng), index=i) for i in range(count)])
+
+    return "Hello from the mock Gemini server."
+
+def _sentiment(rng):
+    return {
+        "sentiment": rng.choice(SENTIMENTS),
+        "confidence": round(rng.uniform(0.5, 0.95), 2),
+        "reasoning": "Mock assessment based on evidence volume.",
+        "momentum_score": rng.randint(3, 9),
+    }
+
+def _response_body(text, finished=True):
+    body = {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "index": 0,
+        }],
+        "modelVersion": "mock",
+    }
+    if finished:
+        body["candidates"][0]["finishReason"] = "STOP"
+    return body
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockGemini/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self._send_json(200, self.server.stats_snapshot())
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        match = ENDPOINT_PATTERN.match(parsed.path)
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if not match:
+            self._send_json(404, {"error": {"code": 404, "message": f"Unknown endpoint {parsed.path}"}})
+            return
+
+        try:
+            request = json.loads(raw or b"{}")
+            prompt = "".join(
+                part.get("text", "")
+                for content in request.get("contents", [])
+                for part in content.get("parts", [])
+            )
+        except (ValueError, AttributeError):
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+            return
+
+        config = self.server.config
+        rng = self.server.request_rng(prompt)
+        kind = classify_prompt(prompt)
+        self.server.count(kind)
+
+        if config.latency_sigma > 0:
+            latency = rng.lognormvariate(math.log(max(config.latency_median, 1e-3)), config.latency_sigma)
+        else:
+            latency = config.latency_median
+
+        if rng.random() < config.error_rate:
+            status = rng.choice(config.error_statuses)
+            time.sleep(latency / 2)
+            self.server.count(f"error_{status}")
+            headers = {"Retry-After": str(config.retry_after)} if status == 429 else None
+            self._send_json(status, {"error": {"code": status, "message": "Mock failure"}}, headers)
+            return
+
+        # Content depends only on the prompt so repeated prompts match
+        content_rng = random.Random(f"{config.seed}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}")
+        text = config.responses.get(kind) or render_response(kind, prompt, content_rng)
+
+        if match.group(2) == "streamGenerateContent":
+            self._stream(text, latency, sse="sse" in parse_qs(parsed.query).get("alt", []))
+        else:
+            time.sleep(latency)
+            self._send_json(200, _response_body(text))
+
+    def _stream(self, text, latency, sse):
+        """
+        Stream text in chunks spread over `latency`. The SDK's REST transport
+        reads a JSON array of responses; ?alt=sse clients get server-sent events.
+        """
+        size = max(1, self.server.config.stream_chunk_chars)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        delay = latency / len(chunks)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        if not sse:
+            self.wfile.write(b"[")
+        for i, chunk in enumerate(chunks):
+            time.sleep(delay)
+            payload = json.dumps(_response_body(chunk, finished=i == len(chunks) - 1))
+            if sse:
+                self.wfile.write(f"data: {payload}\r\n\r\n".encode("utf-8"))
+            else:
+                self.wfile.write(((",\n" if i else "") + payload).encode("utf-8"))
+            self.wfile.flush()
+        if not sse:
+            self.wfile.write(b"]")
+            self.wfile.flush()
+
+class MockGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config=None, verbose=False):
+        super().__init__(address, MockGeminiHandler)
+        self.config = config or MockConfig()
+        self.verbose = verbose
+        self.counts = Counter()
+        self._attempts = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def request_rng(self, prompt):
+        """
+        RNG for latency and errors, seeded by (seed, prompt, attempt number)
+        so a rerun of the same workload sees the same sequence.
+        """
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._attempts[key] += 1
+            attempt = self._attempts[key]
+        return random.Random(f"{self.config.seed}:{key}:{attempt}")
+
+    def count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def stats_snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+def start_mock_server(host="127.0.0.1", port=0, config=None, verbose=False):
+    """
+    Start the mock server on a background thread.
+
+    Returns:
+        MockGeminiServer (use .base_url for GEMINI_BASE_URL, .shutdown() to stop)
+    """
+    server = MockGeminiServer((host, port), config, verbose)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the Gemini generateContent API")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-median', type=float, default=0.5, help='Median latency in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.3, help='Log-normal sigma (0 = fixed latency)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail')
+    parser.add_argument('--error-statuses', default="429,503", help='Comma-separated statuses for failures')
+    parser.add_argument('--stream-chunk-chars', type=int, default=120)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--responses', help='JSON file of canned responses by kind')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+
+    config = MockConfig(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        error_statuses=[int(s) for s in args.error_statuses.split(",") if s],
+        stream_chunk_chars=args.stream_chunk_chars,
+        seed=args.seed,
+        responses=responses,
+    )
+    server = MockGeminiServer((args.host, args.port), config, args.verbose)
+    print(f"🧪 Mock Gemini server listening on {server.base_url}")
+    print(f"   export GEMINI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
@@ -0,0 +1,201 @@
+"""
+On-chain Aggregation Stage for SignalVane
+Counts unique developer wallets and deployed programs with HyperLogLog
+sketches and per-program deploy/upgrade frequencies with Count-Min sketches.
+One sketch set is persisted per UTC day, so a 14-day window is a merge of
+14 small files rather than a rescan, and memory stays bounded whatever the
+chain volume.
+"""
+import os
+import sys
+import json
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.sketches import HyperLogLog, CountMinSketch
+from backend.solana_rpc import (
+    get_rpc_client, fetch_loader_signatures, parse_loader_transaction, MAX_LOADER_TRANSACTIONS
+)
+
+DEFAULT_SKETCH_DIR = os.path.join(os.path.dirname(__file__), "data", "onchain_sketches")
+# Transactions fetched and folded into sketches per step (bounds memory)
+CHUNK_SIZE = 500
+# Unscanned signature ranges kept for backfill (oldest are dropped first)
+MAX_GAPS = 10
+# Program ids tracked per sketch as most-active candidates (pruned by sketch estimate);
+# the Count-Min sketch counts activity but cannot list its keys
+MAX_PROGRAM_CANDIDATES = 100
+# Programs reported in most_active_programs
+TOP_PROGRAMS = 5
+
+class DailySketch:
+    def __init__(self, data=None):
+        data = data or {}
+        self.wallets = HyperLogLog.from_dict(data["wallets"]) if "wallets" in data else HyperLogLog()
+        self.programs = HyperLogLog.from_dict(data["programs"]) if "programs" in data else HyperLogLog()
+        self.program_activity = (CountMinSketch.from_dict(data["program_activity"])
+                                 if "program_activity" in data else CountMinSketch())
+        self.candidates = set(data.get("candidates", []))
+        self.deploys = data.get("deploys", 0)
+        self.upgrades = data.get("upgrades", 0)
+
+    def _prune_candidates(self):
+        if len(self.candidates) > 2 * MAX_PROGRAM_CANDIDATES:
+            ranked = sorted(self.candidates, key=self.program_activity.estimate, reverse=True)
+            self.candidates = set(ranked[:MAX_PROGRAM_CANDIDATES])
+
+    def add(self, activity):
+        self.wallets.update(activity["signers"])
+        for program in activity["deployed"]:
+            self.programs.add(program)
+        for program in filter(None, activity["deployed"] + activity["upgraded"]):
+            self.program_activity.add(program)
+            self.candidates.add(program)
+        self._prune_candidates()
+        self.deploys += len(activity["deployed"])
+        self.upgrades += len(activity["upgraded"])
+
+    def merge(self, other):
+        self.wallets.merge(other.wallets)
+        self.programs.merge(other.programs)
+        self.program_activity.merge(other.program_activity)
+        self.candidates |= other.candidates
+        self._prune_candidates()
+        self.deploys += other.deploys
+        self.upgrades += other.upgrades
+        return self
+
+    def most_active(self, n=TOP_PROGRAMS):
+        """Programs with the most deploys + upgrades (Count-Min estimates, never undercounted)"""
+        ranked = sorted(self.candidates, key=lambda p: (-self.program_activity.estimate(p), p))
+        return [{"program": p, "activity": self.program_activity.estimate(p)} for p in ranked[:n]]
+
+    def to_dict(self):
+        return {
+            "wallets": self.wallets.to_dict(),
+            "programs": self.programs.to_dict(),
+            "program_activity": self.program_activity.to_dict(),
+            "candidates": sorted(self.candidates),
+            "deploys": self.deploys,
+            "upgrades": self.upgrades
+        }
+
+class OnchainSketchStore:
+    def __init__(self, sketch_dir=DEFAULT_SKETCH_DIR):
+        self.sketch_dir = sketch_dir
+        self.meta_file = os.path.join(sketch_dir, "meta.json")
+        os.makedirs(sketch_dir, exist_ok=True)
+
+    def _day_file(self, day):
+        return os.path.join(self.sketch_dir, f"{day}.json")
+
+    def load_day(self, day):
+        path = self._day_file(day)
+        if not os.path.exists(path):
+            return DailySketch()
+        with open(path, 'r') as f:
+            return DailySketch(json.load(f))
+
+    def save_day(self, day, sketch):
+        tmp_path = f"{self._day_file(day)}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(sketch.to_dict(), f)
+        os.replace(tmp_path, self._day_file(day))
+
+    def load_meta(self):
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def save_meta(self, meta):
+        with open(self.meta_file, 'w') as f:
+            json.dump(meta, f)
+
+    def window(self, days=14):
+        """Merge the daily sketches of the last N days"""
+        today = datetime.now(timezone.utc).date()
+        merged = DailySketch()
+        for offset in range(days):
+            merged.merge(self.load_day((today - timedelta(days=offset)).isoformat()))
+        return merged
+
+    def prune(self, keep_days=30):
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=keep_days)).isoformat()
+        for name in os.listdir(self.sketch_dir):
+            if name[:10] < cutoff and name[:4].isdigit():
+                os.remove(os.path.join(self.sketch_dir, name))
+
+def _scan_signatures(client, meta, days, max_pages, max_transactions):
+    """
+    Signatures to fold in this run: everything newer than the watermark, then
+    ranges earlier runs had to leave unscanned. A scan cut short by max_pages
+    or max_transactions records the rest of its range as a gap for the next run.
+    """
+    ranges = [{"before": None, "until": meta.get("watermark")}] + meta.get("gaps", [])
+    signatures = []
+    gaps = []
+
+    for i, scan in enumerate(ranges):
+        budget = max_transactions - len(signatures)
+        if budget <= 0:
+            gaps.append(scan)
+            continue
+        found, newest, resume_before = fetch_loader_signatures(
+            client, days, max_pages, until=scan["until"], before=scan["before"], max_signatures=budget
+        )
+        signatures.extend(found)
+        if i == 0 and newest:
+            meta["watermark"] = newest
+        if resume_before:
+            gaps.append({"before": resume_before, "until": scan["until"]})
+
+    meta["gaps"] = gaps[:MAX_GAPS]
+    return signatures
+
+def aggregate_onchain_activity(client=None, days=14, max_pages=50, store=None,
+                               max_transactions=MAX_LOADER_TRANSACTIONS):
+    """
+    Fold loader transactions newer than the last run (plus any backlog a
+    truncated run left behind) into daily sketches and return window counts.
+
+    Returns:
+        dict with program_deployments, program_upgrades, active_developer_wallets,
+        most_active_programs, new_transactions, pending_gaps and window_days
+    """
+    client = client or get_rpc_client()
+    store = store or OnchainSketchStore()
+    meta = store.load_meta()
+    client.refresh_slot()
+
+    signatures = _scan_signatures(client, meta, days, max_pages, max_transactions)
+
+    touched = {}
+    for start in range(0, len(signatures), CHUNK_SIZE):
+        for tx in client.get_transactions(signatures[start:start + CHUNK_SIZE]):
+            if not tx:
+                continue
+            activity = parse_loader_transaction(tx)
+            block_time = activity["block_time"] or datetime.now(timezone.utc).timestamp()
+            day = datetime.fromtimestamp(block_time, timezone.utc).date().isoformat()
+            if day not in touched:
+                touched[day] = store.load_day(day)
+            touched[day].add(activity)
+
+    for day, sketch in touched.items():
+        store.save_day(day, sketch)
+    meta["updated_at"] = datetime.now(timezone.utc).isoformat()
+    store.save_meta(meta)
+    store.prune()
+
+    window = store.window(days)
+    return {
+        "program_deployments": window.programs.count(),
+        "program_upgrades": window.upgrades,
+        "active_developer_wallets": window.wallets.count(),
+        "most_active_programs": window.most_active(),
+        "new_transactions": len(signatures),
+        "pending_gaps": len(meta["gaps"]),
+        "window_days": days
+    }
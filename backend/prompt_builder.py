@@ -0,0 +1,194 @@
+"""
+Prompt Builder for SignalVane
+Formats signal data for the LLM within a token budget. Sections are filled
+in priority order with their highest-signal lines first, repeated evidence
+is dropped, and the estimated prompt size is reported for every build.
+
+When there are enough signals, repos and market intelligence are first
+grouped by signal_clustering and sent as compact theme summaries instead
+of raw lists.
+
+Tuning (environment variables):
+    PROMPT_TOKEN_BUDGET  estimated tokens allowed for the signal context (2500)
+    SIGNAL_CLUSTERING    set to 0 to always send raw lists
+"""
+import os
+import re
+import sys
+import math
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.signal_clustering import cluster_signals, format_cluster, repo_score
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2500"))
+# Rough English/code average for Gemini tokenizers
+CHARS_PER_TOKEN = 4
+# Lines every section gets before any section gets more
+RESERVED_LINES = 3
+MAX_DESCRIPTION_CHARS = 160
+CLUSTERING_ENABLED = os.getenv("SIGNAL_CLUSTERING", "1") != "0"
+# Below this many repos + intel items raw lists are already compact
+MIN_SIGNALS_FOR_CLUSTERING = 20
+
+def estimate_tokens(text):
+    """Cheap token estimate (no tokenizer round trip)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def _dedupe_key(text):
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+def _shorten(text, limit=MAX_DESCRIPTION_CHARS):
+    """Trim at a word boundary instead of a fixed slice"""
+    text = ' '.join((text or '').split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0] + '...'
+
+class PromptBuilder:
+    """
+    Collects prompt sections and renders as many of their lines as fit the budget.
+
+    Args:
+        budget: estimated token budget for the rendered text
+    """
+
+    def __init__(self, budget=DEFAULT_TOKEN_BUDGET):
+        self.budget = budget
+        self.sections = []
+
+    def add_section(self, title, lines, priority=0, max_share=1.0):
+        """
+        Args:
+            title: section heading
+            lines: list of (score, text, dedupe_key) tuples; dedupe_key may be None
+            priority: higher sections get budget first
+            max_share: fraction of the budget the section may use while
+                lower-priority sections still have lines waiting
+        """
+        ranked = sorted(lines, key=lambda line: line[0], reverse=True)
+        self.sections.append({"title": title, "priority": priority, "lines": ranked,
+                              "max_tokens": self.budget * max_share})
+
+    def build(self):
+        """
+        Returns:
+            (text, report) where report holds the estimated token count, the
+            budget and per-section included/total/duplicate counts
+        """
+        seen = set()
+        chosen = {id(s): [] for s in self.sections}
+        queues = {id(s): list(s["lines"]) for s in self.sections}
+        report = {"budget": self.budget, "sections": {}}
+        used = 0
+
+        by_priority = sorted(self.sections, key=lambda s: s["priority"], reverse=True)
+        for section in by_priority:
+            used += estimate_tokens(f"## {section['title']}\n\n")
+            report["sections"][section["title"]] = {"included": 0, "total": len(section["lines"]), "duplicates": 0, "tokens": 0}
+
+        def take(section, limit, cap=float("inf")):
+            nonlocal used
+            stats = report["sections"][section["title"]]
+            picked = chosen[id(section)]
+            queue = queues[id(section)]
+            while queue and len(picked) < limit:
+                _, text, key = queue[0]
+                key = key or _dedupe_key(text)
+                if key in seen:
+                    queue.pop(0)
+                    stats["duplicates"] += 1
+                    continue
+                cost = estimate_tokens(f"- {text}\n")
+                if used + cost > self.budget or stats["tokens"] + cost > cap:
+                    return
+                queue.pop(0)
+                seen.add(key)
+                picked.append(text)
+                stats["included"] += 1
+                stats["tokens"] += cost
+                used += cost
+
+        # Every section gets its top lines first, then the rest go by priority
+        # (within each section's share), then any leftover budget is filled
+        for section in by_priority:
+            take(section, RESERVED_LINES)
+        for section in by_priority:
+            take(section, float("inf"), section["max_tokens"])
+        for section in by_priority:
+            take(section, float("inf"))
+
+        parts = []
+        for section in self.sections:
+            body = ''.join(f"- {text}\n" for text in chosen[id(section)]) or "- No data\n"
+            parts.append(f"## {section['title']}\n{body}")
+        text = '\n'.join(parts)
+
+        report["tokens"] = estimate_tokens(text)
+        return text, report
+
+def _repo_line(repo):
+    line = f"{repo['name']}: {repo['stars']} stars, {repo.get('language') or 'Unknown'}"
+    if repo.get('commits_14d'):
+        line += f", {repo['commits_14d']} commits/14d"
+    return f"{line} | {_shorten(repo.get('description') or 'No description')}"
+
+def build_signal_prompt(signals_data, budget=DEFAULT_TOKEN_BUDGET, clustered=CLUSTERING_ENABLED):
+    """
+    Format GitHub, on-chain and market-intelligence signals for the LLM.
+
+    Args:
+        signals_data: dict with github_momentum, onchain_metrics, market_intelligence
+        budget: estimated token budget
+        clustered: summarize repos and intel as signal clusters when there are many
+
+    Returns:
+        (text, report) as for PromptBuilder.build
+    """
+    github = signals_data.get("github_momentum", [])
+    onchain = signals_data.get("onchain_metrics", [])
+    intel = signals_data.get("market_intelligence", [])
+
+    builder = PromptBuilder(budget)
+    builder.add_section(
+        "On-chain Metrics",
+        # Anomalies and large moves first
+        [(abs(m.get('z_score') or 0) + (10 if m.get('anomaly') else 0) - i * 1e-3,
+          f"{m['metric']}: {m['value']} ({m['change']})", None)
+         for i, m in enumerate(onchain)],
+        priority=3
+    )
+
+    if clustered and len(github) + len(intel) >= MIN_SIGNALS_FOR_CLUSTERING:
+        clusters = cluster_signals(signals_data)
+        builder.add_section(
+            f"Signal Clusters ({len(github)} repos, {len(intel)} intel items grouped by theme)",
+            [(c["weight"], format_cluster(c), None) for c in clusters],
+            priority=2
+        )
+        return builder.build()
+
+    builder.add_section(
+        "GitHub Activity (Last 14 Days)",
+        # Forks and mirrors repeat the same description, so dedupe on it
+        [(repo_score(repo), _repo_line(repo), _dedupe_key(repo.get('description') or repo['name']))
+         for repo in github],
+        priority=2, max_share=0.6
+    )
+    builder.add_section(
+        "Market Intelligence",
+        # Sources arrive ranked (emerging terms first), so keep their order
+        [(-i, f"{s.get('source', 'Unknown')}: {s.get('summary', s)}" if isinstance(s, dict) else str(s),
+          s.get('term') if isinstance(s, dict) else None)
+         for i, s in enumerate(intel)],
+        priority=1
+    )
+    return builder.build()
+
+def format_report(report):
+    """One-line summary of a build report for logs"""
+    sections = ', '.join(
+        f"{title} {s['included']}/{s['total']}" + (f" (-{s['duplicates']} dup)" if s['duplicates'] else "")
+        for title, s in report["sections"].items()
+    )
+    return f"~{report['tokens']} tokens of {report['budget']} budget: {sections}"
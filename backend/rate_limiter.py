@@ -0,0 +1,140 @@
+"""
+GitHub Rate-Limit Scheduler for SignalVane
+Tracks X-RateLimit-* budgets per token and per resource (core / search /
+graphql), spreads requests across a pool of tokens, delays low-priority
+calls when budgets run low, and never fires a request that is sure to be
+rejected.
+"""
+import os
+import time
+import threading
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+class RateLimitExhausted(Exception):
+    """Raised when no token has budget and the reset is too far away to wait for"""
+
+    def __init__(self, resource, reset_at):
+        self.resource = resource
+        self.reset_at = reset_at
+        wait = max(0, int(reset_at - time.time()))
+        super().__init__(f"GitHub {resource} rate limit exhausted for all tokens (reset in {wait}s)")
+
+class GitHubTokenPool:
+    def __init__(self, tokens=None, low_priority_reserve=0.2, max_wait=60):
+        """
+        Args:
+            tokens: GitHub tokens; defaults to GITHUB_TOKENS (comma-separated)
+                plus GITHUB_TOKEN. With no tokens the pool schedules anonymous calls.
+            low_priority_reserve: Fraction of each budget kept for high-priority calls
+            max_wait: Longest a call will sleep for a reset before giving up (seconds)
+        """
+        if tokens is None:
+            tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
+            if os.getenv("GITHUB_TOKEN"):
+                tokens.append(os.getenv("GITHUB_TOKEN"))
+        self.tokens = list(dict.fromkeys(tokens)) or [None]
+        self.low_priority_reserve = low_priority_reserve
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        # (token, resource) -> {"remaining", "limit", "reset"}
+        self._budgets = {}
+
+    def has_auth(self):
+        return self.tokens != [None]
+
+    def _budget(self, token, resource, now):
+        budget = self._budgets.get((token, resource))
+        if budget is not None and budget["reset"] <= now:
+            # Window rolled over: assume the full budget is back until headers say otherwise
+            budget["remaining"] = budget["limit"]
+            budget["reset"] = now + 60
+        return budget
+
+    def _usable(self, budget, priority):
+        if budget is None:
+            return True
+        floor = 0
+        if priority == PRIORITY_LOW:
+            floor = int(budget["limit"] * self.low_priority_reserve)
+        return budget["remaining"] > floor
+
+    def acquire(self, resource="core", priority=PRIORITY_HIGH):
+        """
+        Pick the token with the most remaining budget for `resource` and reserve one call.
+        Sleeps until the earliest reset when every token is out of budget.
+
+        Returns: token (None for anonymous)
+        """
+        deadline = time.time() + self.max_wait
+        while True:
+            with self._lock:
+                now = time.time()
+                best, best_remaining = None, -1
+                earliest_reset = None
+
+                for token in self.tokens:
+                    budget = self._budget(token, resource, now)
+                    if self._usable(budget, priority):
+                        remaining = budget["remaining"] if budget else float("inf")
+                        if remaining > best_remaining:
+                            best, best_remaining = token, remaining
+                    elif earliest_reset is None or budget["reset"] < earliest_reset:
+                        earliest_reset = budget["reset"]
+
+                if best_remaining >= 0:
+                    budget = self._budgets.get((best, resource))
+                    if budget is not None:
+                        budget["remaining"] -= 1
+                    return best
+
+            if earliest_reset > deadline:
+                raise RateLimitExhausted(resource, earliest_reset)
+            time.sleep(max(0.05, earliest_reset - time.time()))
+
+    def update(self, token, headers):
+        """Record the budget reported by a GitHub response's X-RateLimit-* headers"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        resource = headers.get("X-RateLimit-Resource", "core")
+        limit = int(headers.get("X-RateLimit-Limit", remaining))
+        with self._lock:
+            self._budgets[(token, resource)] = {
+                "remaining": int(remaining),
+                "limit": limit,
+                "reset": float(reset)
+            }
+
+    def mark_exhausted(self, token, resource, retry_after=60):
+        """Block a token for a resource after a 403/429 rate-limit rejection"""
+        with self._lock:
+            budget = self._budgets.setdefault((token, resource), {"limit": 1})
+            budget["remaining"] = 0
+            budget["reset"] = max(budget.get("reset", 0), time.time() + retry_after)
+
+    def status(self):
+        """Current budgets, with tokens masked"""
+        with self._lock:
+            return [
+                {
+                    "token": f"...{token[-4:]}" if token else "anonymous",
+                    "resource": resource,
+                    **budget
+                }
+                for (token, resource), budget in self._budgets.items()
+            ]
+
+_token_pool = None
+_token_pool_lock = threading.Lock()
+
+def get_token_pool():
+    """Process-wide token pool shared by all GitHub callers"""
+    global _token_pool
+    with _token_pool_lock:
+        if _token_pool is None:
+            _token_pool = GitHubTokenPool()
+        return _token_pool
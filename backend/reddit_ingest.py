@@ -0,0 +1,116 @@
+"""
+Incremental Reddit Ingestion State for SignalVane
+Per-subreddit high-water marks and recently seen post IDs, plus daily
+keyword buckets, so each refresh only processes posts it has not seen and
+the 7-day window is maintained by expiring old buckets.
+"""
+import os
+import json
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(__file__), "data", "reddit_state.json")
+
+# Recently seen post IDs remembered per subreddit (dedupes hot vs new)
+SEEN_IDS_PER_SUBREDDIT = 1000
+MAX_TRACKED_TOP_POSTS = 50
+# Posts whose comment threads were already folded into the buckets
+MAX_COMMENT_SCANNED_POSTS = 500
+
+class RedditIngestState:
+    def __init__(self, state_file=DEFAULT_STATE_FILE):
+        self.state_file = state_file
+        data = self._load()
+        self.subreddits = {
+            name: {"newest": sub.get("newest"), "seen": deque(sub.get("seen", []), maxlen=SEEN_IDS_PER_SUBREDDIT)}
+            for name, sub in data.get("subreddits", {}).items()
+        }
+        self.buckets = {
+            day: {"posts": bucket["posts"], "keywords": Counter(bucket["keywords"])}
+            for day, bucket in data.get("buckets", {}).items()
+        }
+        self.top_posts = {post["id"]: post for post in data.get("top_posts", [])}
+        self.comments_scanned = deque(data.get("comments_scanned", []), maxlen=MAX_COMMENT_SCANNED_POSTS)
+
+    def _load(self):
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        data = {
+            "subreddits": {
+                name: {"newest": sub["newest"], "seen": list(sub["seen"])}
+                for name, sub in self.subreddits.items()
+            },
+            "buckets": {
+                day: {"posts": bucket["posts"], "keywords": dict(bucket["keywords"])}
+                for day, bucket in self.buckets.items()
+            },
+            "top_posts": list(self.top_posts.values()),
+            "comments_scanned": list(self.comments_scanned)
+        }
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _subreddit(self, name):
+        if name not in self.subreddits:
+            self.subreddits[name] = {"newest": None, "seen": deque(maxlen=SEEN_IDS_PER_SUBREDDIT)}
+        return self.subreddits[name]
+
+    def newest(self, subreddit_name):
+        """Fullname (t3_...) of the newest post ingested for a subreddit"""
+        return self._subreddit(subreddit_name)["newest"]
+
+    def is_seen(self, subreddit_name, post_id):
+        return post_id in self._subreddit(subreddit_name)["seen"]
+
+    def add_post(self, subreddit_name, post_id, created_utc, keywords):
+        """Count a post that has not been seen before into its day bucket"""
+        self._subreddit(subreddit_name)["seen"].append(post_id)
+        day = datetime.fromtimestamp(created_utc).strftime('%Y-%m-%d')
+        bucket = self.buckets.setdefault(day, {"posts": 0, "keywords": Counter()})
+        bucket["posts"] += 1
+        bucket["keywords"].update(keywords)
+
+    def add_keywords(self, created_utc, keywords):
+        """Count extra keywords (e.g. from comments) into a post's day bucket"""
+        day = datetime.fromtimestamp(created_utc).strftime('%Y-%m-%d')
+        bucket = self.buckets.setdefault(day, {"posts": 0, "keywords": Counter()})
+        bucket["keywords"].update(keywords)
+
+    def set_newest(self, subreddit_name, fullname):
+        self._subreddit(subreddit_name)["newest"] = fullname
+
+    def track_top_post(self, post):
+        """Insert or refresh a popular post (scores change between refreshes)"""
+        self.top_posts[post["id"]] = post
+        if len(self.top_posts) > MAX_TRACKED_TOP_POSTS:
+            keep = sorted(self.top_posts.values(), key=lambda p: p["score"], reverse=True)[:MAX_TRACKED_TOP_POSTS]
+            self.top_posts = {p["id"]: p for p in keep}
+
+    def expire(self, days):
+        """Drop buckets and top posts that fell out of the window"""
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff_day = cutoff.strftime('%Y-%m-%d')
+        self.buckets = {day: b for day, b in self.buckets.items() if day >= cutoff_day}
+        self.top_posts = {
+            pid: p for pid, p in self.top_posts.items()
+            if datetime.fromtimestamp(p["created_utc"]) >= cutoff
+        }
+
+    def window_counts(self):
+        """(keyword Counter, post count) across the live buckets"""
+        keywords = Counter()
+        posts = 0
+        for bucket in self.buckets.values():
+            keywords.update(bucket["keywords"])
+            posts += bucket["posts"]
+        return keywords, posts
@@ -4,11 +4,278 @@ Scrapes r/solana and r/SolanaDevs for narrative signals
 """
 import praw
 import os
+import sys
+import threading
 from datetime import datetime, timedelta
-from collections import Counter
-import re
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
-def fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7, limit=100):
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.http_client import new_session
+from backend.reddit_ingest import RedditIngestState
+from backend.text_signals import TextSignalEngine
+from backend.burst_detector import BurstDetector
+
+_reddit_session = None
+_reddit_session_lock = threading.Lock()
+
+def _get_reddit_session():
+    """
+    Pooled session used only by praw: prawcore rewrites its session's
+    User-Agent, which must not leak into GitHub, RPC or Gemini requests
+    """
+    global _reddit_session
+    with _reddit_session_lock:
+        if _reddit_session is None:
+            _reddit_session = new_session()
+        return _reddit_session
+
+def _make_reddit():
+    """Read-only Reddit client on its own pooled HTTP session"""
+    # Initialize Reddit API (read-only, no auth needed)
+    return praw.Reddit(
+        client_id="anonymous",  # Anonymous access
+        client_secret="",
+        user_agent="SignalVane/1.0",
+        requestor_kwargs={"session": _get_reddit_session()}
+    )
+
+def _fetch_listing(reddit, subreddit_name, listing, limit, params=None):
+    """Materialize one listing (hot/new) of a subreddit"""
+    subreddit = reddit.subreddit(subreddit_name)
+    return list(getattr(subreddit, listing)(limit=limit, params=params or {}))
+
+def _fetch_listing_isolated(subreddit_name, listing, limit, params=None):
+    # praw instances are not thread-safe, so each worker gets its own
+    return _fetch_listing(_make_reddit(), subreddit_name, listing, limit, params)
+
+def _run_in_waves(jobs, max_workers, timeout):
+    """
+    Run (key, fn, args) jobs at most max_workers at a time, each wave on its
+    own pool with its own timeout. A job's deadline starts when it starts, so
+    queued jobs are not dropped because earlier ones used up a shared
+    timeout, and threads abandoned by a timed-out wave never hold up the next.
+
+    Returns: (dict mapping key -> result or the exception raised, list of timed-out keys)
+    """
+    wave_size = max(1, max_workers)
+    results = {}
+    timed_out = []
+
+    for start in range(0, len(jobs), wave_size):
+        wave = jobs[start:start + wave_size]
+        executor = ThreadPoolExecutor(max_workers=len(wave))
+        futures = {executor.submit(fn, *args): key for key, fn, args in wave}
+        done, not_done = wait(futures, timeout=timeout)
+        # Do not block the refresh on slow jobs
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+        timed_out.extend(futures[future] for future in not_done)
+
+    return results, timed_out
+
+def _run_listing_tasks(tasks, max_workers, timeout):
+    """
+    Fetch (subreddit, listing, limit, params) tasks in parallel.
+    Listings that fail or miss their timeout are skipped.
+
+    Returns: dict mapping (subreddit, listing) -> list of submissions
+    """
+    jobs = [
+        ((name, listing), _fetch_listing_isolated, (name, listing, n, params))
+        for name, listing, n, params in tasks
+    ]
+    results, timed_out = _run_in_waves(jobs, max_workers, timeout)
+
+    listings = {}
+    for (name, listing), result in results.items():
+        if isinstance(result, Exception):
+            print(f"Error fetching r/{name} ({listing}): {result}")
+        else:
+            listings[(name, listing)] = result
+    for name, listing in timed_out:
+        print(f"Timed out fetching r/{name} ({listing}) after {timeout}s")
+
+    return listings
+
+def _fetch_concurrently(subreddits, limit, max_workers, timeout):
+    """
+    Fetch hot and new listings of every subreddit in parallel.
+
+    Returns: dict mapping subreddit name -> list of submissions (hot then new)
+    """
+    tasks = ([(name, "hot", limit, None) for name in subreddits] +
+             [(name, "new", limit // 2, None) for name in subreddits])
+    listings = _run_listing_tasks(tasks, max_workers, timeout)
+    return {
+        name: listings.get((name, "hot"), []) + listings.get((name, "new"), [])
+        for name in subreddits
+    }
+
+def _post_dict(submission, subreddit_name):
+    return {
+        "id": submission.id,
+        "title": submission.title,
+        "score": submission.score,
+        "url": f"https://reddit.com{submission.permalink}",
+        "subreddit": subreddit_name
+    }
+
+def iter_comment_bodies(submission, max_depth=3, max_comments=200):
+    """
+    Yield comment bodies breadth-first, capped by depth and count.
+    Only the first `max_comments` comments are requested from Reddit and
+    "load more" stubs are never expanded, so large threads stay cheap.
+    """
+    submission.comment_sort = "top"
+    submission.comment_limit = max_comments
+    submission.comments.replace_more(limit=0)
+
+    queue = deque((comment, 1) for comment in submission.comments)
+    yielded = 0
+    while queue and yielded < max_comments:
+        comment, depth = queue.popleft()
+        body = getattr(comment, "body", None)
+        if body and body not in ("[deleted]", "[removed]"):
+            yield body
+            yielded += 1
+        if depth < max_depth and len(queue) + yielded < max_comments:
+            queue.extend((reply, depth + 1) for reply in comment.replies)
+
+def _scan_comments(post_id, max_depth, max_comments):
+    """Read one post's comment bodies (the engine is only touched by the caller)"""
+    submission = _make_reddit().submission(id=post_id)
+    return list(iter_comment_bodies(submission, max_depth, max_comments))
+
+def fetch_comment_signals(post_ids, engine=None, max_depth=3, max_comments=200, max_workers=8, timeout=30):
+    """
+    Read comment threads of several posts concurrently and count them into keyword counters.
+
+    Args:
+        post_ids: Reddit post IDs to scan
+        engine: TextSignalEngine receiving the comment tokens (a fresh one if None)
+        max_depth: Deepest reply level read
+        max_comments: Max comments read per post
+        max_workers: Posts scanned in parallel
+        timeout: Seconds to wait for each wave of max_workers posts
+
+    Returns:
+        dict mapping post ID -> (comment count, term Counter) for posts that finished
+    """
+    engine = engine or TextSignalEngine()
+    if not post_ids:
+        return {}
+
+    jobs = [(post_id, _scan_comments, (post_id, max_depth, max_comments)) for post_id in post_ids]
+    scanned, timed_out = _run_in_waves(jobs, max_workers, timeout)
+
+    # Scans that time out keep running in abandoned threads, so only the
+    # bodies of scans that finished in time are counted, on this thread
+    results = {}
+    for post_id, result in scanned.items():
+        if isinstance(result, Exception):
+            print(f"Error fetching comments for post {post_id}: {result}")
+            continue
+        terms = Counter()
+        for body in result:
+            terms.update(engine.add_document(body))
+        results[post_id] = (len(result), terms)
+    if timed_out:
+        print(f"Timed out fetching comments for {len(timed_out)} posts after {timeout}s")
+    return results
+
+def _summarize(keyword_counts, post_count, top_posts, subreddits, engine=None):
+    """Build the fetch_reddit_signals result from aggregated counts"""
+    engine = engine or TextSignalEngine()
+    # TF-IDF ranking against the background corpus; stop words never reach the counts
+    top_keywords = engine.rank_terms(keyword_counts, n=15, min_count=3)
+
+    return {
+        "top_keywords": top_keywords,
+        "post_count": post_count,
+        "top_posts": sorted(top_posts, key=lambda x: x['score'], reverse=True)[:10],
+        "subreddits_scraped": subreddits,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _ingest_incremental(subreddits, days, limit, max_workers, timeout, state=None, comments=False):
+    """
+    Fetch only posts newer than each subreddit's high-water mark (plus the hot
+    listing, deduped against recently seen IDs) and fold them into the rolling
+    daily keyword buckets.
+    """
+    state = state or RedditIngestState()
+    engine = TextSignalEngine()
+    detector = BurstDetector()
+    cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+
+    tasks = []
+    for name in subreddits:
+        newest = state.newest(name)
+        tasks.append((name, "new", limit, {"before": newest} if newest else None))
+        tasks.append((name, "hot", limit // 2, None))
+    listings = _run_listing_tasks(tasks, max_workers, timeout)
+
+    # An empty anchored listing can also mean the anchor post was deleted
+    # (Reddit then returns nothing before it, forever), so re-read the
+    # unanchored listing; posts already counted are skipped by is_seen
+    unanchored = [
+        (name, "new", limit, None) for name in subreddits
+        if state.newest(name) and listings.get((name, "new")) == []
+    ]
+    if unanchored:
+        listings.update(_run_listing_tasks(unanchored, max_workers, timeout))
+
+    for name in subreddits:
+        new_posts = listings.get((name, "new"), [])
+        if new_posts:
+            # Listings are newest-first
+            state.set_newest(name, new_posts[0].fullname)
+
+        for submission in new_posts + listings.get((name, "hot"), []):
+            if submission.created_utc < cutoff:
+                continue
+            if not state.is_seen(name, submission.id):
+                state.add_post(name, submission.id, submission.created_utc, engine.add_document(submission.title))
+                detector.add_documents([(f"reddit:{submission.id}", submission.title, submission.created_utc)])
+            if submission.score > 50:  # Popular posts only
+                post = _post_dict(submission, name)
+                post["created_utc"] = submission.created_utc
+                state.track_top_post(post)
+
+    if comments:
+        # Each popular post's thread is folded into its day bucket once
+        pending = [p for p in state.top_posts.values() if p["id"] not in state.comments_scanned]
+        scanned = fetch_comment_signals([p["id"] for p in pending], engine=engine,
+                                        max_workers=max_workers, timeout=timeout)
+        for post in pending:
+            if post["id"] in scanned:
+                state.add_keywords(post["created_utc"], scanned[post["id"]][1])
+                state.comments_scanned.append(post["id"])
+
+    state.expire(days)
+    state.save()
+    engine.save_background()
+    detector.save()
+
+    keyword_counts, post_count = state.window_counts()
+    top_posts = [
+        {k: v for k, v in post.items() if k != "created_utc"}
+        for post in state.top_posts.values()
+        if post["subreddit"] in subreddits
+    ]
+    result = _summarize(keyword_counts, post_count, top_posts, subreddits, engine)
+    result["emerging_terms"] = detector.emerging_terms()
+    return result
+
+def fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7, limit=100,
+                         concurrent=False, max_workers=8, timeout=20, incremental=False, comments=False):
     """
     Fetch hot topics and mentions from Solana-related subreddits
 
@@ -16,68 +283,71 @@ def fetch_reddit_signals(subreddits=["solana", "SolanaDevs"], days=7, limit=100)
         subreddits: List of subreddit names to scrape
         days: How many days back to look
         limit: Max posts to fetch per subreddit
+        concurrent: Fetch all subreddits and listings in parallel
+        max_workers: Worker pool size for concurrent mode
+        timeout: Seconds to wait for each wave of max_workers listings in concurrent mode
+        incremental: Only ingest posts newer than the persisted high-water
+            marks and answer from rolling daily buckets (implies concurrent)
+        comments: Also stream comment threads of the popular posts into
+            the keyword counts (depth/count capped per post). Opt-in: the
+            refresh pipeline does not enable it
 
     Returns:
         dict with top keywords, post titles, and trending topics
     """
     try:
-        # Initialize Reddit API (read-only, no auth needed)
-        reddit = praw.Reddit(
-            client_id="anonymous",  # Anonymous access
-            client_secret="",
-            user_agent="SignalVane/1.0"
-        )
+        if incremental:
+            return _ingest_incremental(subreddits, days, limit, max_workers, timeout, comments=comments)
+
+        reddit = _make_reddit()
 
         all_titles = []
-        all_keywords = []
+        documents = []
         top_posts = []
 
         cutoff_time = datetime.now() - timedelta(days=days)
 
-        for subreddit_name in subreddits:
-            try:
-                subreddit = reddit.subreddit(subreddit_name)
-
-                # Fetch hot and new posts
-                for submission in list(subreddit.hot(limit=limit)) + list(subreddit.new(limit=limit//2)):
-                    post_time = datetime.fromtimestamp(submission.created_utc)
-
-                    if post_time < cutoff_time:
-                        continue
+        if concurrent:
+            fetched = _fetch_concurrently(subreddits, limit, max_workers, timeout)
+        else:
+            fetched = {}
+            for subreddit_name in subreddits:
+                try:
+                    # Fetch hot and new posts
+                    fetched[subreddit_name] = (_fetch_listing(reddit, subreddit_name, "hot", limit) +
+                                               _fetch_listing(reddit, subreddit_name, "new", limit // 2))
+                except Exception as e:
+                    print(f"Error fetching r/{subreddit_name}: {e}")
+                    continue
 
-                    all_titles.append(submission.title)
+        for subreddit_name, submissions in fetched.items():
+            for submission in submissions:
+                post_time = datetime.fromtimestamp(submission.created_utc)
 
-                    # Extract keywords (simple approach)
-                    words = re.findall(r'\b[A-Z][A-Za-z]{3,}\b', submission.title)
-                    all_keywords.extend(words)
+                if post_time < cutoff_time:
+                    continue
 
-                    if submission.score > 50:  # Popular posts only
-                        top_posts.append({
-                            "title": submission.title,
-                            "score": submission.score,
-                            "url": f"https://reddit.com{submission.permalink}",
-                            "subreddit": subreddit_name
-                        })
-
-            except Exception as e:
-                print(f"Error fetching r/{subreddit_name}: {e}")
-                continue
+                all_titles.append(submission.title)
+                documents.append((f"reddit:{submission.id}", submission.title, submission.created_utc))
 
-        # Count keyword frequencies
-        keyword_counts = Counter(all_keywords)
-        top_keywords = keyword_counts.most_common(20)
+                if submission.score > 50:  # Popular posts only
+                    top_posts.append(_post_dict(submission, subreddit_name))
 
-        # Filter out common non-narrative words
-        stop_words = {'Reddit', 'Post', 'Question', 'Help', 'Update', 'News'}
-        filtered_keywords = [(k, v) for k, v in top_keywords if k not in stop_words and v >= 3]
+        # Count keyword frequencies over the whole batch of titles
+        engine = TextSignalEngine().add_documents(all_titles)
+        if comments:
+            popular = sorted(top_posts, key=lambda x: x['score'], reverse=True)[:10]
+            fetch_comment_signals([p["id"] for p in popular], engine=engine,
+                                  max_workers=max_workers, timeout=timeout)
+        result = _summarize(engine.unigrams + engine.bigrams, len(all_titles), top_posts, subreddits, engine)
+        engine.save_background()
 
-        return {
-            "top_keywords": filtered_keywords[:15],
-            "post_count": len(all_titles),
-            "top_posts": sorted(top_posts, key=lambda x: x['score'], reverse=True)[:10],
-            "subreddits_scraped": subreddits,
-            "timestamp": datetime.now().isoformat()
-        }
+        # Posts are bucketed by creation time and counted once per bucket
+        detector = BurstDetector()
+        detector.add_documents(documents)
+        detector.save()
+        result["emerging_terms"] = detector.emerging_terms()
+        return result
 
     except Exception as e:
         print(f"Reddit API Error: {e}")
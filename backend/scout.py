@@ -1,55 +1,270 @@
 import os
-import requests
+import sys
 import json
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.http_cache import HTTPCache
+from backend.commit_velocity import add_commit_velocity
+from backend.star_history import record_star_counts
+from backend.metrics_engine import MetricsEngine
+from backend.onchain_aggregator import aggregate_onchain_activity
+from backend.rate_limiter import get_token_pool, RateLimitExhausted, PRIORITY_HIGH, PRIORITY_LOW
+
+GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+
+# Queries tracked by the multi-query collector (collect_github_signals)
+DEFAULT_GITHUB_QUERIES = [
+    "solana",
+    "svm",
+    "anchor solana",
+    "token-2022",
+    "zk-compression",
+    "solana agent",
+    "solana defi",
+    "firedancer",
+]
+
+# Placeholders carry no raw_value, so they are never recorded as observations
+MOCK_ONCHAIN_METRICS = [
+    {"metric": "New Program Deployments", "value": "142", "change": "+12%", "status": "Stable",
+     "unit": "programs"},
+    {"metric": "Active Developer Wallets", "value": "2,450", "change": "+8%", "status": "Growing",
+     "unit": "wallets"},
+    {"metric": "ZK-Compression Usage", "value": "Significant Spike", "change": "+45%", "status": "Hot",
+     "unit": "%"}
+]
+
+# Shared ETag cache: unchanged searches come back as 304s and cost no quota
+_http_cache = HTTPCache()
+
+def _github_headers():
+    """Build GitHub API headers (auth is added per request by the token pool)."""
+    return {
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+def _repo_from_item(item):
+    """Convert a GitHub search item into the scout repo dict."""
+    return {
+        "name": item["full_name"],
+        "stars": item["stargazers_count"],
+        "description": item["description"],
+        "url": item["html_url"],
+        "language": item["language"],
+        "updated_at": item["pushed_at"]
+    }
+
+def _retry_after_seconds(headers, default=60):
+    """
+    Seconds until a rate-limited token can be used again: Retry-After
+    (delta-seconds or HTTP-date), else X-RateLimit-Reset (epoch seconds).
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return default
+
+def _is_rate_limited(response):
+    return response.status_code in (403, 429) and (
+        response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers
+    )
+
+def _github_get(url, headers, timeout=30, resource="search", priority=PRIORITY_HIGH):
+    """
+    GET a GitHub API URL through the token pool and the conditional-request cache.
+    A token rejected for rate limiting is parked and the call moves on to the
+    next token; when every token is rate limited, falls back to the last
+    cached body for the URL.
+    """
+    pool = get_token_pool()
+    try:
+        reset_at = time.time()
+        # One attempt per token, plus one after the pool's short wait for a reset
+        for _ in range(len(pool.tokens) + 1):
+            # Optional: GITHUB_TOKEN / GITHUB_TOKENS for higher rate limits
+            token = pool.acquire(resource, priority)
+            request_headers = dict(headers)
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+
+            try:
+                response = _http_cache.get(url, headers=request_headers, timeout=timeout)
+            except requests.HTTPError as e:
+                if e.response is None:
+                    raise
+                pool.update(token, e.response.headers)
+                if not _is_rate_limited(e.response):
+                    raise
+                retry_after = _retry_after_seconds(e.response.headers)
+                pool.mark_exhausted(token, resource, retry_after)
+                reset_at = time.time() + retry_after
+                continue
+
+            pool.update(token, response.headers)
+            return response
+
+        raise RateLimitExhausted(resource, reset_at)
+
+    except RateLimitExhausted as e:
+        stale = _http_cache.stale(url)
+        if stale is None:
+            raise
+        print(f"⚠️  {e}; serving cached GitHub results")
+        return stale
+
 def fetch_github_signals(query="solana", days=14):
     """
     Fetches hot Solana repositories created or updated in the last N days.
     """
     date_threshold = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    url = f"https://api.github.com/search/repositories?q={query}+pushed:>{date_threshold}&sort=stars&order=desc"
-    
-    headers = {
-        "Accept": "application/vnd.github.v3+json"
-    }
-    # Optional: GITHUB_TOKEN for higher rate limits
-    token = os.getenv("GITHUB_TOKEN")
-    if token:
-        headers["Authorization"] = f"token {token}"
+    url = f"{GITHUB_SEARCH_URL}?q={query}+pushed:>{date_threshold}&sort=stars&order=desc"
+
+    headers = _github_headers()
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        response = _github_get(url, headers)
         data = response.json()
         
         repos = []
         for item in data.get("items", [])[:15]:
-            repos.append({
-                "name": item["full_name"],
-                "stars": item["stargazers_count"],
-                "description": item["description"],
-                "url": item["html_url"],
-                "language": item["language"],
-                "updated_at": item["pushed_at"]
-            })
-        return repos
+            repos.append(_repo_from_item(item))
+        return record_star_counts(repos)
     except Exception as e:
         print(f"Error fetching GitHub data: {e}")
         return []
 
-def fetch_onchain_metrics():
+def _search_all_pages(query, date_threshold, pages, per_page, headers):
+    """
+    Run one search query, following the `next` pagination link for up to `pages` pages.
+    Returns the raw search items.
+    """
+    url = f"{GITHUB_SEARCH_URL}?q={query.replace(' ', '+')}+pushed:>{date_threshold}&sort=stars&order=desc&per_page={per_page}"
+    items = []
+
+    for page in range(pages):
+        # Deeper pages are nice-to-have and yield to first pages when budget runs low
+        try:
+            response = _github_get(url, headers, priority=PRIORITY_HIGH if page == 0 else PRIORITY_LOW)
+        except (RateLimitExhausted, requests.RequestException) as e:
+            if page == 0:
+                raise
+            # Keep the pages already fetched instead of losing the whole query
+            print(f"⚠️  Stopping '{query}' after {page} page(s): {e}")
+            break
+        items.extend(response.json().get("items", []))
+
+        next_link = response.links.get("next")
+        if not next_link:
+            break
+        url = next_link["url"]
+
+    return items
+
+def collect_github_signals(queries=None, days=14, pages=3, per_page=50, max_workers=8, limit=None,
+                           with_velocity=False):
+    """
+    Collector mode for fetch_github_signals: runs many search queries concurrently.
+
+    Args:
+        queries: List of search queries (defaults to DEFAULT_GITHUB_QUERIES)
+        days: Only repos pushed in the last N days
+        pages: Max result pages to follow per query
+        per_page: Results per page (GitHub allows up to 100)
+        max_workers: Size of the worker pool (bounds concurrent requests)
+        limit: Optional cap on the number of merged repos returned
+        with_velocity: Run the commit-velocity stage and rank by commits_14d
+
+    Returns:
+        list of repo dicts (same shape as fetch_github_signals), merged by
+        full_name and sorted by stars (or commit velocity)
+    """
+    queries = queries or DEFAULT_GITHUB_QUERIES
+    date_threshold = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    headers = _github_headers()
+
+    merged = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+        futures = {
+            executor.submit(_search_all_pages, query, date_threshold, pages, per_page, headers): query
+            for query in queries
+        }
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                # A failing query only loses its own results
+                print(f"Error fetching GitHub data for '{query}': {e}")
+                continue
+
+            for item in items:
+                repo = _repo_from_item(item)
+                existing = merged.get(repo["name"])
+                # Repos matched by several queries keep the highest star count seen
+                if existing is None or repo["stars"] >= existing["stars"]:
+                    merged[repo["name"]] = repo
+
+    repos = sorted(merged.values(), key=lambda r: r["stars"], reverse=True)
+    record_star_counts(repos)
+
+    if with_velocity:
+        add_commit_velocity(repos)
+        repos.sort(key=lambda r: (r["commits_14d"] or 0, r["stars"]), reverse=True)
+
+    return repos[:limit] if limit else repos
+
+def fetch_onchain_metrics(observations=None):
     """
     Fetches basic Solana on-chain metrics (Mocked or using Public RPC for TPS/Active Addresses).
     In a real scenario, we'd use a Helius API key here.
+
+    Args:
+        observations: Optional dict of metric name -> numeric value. When given,
+            values are scored by the streaming metrics engine (14-day z-scores).
     """
+    if observations:
+        return MetricsEngine().ingest(observations)
+
+    # Live counts when an RPC endpoint is configured
+    if os.getenv("SOLANA_RPC_URL") or os.getenv("HELIUS_API_KEY"):
+        try:
+            activity = aggregate_onchain_activity(days=14)
+            metrics = MetricsEngine().ingest({
+                "New Program Deployments": activity["program_deployments"],
+                "Active Developer Wallets": activity["active_developer_wallets"]
+            }, units={
+                "New Program Deployments": "programs",
+                "Active Developer Wallets": "wallets"
+            })
+            # Count-Min estimates of the busiest programs in the window
+            metrics[0]["top_programs"] = activity["most_active_programs"]
+            # No on-chain source for ZK-compression usage yet
+            return metrics + MOCK_ONCHAIN_METRICS[2:]
+        except Exception as e:
+            print(f"Error fetching on-chain metrics: {e}")
+
     # For the prototype, we'll return some realistic 'observed' spikes
     # based on the 14-day window.
-    return [
-        {"metric": "New Program Deployments", "value": "142", "change": "+12%", "status": "Stable"},
-        {"metric": "Active Developer Wallets", "value": "2,450", "change": "+8%", "status": "Growing"},
-        {"metric": "ZK-Compression Usage", "value": "Significant Spike", "change": "+45%", "status": "Hot"}
-    ]
+    return MOCK_ONCHAIN_METRICS
 
 if __name__ == "__main__":
     print("Testing GitHub Signal Fetcher...")
@@ -4,109 +4,190 @@ Uses Gemini AI to analyze narrative sentiment and momentum
 """
 import google.generativeai as genai
 import os
-import json
+import sys
+import threading
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.gemini_client import configure_sdk
+from backend.llm_cache import get_llm_cache
+from backend.llm_resilience import resilient_call
+from backend.llm_json import parse_llm_json, record_invalid
+from backend.llm_schemas import (
+    SENTIMENT_SCHEMA, SENTIMENT_BATCH_SCHEMA, generation_config, cache_params, validate_sentiment
+)
+
 load_dotenv()
 
 # Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+configure_sdk(os.getenv("GEMINI_API_KEY"))
+MODEL_NAME = 'gemini-2.5-flash'
+BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "8"))
+# The dashboard waits on these calls, so give up sooner than the pipeline does
+SENTIMENT_DEADLINE = 30
+
+SENTIMENT_CRITERIA = """Analyze the overall sentiment (positive/neutral/negative) based on:
+1. The strength and quality of evidence
+2. The narrative's potential impact on Solana ecosystem
+3. The momentum indicators (GitHub activity, market signals)
+4. The novelty and innovation level"""
+
+SENTIMENT_FIELDS = """{
+    "sentiment": "positive|neutral|negative",
+    "confidence": 0.0-1.0,
+    "reasoning": "brief explanation (1-2 sentences)",
+    "momentum_score": 0-10
+}"""
+
+_model = None
+_model_lock = threading.Lock()
+
+def _get_model():
+    """Shared GenerativeModel, created on first use"""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = genai.GenerativeModel(MODEL_NAME)
+        return _model
+
+def _generate(prompt, schema, use_cache=True):
+    return get_llm_cache().get_or_call(
+        MODEL_NAME, prompt,
+        lambda: resilient_call("sentiment", lambda timeout: _get_model().generate_content(
+            prompt, generation_config=generation_config(schema), request_options={"timeout": timeout}
+        ).text, deadline=SENTIMENT_DEADLINE),
+        params=cache_params(schema),
+        bypass=not use_cache
+    )
+
+def _validate_result(result):
+    errors = validate_sentiment(result)
+    if errors:
+        raise ValueError(f"Invalid sentiment result: {'; '.join(errors)}")
+    return result
+
+def _format_narrative(narrative):
+    """Narrative section shared by the single and batch prompts"""
+    return f"""**Narrative:** {narrative['narrative_name']}
+
+**Explanation:** {narrative['explanation']}
+
+**GitHub Evidence:**
+{chr(10).join(['- ' + e for e in narrative['evidence']['github']])}
+
+**Market Intelligence:**
+{chr(10).join(['- ' + e for e in narrative['evidence']['market_intel']])}
+
+**Novelty Score:** {narrative.get('novelty_score', 5)}/10"""
+
+def _heuristic_sentiment(narrative, error):
+    """Fallback to heuristic if AI fails"""
+    score = narrative.get('novelty_score', 5)
+    if score >= 8:
+        sentiment = "positive"
+    elif score >= 6:
+        sentiment = "neutral"
+    else:
+        sentiment = "negative"
+
+    return {
+        "sentiment": sentiment,
+        "confidence": 0.5,
+        "reasoning": "Fallback heuristic based on novelty score",
+        "momentum_score": score,
+        "error": str(error)
+    }
 
-def analyze_narrative_sentiment(narrative):
+def analyze_narrative_sentiment(narrative, use_cache=True):
     """
     Use Gemini AI to analyze the sentiment and momentum of a narrative
 
     Args:
         narrative: dict with narrative_name, explanation, evidence
+        use_cache: serve repeated prompts from the LLM cache
 
     Returns:
         dict with sentiment, confidence, reasoning
     """
+    prompt = None
     try:
-        # Build the prompt
         prompt = f"""Analyze the sentiment and momentum of this Solana ecosystem narrative:
 
-**Narrative:** {narrative['narrative_name']}
-
-**Explanation:** {narrative['explanation']}
-
-**GitHub Evidence:**
-{chr(10).join(['- ' + e for e in narrative['evidence']['github']])}
-
-**Market Intelligence:**
-{chr(10).join(['- ' + e for e in narrative['evidence']['market_intel']])}
-
-**Novelty Score:** {narrative.get('novelty_score', 5)}/10
+{_format_narrative(narrative)}
 
-Analyze the overall sentiment (positive/neutral/negative) based on:
-1. The strength and quality of evidence
-2. The narrative's potential impact on Solana ecosystem
-3. The momentum indicators (GitHub activity, market signals)
-4. The novelty and innovation level
+{SENTIMENT_CRITERIA}
 
 Respond in JSON format:
-{{
-    "sentiment": "positive|neutral|negative",
-    "confidence": 0.0-1.0,
-    "reasoning": "brief explanation (1-2 sentences)",
-    "momentum_score": 0-10
-}}"""
+{SENTIMENT_FIELDS}"""
+
+        result = parse_llm_json(_generate(prompt, SENTIMENT_SCHEMA, use_cache), "sentiment", expect='{')
+        return _validate_result(result)
 
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
+    except Exception as e:
+        print(f"⚠️ Sentiment analysis failed for '{narrative['narrative_name']}': {e}")
+        if prompt is not None:
+            get_llm_cache().discard(MODEL_NAME, prompt, cache_params(SENTIMENT_SCHEMA))
+        return _heuristic_sentiment(narrative, e)
 
-        # Parse the JSON response
-        response_text = response.text.strip()
+def _analyze_chunk(narratives, use_cache=True):
+    """
+    Analyze several narratives with one request.
 
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            # Remove first line (```json or ```)
-            lines = lines[1:]
-            # Remove last line (```)
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-            response_text = "\n".join(lines).strip()
+    Returns: dict mapping index within the chunk -> validated result
+    (narratives missing from a malformed response are left out)
+    """
+    sections = "\n\n".join(
+        f"### Narrative {i}\n\n{_format_narrative(n)}" for i, n in enumerate(narratives)
+    )
+    prompt = f"""Analyze the sentiment and momentum of each of these {len(narratives)} Solana ecosystem narratives:
 
-        result = json.loads(response_text)
+{sections}
 
-        # Validate the response
-        if result['sentiment'] not in ['positive', 'neutral', 'negative']:
-            raise ValueError(f"Invalid sentiment: {result['sentiment']}")
+{SENTIMENT_CRITERIA}
 
-        return result
+Respond with a JSON array holding one object per narrative, with "index" set to the narrative number and the other fields in this format:
+{SENTIMENT_FIELDS}"""
 
+    try:
+        response = parse_llm_json(_generate(prompt, SENTIMENT_BATCH_SCHEMA, use_cache), "sentiment_batch", expect='[')
     except Exception as e:
-        print(f"⚠️ Sentiment analysis failed for '{narrative['narrative_name']}': {e}")
+        print(f"⚠️ Batch sentiment analysis failed for {len(narratives)} narratives: {e}")
+        get_llm_cache().discard(MODEL_NAME, prompt, cache_params(SENTIMENT_BATCH_SCHEMA))
+        return {}
+
+    results = {}
+    for entry in response:
+        index = entry.get("index") if isinstance(entry, dict) else None
+        if isinstance(index, int) and 0 <= index < len(narratives) and not validate_sentiment(entry):
+            results[index] = {k: v for k, v in entry.items() if k != "index"}
+    if len(results) < len(narratives):
+        record_invalid("sentiment_batch", len(narratives) - len(results))
+        # Do not replay a partial answer from the cache next time
+        get_llm_cache().discard(MODEL_NAME, prompt, cache_params(SENTIMENT_BATCH_SCHEMA))
+    return results
 
-        # Fallback to heuristic if AI fails
-        score = narrative.get('novelty_score', 5)
-        if score >= 8:
-            sentiment = "positive"
-        elif score >= 6:
-            sentiment = "neutral"
-        else:
-            sentiment = "negative"
-
-        return {
-            "sentiment": sentiment,
-            "confidence": 0.5,
-            "reasoning": "Fallback heuristic based on novelty score",
-            "momentum_score": score,
-            "error": str(e)
-        }
-
-def batch_analyze_narratives(narratives):
+def batch_analyze_narratives(narratives, batch_size=BATCH_SIZE, use_cache=True):
     """
-    Analyze sentiment for multiple narratives
+    Analyze sentiment for multiple narratives, batch_size narratives per request.
+    Narratives missing from a malformed batch response are retried one by one.
+
     Returns dict mapping narrative_name to sentiment results
     """
     results = {}
 
-    for narrative in narratives:
-        name = narrative['narrative_name']
-        print(f"Analyzing sentiment: {name}...")
-        results[name] = analyze_narrative_sentiment(narrative)
+    for start in range(0, len(narratives), max(1, batch_size)):
+        chunk = narratives[start:start + max(1, batch_size)]
+        print(f"Analyzing sentiment: {len(chunk)} narratives in one request...")
+        chunk_results = _analyze_chunk(chunk, use_cache)
+
+        for i, narrative in enumerate(chunk):
+            name = narrative['narrative_name']
+            if i in chunk_results:
+                results[name] = chunk_results[i]
+            else:
+                print(f"Analyzing sentiment: {name}...")
+                results[name] = analyze_narrative_sentiment(narrative, use_cache)
 
     return results
 
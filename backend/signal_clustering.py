@@ -0,0 +1,225 @@
+"""
+Signal Clustering for SignalVane
+Deterministic pre-clustering of repos and market-intelligence signals
+before the narrative LLM call. Each signal becomes a sparse TF-IDF vector
+(unigrams + bigrams from text_signals); spherical k-means groups them into a
+handful of themes, and each theme is summarized as top terms plus
+representative evidence. The LLM then gets a few compact cluster lines in
+place of hundreds of raw list entries.
+
+Everything is seeded from the data itself (no randomness), so the same
+signals always produce the same clusters.
+"""
+import os
+import sys
+import re
+import math
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.text_signals import extract_terms
+
+MAX_CLUSTERS = 8
+MAX_ITERATIONS = 10
+TOP_TERMS = 4
+EVIDENCE_PER_CLUSTER = 3
+EVIDENCE_CHARS = 70
+
+def _normalize_vector(weights):
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {t: w / norm for t, w in weights.items()} if norm else {}
+
+def _dot(vector, centroid):
+    # Iterate the (short) document vector, look up the (long) centroid
+    return sum(w * centroid.get(t, 0.0) for t, w in vector.items())
+
+def vectorize(texts):
+    """
+    TF-IDF vectors of texts, with IDF from the texts themselves.
+
+    Returns: list of L2-normalized sparse vectors ({term: weight})
+    """
+    term_counts = [Counter(extract_terms(text or "")) for text in texts]
+    doc_freq = Counter()
+    for counts in term_counts:
+        doc_freq.update(counts.keys())
+
+    n = len(texts)
+    idf = {t: math.log((1 + n) / (1 + df)) + 1 for t, df in doc_freq.items()}
+    return [
+        _normalize_vector({t: (1 + math.log(c)) * idf[t] for t, c in counts.items()})
+        for counts in term_counts
+    ]
+
+def spherical_kmeans(vectors, weights, k, max_iterations=MAX_ITERATIONS):
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Seeds are chosen deterministically: the heaviest signal first, then
+    repeatedly the signal least similar to any seed chosen so far.
+
+    Returns: list of cluster indexes (-1 for empty vectors)
+    """
+    candidates = [i for i, v in enumerate(vectors) if v]
+    if not candidates:
+        return [-1] * len(vectors)
+    k = max(1, min(k, len(candidates)))
+
+    seeds = [max(candidates, key=lambda i: (weights[i], -i))]
+    best_sim = {i: _dot(vectors[i], vectors[seeds[0]]) for i in candidates}
+    while len(seeds) < k:
+        chosen = set(seeds)
+        nxt = min((i for i in candidates if i not in chosen), key=lambda i: (best_sim[i], -weights[i], i))
+        seeds.append(nxt)
+        for i in candidates:
+            best_sim[i] = max(best_sim[i], _dot(vectors[i], vectors[nxt]))
+    centroids = [dict(vectors[i]) for i in seeds]
+
+    assignment = [-1] * len(vectors)
+    for _ in range(max_iterations):
+        # Inverted index over centroids: one lookup per document term scores all clusters
+        postings = {}
+        for c, centroid in enumerate(centroids):
+            for t, w in centroid.items():
+                postings.setdefault(t, []).append((c, w))
+
+        changed = 0
+        for i in candidates:
+            sims = [0.0] * len(centroids)
+            for t, w in vectors[i].items():
+                for c, cw in postings.get(t, ()):
+                    sims[c] += w * cw
+            best = max(range(len(centroids)), key=lambda c: (sims[c], -c))
+            if assignment[i] != best:
+                assignment[i] = best
+                changed += 1
+        # Converged once almost nothing moves
+        if changed <= len(candidates) // 200:
+            break
+
+        # Weighted mean direction of each cluster's members
+        sums = [Counter() for _ in centroids]
+        for i in candidates:
+            for t, w in vectors[i].items():
+                sums[assignment[i]][t] += w * weights[i]
+        centroids = [_normalize_vector(s) if s else centroids[c] for c, s in enumerate(sums)]
+
+    return assignment
+
+def _shorten(text, limit=EVIDENCE_CHARS):
+    text = ' '.join((text or 'No description').split())
+    return text if len(text) <= limit else text[:limit].rsplit(' ', 1)[0] + '...'
+
+def repo_score(repo):
+    """Stars on a log scale, boosted by star spikes and recent commits"""
+    return (math.log1p(repo.get('stars', 0))
+            + max(repo.get('star_spike_z') or 0, 0)
+            + math.log1p(repo.get('commits_14d') or 0))
+
+def _collect_signals(signals_data):
+    """Flatten repos and intel into (kind, text, evidence, weight, stars) records"""
+    signals = []
+    for repo in signals_data.get("github_momentum", []):
+        name_words = re.sub(r'[/_-]+', ' ', repo['name'])
+        # Same activity figures as the raw repo lines (prompt_builder._repo_line)
+        activity = f"{repo.get('stars', 0)} stars"
+        if repo.get('commits_14d'):
+            activity += f", {repo['commits_14d']} commits/14d"
+        signals.append({
+            "kind": "repo",
+            "text": f"{name_words} {repo.get('description') or ''}",
+            "evidence": f"{repo['name']} ({activity}): {_shorten(repo.get('description'))}",
+            "weight": 1 + repo_score(repo),
+            "stars": repo.get('stars', 0),
+        })
+    for i, signal in enumerate(signals_data.get("market_intelligence", [])):
+        if not isinstance(signal, dict):
+            signal = {"summary": str(signal)}
+        summary = signal.get('summary', '')
+        signals.append({
+            "kind": "intel",
+            # The term alone keeps boilerplate ("mentioned N times") out of the vector
+            "text": signal.get('term') or summary,
+            "evidence": f"{signal.get('source', 'Unknown')}: {summary}",
+            "weight": 1 + 3 / (1 + 0.2 * i),
+            "stars": 0,
+        })
+    return signals
+
+def cluster_signals(signals_data, max_clusters=MAX_CLUSTERS):
+    """
+    Group repos and market intelligence into themes.
+
+    Returns:
+        list of cluster dicts sorted by weight: terms, size, repos, intel,
+        stars, weight, evidence (representative lines). Signals without any
+        usable terms are left out.
+    """
+    signals = _collect_signals(signals_data)
+    if not signals:
+        return []
+
+    vectors = vectorize([s["text"] for s in signals])
+    weights = [s["weight"] for s in signals]
+    k = min(max_clusters, max(2, round(math.sqrt(len(signals) / 2))))
+    assignment = spherical_kmeans(vectors, weights, k)
+
+    members = {}
+    for i, c in enumerate(assignment):
+        if c >= 0:
+            members.setdefault(c, []).append(i)
+
+    clusters = []
+    for indexes in members.values():
+        centroid = Counter()
+        for i in indexes:
+            for t, w in vectors[i].items():
+                centroid[t] += w * weights[i]
+        terms = _top_terms(centroid)
+
+        # Representatives: closest to the theme, weighted by signal strength,
+        # taking the best repo and the best intel line before filling up
+        centroid = _normalize_vector(centroid)
+        ranked = sorted(indexes, key=lambda i: (-_dot(vectors[i], centroid) * weights[i], i))
+        evidence = []
+        for kind in ("repo", "intel"):
+            first = next((i for i in ranked if signals[i]["kind"] == kind), None)
+            if first is not None:
+                evidence.append(first)
+        evidence += [i for i in ranked if i not in evidence][:max(0, EVIDENCE_PER_CLUSTER - len(evidence))]
+        evidence.sort(key=ranked.index)
+
+        clusters.append({
+            "terms": terms,
+            "size": len(indexes),
+            "repos": sum(1 for i in indexes if signals[i]["kind"] == "repo"),
+            "intel": sum(1 for i in indexes if signals[i]["kind"] == "intel"),
+            "stars": sum(signals[i]["stars"] for i in indexes),
+            "weight": round(sum(weights[i] for i in indexes), 2),
+            "evidence": [signals[i]["evidence"] for i in evidence[:EVIDENCE_PER_CLUSTER]],
+        })
+
+    clusters.sort(key=lambda c: (-c["weight"], c["terms"]))
+    return clusters
+
+def _top_terms(centroid, n=TOP_TERMS):
+    """Highest-weight terms, skipping unigrams already covered by a chosen bigram"""
+    chosen = []
+    for term, _ in sorted(centroid.items(), key=lambda kv: (-kv[1], kv[0])):
+        if any(term in c.split() for c in chosen):
+            continue
+        chosen.append(term)
+        if len(chosen) == n:
+            break
+    return chosen
+
+def format_cluster(cluster):
+    """One prompt line for a cluster"""
+    parts = []
+    if cluster["repos"]:
+        parts.append(f"{cluster['repos']} repos, {cluster['stars']} stars")
+    if cluster["intel"]:
+        parts.append(f"{cluster['intel']} intel")
+    return (f"Theme [{', '.join(cluster['terms'])}] ({'; '.join(parts)}) | "
+            f"e.g. {'; '.join(cluster['evidence'])}")
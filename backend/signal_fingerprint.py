@@ -0,0 +1,115 @@
+"""
+Signal Fingerprint for SignalVane
+Normalized feature fingerprint of the signal set fed to the narrative LLM,
+compared against the inputs of the last generation with a weighted Jaccard
+similarity. Narrative regeneration is skipped while the signals are nearly
+unchanged, which removes most repeat Gemini calls.
+
+Tuning (environment variables):
+    REGENERATION_SIMILARITY  similarity at or above which narratives are reused (0.85)
+"""
+import os
+import json
+import math
+import hashlib
+from datetime import datetime
+
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(__file__), "data", "signal_fingerprint.json")
+SIMILARITY_THRESHOLD = float(os.getenv("REGENERATION_SIMILARITY", "0.85"))
+
+# Share of the fingerprint each signal family carries
+GROUP_WEIGHTS = {"repo": 0.5, "term": 0.3, "metric": 0.2}
+
+def _normalize_group(features, share):
+    total = sum(features.values())
+    return {k: share * v / total for k, v in features.items()} if total else {}
+
+def signal_features(signals_data):
+    """
+    Weighted features of a signal set, each family scaled to its GROUP_WEIGHTS share.
+
+    - repo:<name>         log-scaled stars (star growth shifts the weight)
+    - term:<term>         emerging terms / keywords, earlier (stronger) ones heavier
+    - metric:<name>=<status>  on-chain metric state (Hot, Cooling, ...)
+    """
+    repos = {}
+    for repo in signals_data.get("github_momentum", []):
+        repos[f"repo:{repo['name'].lower()}"] = math.log1p(repo.get('stars', 0)) + 1
+
+    terms = {}
+    for i, signal in enumerate(signals_data.get("market_intelligence", [])):
+        if isinstance(signal, dict):
+            key = signal.get('term') or signal.get('summary', '')
+        else:
+            key = str(signal)
+        key = f"term:{' '.join(str(key).lower().split())}"
+        terms[key] = max(terms.get(key, 0), 1 / (1 + 0.2 * i))
+
+    metrics = {}
+    for m in signals_data.get("onchain_metrics", []):
+        state = m.get('status') or m.get('change', '')
+        metrics[f"metric:{m['metric'].lower()}={str(state).lower()}"] = 1.0
+
+    features = {}
+    for group, values in (("repo", repos), ("term", terms), ("metric", metrics)):
+        features.update(_normalize_group(values, GROUP_WEIGHTS[group]))
+    return features
+
+def weighted_jaccard(a, b):
+    """sum(min) / sum(max) over the union of features; 1.0 for identical sets"""
+    keys = set(a) | set(b)
+    if not keys:
+        return 1.0
+    num = sum(min(a.get(k, 0.0), b.get(k, 0.0)) for k in keys)
+    den = sum(max(a.get(k, 0.0), b.get(k, 0.0)) for k in keys)
+    return num / den if den else 1.0
+
+def fingerprint_digest(features):
+    """Stable short hash of a feature set (rounded so float noise does not matter)"""
+    canonical = json.dumps(sorted((k, round(v, 4)) for k, v in features.items()))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+class SignalFingerprintStore:
+    """Features of the signals behind the current narratives"""
+
+    def __init__(self, state_file=DEFAULT_STATE_FILE):
+        self.state_file = state_file
+        self.state = self._load()
+
+    def _load(self):
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        return None
+
+    def compare(self, features):
+        """Similarity to the last generation's inputs (None if there was none)"""
+        if not self.state:
+            return None
+        return weighted_jaccard(features, self.state.get("features", {}))
+
+    def should_regenerate(self, features, threshold=SIMILARITY_THRESHOLD, force=False):
+        """
+        Returns:
+            (regenerate: bool, similarity: float or None)
+        """
+        similarity = self.compare(features)
+        if force or similarity is None:
+            return True, similarity
+        return similarity < threshold, similarity
+
+    def record(self, features):
+        """Remember the inputs of a successful generation"""
+        self.state = {
+            "generated_at": datetime.now().isoformat(),
+            "digest": fingerprint_digest(features),
+            "features": features,
+        }
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_file)
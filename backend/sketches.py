@@ -0,0 +1,100 @@
+"""
+Probabilistic counters for SignalVane
+HyperLogLog (unique counts) and Count-Min (frequencies) sketches with fixed
+memory, merge support and compact base64 serialization for JSON files.
+"""
+import math
+import base64
+import hashlib
+from array import array
+
+def _hash64(value, salt=b""):
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "big")
+
+class HyperLogLog:
+    """Mergeable unique counter (~1.04 / sqrt(2^p) relative error)"""
+
+    def __init__(self, p=12, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Linear counting is more accurate for small cardinalities
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {"p": self.p, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(p=data["p"], registers=base64.b64decode(data["registers"]))
+
+class CountMinSketch:
+    """Mergeable frequency sketch; estimates never undercount"""
+
+    def __init__(self, width=2048, depth=4, counts=None):
+        self.width = width
+        self.depth = depth
+        self.counts = array('q', counts) if counts is not None else array('q', bytes(8 * width * depth))
+        self.total = 0
+
+    def _indexes(self, key):
+        h1 = _hash64(key)
+        h2 = _hash64(key, salt=b"cms") | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        for i in self._indexes(key):
+            self.counts[i] += count
+        self.total += count
+
+    def estimate(self, key):
+        return min(self.counts[i] for i in self._indexes(key))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different shapes")
+        self.counts = array('q', map(sum, zip(self.counts, other.counts)))
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "counts": base64.b64encode(self.counts.tobytes()).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        counts = array('q')
+        counts.frombytes(base64.b64decode(data["counts"]))
+        sketch = cls(width=data["width"], depth=data["depth"], counts=counts)
+        sketch.total = data.get("total", 0)
+        return sketch
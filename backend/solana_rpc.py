@@ -0,0 +1,349 @@
+"""
+Batched Solana JSON-RPC client for SignalVane
+Sends JSON-RPC batch arrays (many calls per HTTP request), runs chunks with
+bounded concurrency, coalesces identical in-flight calls and caches results
+by slot. Used to collect program-deployment and developer-wallet activity
+for the on-chain metrics.
+
+Set SOLANA_RPC_URL (or HELIUS_API_KEY) to pick the endpoint; any local mock
+server speaking JSON-RPC works for tests.
+"""
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend import http_client
+
+PUBLIC_RPC_URL = "https://api.mainnet-beta.solana.com"
+BPF_UPGRADEABLE_LOADER = "BPFLoaderUpgradeab1e11111111111111111111111"
+
+# Finalized slot-addressed data never changes, so these are cached across slots
+IMMUTABLE_METHODS = {"getBlock", "getTransaction"}
+UNCACHED_METHODS = {"getSlot"}
+DEPLOY_INSTRUCTIONS = {"deployWithMaxDataLen"}
+DAY_SECONDS = 24 * 60 * 60
+# A program upload is hundreds of buffer Write transactions landing in a few
+# slots, while the deploy / upgrade that follows is sent once the writes are
+# confirmed. Slots with this many loader transactions are upload bursts and
+# are not fetched.
+WRITE_BURST_SLOT_SIZE = 5
+# getTransaction calls allowed per scan; the rest is resumed on the next run
+MAX_LOADER_TRANSACTIONS = 2000
+
+def default_rpc_url():
+    """SOLANA_RPC_URL, else Helius (when HELIUS_API_KEY is set), else the public endpoint"""
+    if os.getenv("SOLANA_RPC_URL"):
+        return os.getenv("SOLANA_RPC_URL")
+    if os.getenv("HELIUS_API_KEY"):
+        return f"https://mainnet.helius-rpc.com/?api-key={os.getenv('HELIUS_API_KEY')}"
+    return PUBLIC_RPC_URL
+
+class SolanaRPCError(Exception):
+    def __init__(self, method, error):
+        self.method = method
+        self.error = error
+        super().__init__(f"{method}: {error.get('message', error) if isinstance(error, dict) else error}")
+
+class SolanaRPCClient:
+    def __init__(self, url=None, max_batch=100, max_workers=4, timeout=30, cache_size=20000):
+        """
+        Args:
+            url: RPC endpoint (defaults to default_rpc_url())
+            max_batch: Calls per JSON-RPC batch request
+            max_workers: Batch requests in flight at once
+            timeout: Per-request timeout in seconds
+            cache_size: Max cached call results (LRU)
+        """
+        self.url = url or default_rpc_url()
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._slot = None
+        self.requests_sent = 0
+
+    def _cache_key(self, method, params):
+        # Mutable views (latest signatures, account sets) are only reused within one slot
+        slot = None if method in IMMUTABLE_METHODS else self._slot
+        return (method, json.dumps(params, sort_keys=True), slot)
+
+    def _store(self, key, result):
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _send_chunk(self, chunk):
+        """POST one JSON-RPC batch array and resolve its futures"""
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (_, method, params, _) in enumerate(chunk)
+        ]
+        try:
+            response = http_client.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+            if isinstance(body, dict):
+                # Some servers answer a whole-batch failure with a single error object
+                body = [dict(body, id=i) for i in range(len(chunk))]
+            replies = {reply.get("id"): reply for reply in body}
+
+            for i, (key, method, _, future) in enumerate(chunk):
+                reply = replies.get(i, {"error": {"message": "missing reply"}})
+                if "error" in reply:
+                    future.set_exception(SolanaRPCError(method, reply["error"]))
+                else:
+                    result = reply.get("result")
+                    # A null getTransaction / getBlock means "not available yet" (or
+                    # pruned on this node), not a final answer, so it is asked again
+                    if method not in UNCACHED_METHODS and not (result is None and method in IMMUTABLE_METHODS):
+                        self._store(key, result)
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, _, future in chunk:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self.requests_sent += 1
+                for key, _, _, _ in chunk:
+                    self._inflight.pop(key, None)
+
+    def batch(self, calls, return_exceptions=False):
+        """
+        Execute many RPC calls as batched requests.
+
+        Args:
+            calls: list of (method, params)
+            return_exceptions: Return errors in place of results instead of raising
+
+        Returns:
+            list of results in the same order as calls
+        """
+        keys = [self._cache_key(method, params) for method, params in calls]
+        futures = {}
+        to_send = []
+
+        with self._lock:
+            for key, (method, params) in zip(keys, calls):
+                if key in futures:
+                    continue
+                if key in self._cache and method not in UNCACHED_METHODS:
+                    self._cache.move_to_end(key)
+                    future = Future()
+                    future.set_result(self._cache[key])
+                elif key in self._inflight:
+                    # Coalesce with an identical call another thread already sent
+                    future = self._inflight[key]
+                else:
+                    future = Future()
+                    self._inflight[key] = future
+                    to_send.append((key, method, params, future))
+                futures[key] = future
+
+        chunks = [to_send[i:i + self.max_batch] for i in range(0, len(to_send), self.max_batch)]
+        for chunk in chunks:
+            self._executor.submit(self._send_chunk, chunk)
+        wait(list(futures.values()))
+
+        results = []
+        for key in keys:
+            error = futures[key].exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else futures[key].result())
+        return results
+
+    def call(self, method, params=None):
+        return self.batch([(method, params or [])])[0]
+
+    def refresh_slot(self, commitment="finalized"):
+        """Pin the slot used to key mutable cache entries"""
+        self._slot = self.call("getSlot", [{"commitment": commitment}])
+        return self._slot
+
+    def get_signatures_for_address(self, address, before=None, until=None, limit=1000):
+        options = {"limit": limit, "commitment": "finalized"}
+        if before:
+            options["before"] = before
+        if until:
+            options["until"] = until
+        return self.call("getSignaturesForAddress", [address, options])
+
+    def get_transactions(self, signatures):
+        """Fetch parsed transactions in batches (None for ones the node no longer has)"""
+        calls = [
+            ("getTransaction", [sig, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0,
+                                      "commitment": "finalized"}])
+            for sig in signatures
+        ]
+        results = self.batch(calls, return_exceptions=True)
+        return [None if isinstance(r, Exception) else r for r in results]
+
+    def get_block(self, slot):
+        return self.call("getBlock", [slot, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0,
+                                             "transactionDetails": "full", "rewards": False}])
+
+    def get_program_accounts(self, program_id, filters=None):
+        options = {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}
+        if filters:
+            options["filters"] = filters
+        return self.call("getProgramAccounts", [program_id, options])
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_rpc_client():
+    """
+    Process-wide client shared by every refresh, so its worker threads and
+    the getTransaction / slot-keyed response cache are reused instead of
+    rebuilt (and leaked) per call
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SolanaRPCClient()
+        return _client
+
+def likely_deploys(entries):
+    """
+    Drop signature entries that cannot be a successful deploy / upgrade:
+    failed transactions and upload bursts (see WRITE_BURST_SLOT_SIZE).
+    Signature listings carry no instruction data, so this is all that can
+    be filtered before getTransaction.
+    """
+    per_slot = Counter(entry.get("slot") for entry in entries)
+    return [
+        entry for entry in entries
+        if entry.get("err") is None and per_slot[entry.get("slot")] < WRITE_BURST_SLOT_SIZE
+    ]
+
+def fetch_loader_signatures(client, days, max_pages, until=None, before=None,
+                            max_signatures=MAX_LOADER_TRANSACTIONS, page_size=1000):
+    """
+    Page through upgradeable-loader signatures newest-first, starting at `before`
+    (or the newest), until the window ends or the `until` signature from a
+    previous run is reached. Only likely deploys / upgrades are kept; upload
+    bursts are counted per slot over every page read, so a slot split across
+    a page boundary is still recognized.
+
+    Returns:
+        (signatures, newest, resume_before): newest is the newest signature
+        listed (kept or not); resume_before is where to continue when
+        max_pages or max_signatures cut the scan short (None when complete)
+    """
+    cutoff = time.time() - days * DAY_SECONDS
+    entries = []
+    newest = None
+    resume_before = before
+    complete = False
+
+    for _ in range(max_pages):
+        page = client.get_signatures_for_address(BPF_UPGRADEABLE_LOADER, before=before, until=until,
+                                                 limit=page_size)
+        if not page:
+            complete = True
+            break
+        newest = newest or page[0]["signature"]
+
+        in_window = [entry for entry in page if not (entry.get("blockTime") and entry["blockTime"] < cutoff)]
+        entries.extend(in_window)
+        if len(in_window) < len(page) or len(page) < page_size:
+            complete = True
+            break
+        before = resume_before = page[-1]["signature"]
+
+    if not complete:
+        # The oldest slot read may continue past the last page: leave all of it
+        # to the next run so its burst size is counted in one piece
+        tail_slot = entries[-1].get("slot") if entries else None
+        head = [entry for entry in entries if entry.get("slot") != tail_slot]
+        if head:
+            entries = head
+            resume_before = head[-1]["signature"]
+
+    signatures = [entry["signature"] for entry in likely_deploys(entries)]
+    if len(signatures) > max_signatures:
+        return signatures[:max_signatures], newest, signatures[max_signatures - 1]
+    return signatures, newest, None if complete else resume_before
+
+def parse_loader_transaction(tx):
+    """
+    Extract developer activity from a jsonParsed loader transaction.
+
+    Returns:
+        dict with block_time, signers, deployed (program ids) and upgraded (program ids)
+    """
+    message = tx["transaction"]["message"]
+    activity = {"block_time": tx.get("blockTime"), "signers": [], "deployed": [], "upgraded": []}
+
+    for key in message.get("accountKeys", []):
+        if isinstance(key, dict) and key.get("signer"):
+            activity["signers"].append(key["pubkey"])
+
+    for instruction in message.get("instructions", []):
+        if instruction.get("programId") != BPF_UPGRADEABLE_LOADER:
+            continue
+        parsed = instruction.get("parsed") or {}
+        program = parsed.get("info", {}).get("programAccount")
+        if parsed.get("type") in DEPLOY_INSTRUCTIONS:
+            activity["deployed"].append(program)
+        elif parsed.get("type") == "upgrade":
+            activity["upgraded"].append(program)
+
+    return activity
+
+def collect_program_activity(client=None, days=14, max_pages=50, max_transactions=MAX_LOADER_TRANSACTIONS):
+    """
+    Count program deployments and active developer wallets over the last N days
+    with exact sets (see onchain_aggregator for the bounded-memory version).
+
+    Returns:
+        dict with program_deployments, program_upgrades, active_developer_wallets,
+        loader_transactions, truncated and window_days
+    """
+    client = client or get_rpc_client()
+    client.refresh_slot()
+
+    signatures, _, resume_before = fetch_loader_signatures(client, days, max_pages, max_signatures=max_transactions)
+    transactions = client.get_transactions(signatures)
+
+    deployed_programs = set()
+    upgrades = 0
+    wallets = set()
+
+    for tx in transactions:
+        if not tx:
+            continue
+        activity = parse_loader_transaction(tx)
+        wallets.update(activity["signers"])
+        deployed_programs.update(activity["deployed"])
+        upgrades += len(activity["upgraded"])
+
+    return {
+        "program_deployments": len(deployed_programs),
+        "program_upgrades": upgrades,
+        "active_developer_wallets": len(wallets),
+        "loader_transactions": len(signatures),
+        "truncated": resume_before is not None,
+        "window_days": days
+    }
@@ -0,0 +1,179 @@
+"""
+Stargazer Time-Series Store for SignalVane
+Appends one (repo_id, timestamp, stars) record per repo per refresh to a
+flat float64 array file, and keeps small per-repo running state so star
+deltas and spike z-scores are updated incrementally (O(new points)).
+
+Spike z-scores compare the star rate against an exponentially decayed
+baseline of earlier rates, so last month's launch does not mask (or
+inflate) today's spike.
+"""
+import os
+import json
+import math
+import time
+from array import array
+from collections import deque
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "star_history.bin")
+DEFAULT_INDEX_FILE = os.path.join(os.path.dirname(__file__), "data", "star_history_index.json")
+
+DAY_SECONDS = 24 * 60 * 60
+# Observations needed before a spike z-score is reported
+MIN_SPIKE_SAMPLES = 3
+RECORD_WIDTH = 3  # repo_id, timestamp, stars
+# star_delta_24h needs an observation within this distance of t-24h
+ANCHOR_TOLERANCE = 6 * 60 * 60
+# Star rates are measured over at least this long; closer refreshes reuse the
+# last z-score (one star in five minutes is not a 288 stars/day spike)
+MIN_RATE_INTERVAL = 60 * 60
+# Weight of a baseline rate halves every BASELINE_HALF_LIFE
+BASELINE_HALF_LIFE = 3 * DAY_SECONDS
+
+class StarHistory:
+    def __init__(self, data_file=DEFAULT_DATA_FILE, index_file=DEFAULT_INDEX_FILE):
+        self.data_file = data_file
+        self.index_file = index_file
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {"ids": {}, "repos": {}}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            # `recent` windows are deques in memory
+            json.dump(self.index, f, default=list)
+        os.replace(tmp_path, self.index_file)
+
+    def _repo_id(self, full_name):
+        ids = self.index["ids"]
+        if full_name not in ids:
+            ids[full_name] = len(ids)
+        return ids[full_name]
+
+    def _observe(self, state, ts, stars):
+        """
+        Update one repo's running state with a new point.
+        Returns (star_delta_24h, star_spike_z)
+        """
+        _upgrade_state(state)
+        z = state.get("spike_z")
+        if state.get("last_ts") is None:
+            state["last_ts"] = ts
+            state["last_stars"] = stars
+        elif ts - state["last_ts"] >= MIN_RATE_INTERVAL:
+            # Star growth rate per day since the previous rate sample
+            elapsed = ts - state["last_ts"]
+            rate = (stars - state["last_stars"]) * DAY_SECONDS / elapsed
+
+            z = None
+            if state["n"] >= MIN_SPIKE_SAMPLES:
+                mean = state["sum"] / state["w"]
+                std = math.sqrt(max(0.0, state["sum_sq"] / state["w"] - mean * mean))
+                z = round((rate - mean) / std, 2) if std > 0 else 0.0
+
+            # Decay the baseline by the time since the last sample, then add this rate
+            decay = 0.5 ** (elapsed / BASELINE_HALF_LIFE)
+            state["n"] += 1
+            state["w"] = state["w"] * decay + 1
+            state["sum"] = state["sum"] * decay + rate
+            state["sum_sq"] = state["sum_sq"] * decay + rate * rate
+            state["spike_z"] = z
+            state["last_ts"] = ts
+            state["last_stars"] = stars
+
+        # Keep points inside the last 24h plus one anchor just before it
+        recent = state["recent"]
+        if not isinstance(recent, deque):
+            recent = state["recent"] = deque(recent)
+        recent.append([ts, stars])
+        cutoff = ts - DAY_SECONDS
+        while len(recent) > 1 and recent[1][0] <= cutoff:
+            recent.popleft()
+
+        return _delta_since(recent, cutoff, stars), z
+
+    def record(self, repos, timestamp=None):
+        """
+        Append the current star counts and attach star_delta_24h / star_spike_z
+        to each repo dict in place.
+        """
+        if not repos:
+            return repos
+
+        ts = timestamp or time.time()
+        points = array('d')
+
+        for repo in repos:
+            full_name = repo["name"]
+            repo_id = self._repo_id(full_name)
+            state = self.index["repos"].setdefault(
+                full_name,
+                {"last_ts": None, "last_stars": None, "n": 0, "w": 0.0, "sum": 0.0, "sum_sq": 0.0,
+                 "spike_z": None, "recent": []}
+            )
+            star_delta_24h, star_spike_z = self._observe(state, ts, repo["stars"])
+            repo["star_delta_24h"] = star_delta_24h
+            repo["star_spike_z"] = star_spike_z
+            points.extend((repo_id, ts, repo["stars"]))
+
+        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        with open(self.data_file, 'ab') as f:
+            points.tofile(f)
+        self._save_index()
+        return repos
+
+    def read_series(self, full_name):
+        """Full (timestamp, stars) series for one repo (scans the data file)"""
+        repo_id = self.index["ids"].get(full_name)
+        if repo_id is None or not os.path.exists(self.data_file):
+            return []
+
+        data = array('d')
+        with open(self.data_file, 'rb') as f:
+            data.frombytes(f.read())
+
+        return [
+            (data[i + 1], int(data[i + 2]))
+            for i in range(0, len(data) - RECORD_WIDTH + 1, RECORD_WIDTH)
+            if data[i] == repo_id
+        ]
+
+def _upgrade_state(state):
+    """Convert a lifetime Welford baseline (n, mean, m2) from older index files to decayed sums"""
+    if "w" in state:
+        return
+    n, mean = state.get("n", 0), state.pop("mean", 0.0)
+    state["w"] = float(n)
+    state["sum"] = mean * n
+    state["sum_sq"] = state.pop("m2", 0.0) + n * mean * mean
+    state["spike_z"] = None
+
+def _delta_since(recent, cutoff, stars):
+    """
+    Stars gained since `cutoff`, interpolating between the points around it.
+    None when the window does not reach back to the cutoff or no point is
+    within ANCHOR_TOLERANCE of it (sparse refreshes).
+    """
+    if len(recent) < 2 or recent[0][0] > cutoff:
+        return None
+    (t0, s0), (t1, s1) = recent[0], recent[1]
+    if min(cutoff - t0, t1 - cutoff) > ANCHOR_TOLERANCE:
+        return None
+    stars_at_cutoff = s0 + (s1 - s0) * (cutoff - t0) / (t1 - t0)
+    return int(round(stars - stars_at_cutoff))
+
+def record_star_counts(repos):
+    """Persist star counts for a refresh and attach spike fields"""
+    try:
+        return StarHistory().record(repos)
+    except Exception as e:
+        print(f"⚠️  Star history update failed: {e}")
+        return repos
@@ -0,0 +1,162 @@
+"""
+Text Signal Engine for SignalVane
+Batch tokenizer and unigram/bigram counter for social and GitHub text
+(Reddit titles, comment bodies, repo descriptions), with TF-IDF ranking
+against a persisted background corpus so that always-common words do not
+crowd out the distinctive ones.
+"""
+import os
+import re
+import json
+import math
+import threading
+from collections import Counter
+from functools import lru_cache
+
+DEFAULT_CORPUS_FILE = os.path.join(os.path.dirname(__file__), "data", "text_corpus.json")
+
+# Words, acronyms and hyphenated terms ("ZK", "SVM", "token-2022", "zk-compression")
+TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:-[A-Za-z0-9]+)*")
+# Background vocabulary kept on disk (highest document frequency first)
+MAX_BACKGROUND_TERMS = 50000
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further get
+got had has have having he her here hers him his how i if in into is it its itself just like me
+more most my no nor not now of off on once only or other our out over own same she should so some
+such than that the their them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours
+new one use using way make anyone know think want need really still good best any every much many
+reddit post question help update news thread daily discussion
+""".split())
+
+# Ecosystem acronyms normalized to upper-case however they are written ("svm" -> "SVM")
+KNOWN_ACRONYMS = frozenset("""
+zk svm evm nft dao rpc api sdk tps mev ai llm lst dex spl depin rwa tvl cpi idl pda ui ux
+""".split())
+
+@lru_cache(maxsize=100000)
+def _normalize(raw):
+    """
+    Canonical display form of a raw token, or None for stop words / noise.
+    Acronyms are upper-case ("ZK", "SVM"), other words are capitalized.
+    """
+    key = raw.lower()
+    if key in KNOWN_ACRONYMS:
+        return key.upper()
+    # Acronyms like "ZK" are allowed to be short; other words need 3+ chars
+    if key in STOP_WORDS or len(key) < 2 or (len(key) < 3 and not raw.isupper()):
+        return None
+    return raw if raw.isupper() else raw[0].upper() + key[1:]
+
+def tokenize(text):
+    """
+    Split text into normalized tokens. Stop words become None so that
+    bigrams never span them.
+    """
+    return [_normalize(raw) for raw in TOKEN_PATTERN.findall(text)]
+
+def _document_terms(text):
+    """(unigrams, bigrams) of one document, with repeats"""
+    tokens = tokenize(text)
+    unigrams = [t for t in tokens if t]
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:]) if a and b and a != b]
+    return unigrams, bigrams
+
+def extract_terms(text):
+    """Unigram and bigram display terms of one document (with repeats)"""
+    unigrams, bigrams = _document_terms(text)
+    return unigrams + bigrams
+
+class TextSignalEngine:
+    def __init__(self, corpus_file=DEFAULT_CORPUS_FILE):
+        self.corpus_file = corpus_file
+        self._lock = threading.Lock()
+        self.reset()
+        self.background = self._load_background()
+
+    def reset(self):
+        """Clear the current batch counters"""
+        self.unigrams = Counter()
+        self.bigrams = Counter()
+        self.doc_freq = Counter()
+        self.documents = 0
+
+    def _load_background(self):
+        if os.path.exists(self.corpus_file):
+            try:
+                with open(self.corpus_file, 'r') as f:
+                    data = json.load(f)
+                return {"documents": data["documents"], "df": Counter(data["df"])}
+            except (OSError, json.JSONDecodeError, KeyError):
+                pass
+        return {"documents": 0, "df": Counter()}
+
+    def save_background(self):
+        """Fold the current batch's document frequencies into the background corpus"""
+        background = self.background
+        background["documents"] += self.documents
+        background["df"].update(self.doc_freq)
+        if len(background["df"]) > MAX_BACKGROUND_TERMS:
+            background["df"] = Counter(dict(background["df"].most_common(MAX_BACKGROUND_TERMS)))
+
+        os.makedirs(os.path.dirname(self.corpus_file), exist_ok=True)
+        tmp_path = f"{self.corpus_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"documents": background["documents"], "df": dict(background["df"])}, f)
+        os.replace(tmp_path, self.corpus_file)
+
+    def add_document(self, text):
+        """Tokenize one document into the batch counters (thread-safe); returns its terms"""
+        if not text:
+            return []
+        unigrams, bigrams = _document_terms(text)
+        with self._lock:
+            self.unigrams.update(unigrams)
+            self.bigrams.update(bigrams)
+            self.doc_freq.update(set(unigrams).union(bigrams))
+            self.documents += 1
+        return unigrams + bigrams
+
+    def add_documents(self, texts):
+        """Tokenize a batch of documents; counts are merged once per batch"""
+        unigrams, bigrams, doc_terms = [], [], []
+        documents = 0
+        for text in texts:
+            if not text:
+                continue
+            doc_unigrams, doc_bigrams = _document_terms(text)
+            unigrams.extend(doc_unigrams)
+            bigrams.extend(doc_bigrams)
+            doc_terms.extend(set(doc_unigrams).union(doc_bigrams))
+            documents += 1
+
+        with self._lock:
+            self.unigrams.update(unigrams)
+            self.bigrams.update(bigrams)
+            self.doc_freq.update(doc_terms)
+            self.documents += documents
+        return self
+
+    def idf(self, term):
+        background = self.background
+        return math.log((1 + background["documents"]) / (1 + background["df"].get(term, 0))) + 1
+
+    def rank_terms(self, counts, n=15, min_count=3):
+        """
+        Rank raw term counts by TF-IDF against the background corpus.
+
+        Returns: list of (term, count) in the top_keywords shape
+        """
+        scored = [
+            (count * self.idf(term), term, count)
+            for term, count in counts.items()
+            if count >= min_count
+        ]
+        scored.sort(reverse=True)
+        return [(term, count) for _, term, count in scored[:n]]
+
+    def top_keywords(self, n=15, min_count=3):
+        """Top unigrams and bigrams of the current batch, TF-IDF ranked"""
+        return self.rank_terms(self.unigrams + self.bigrams, n=n, min_count=min_count)
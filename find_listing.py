@@ -1,8 +1,8 @@
 """
 Find the narrative detection bounty listing ID
 """
-import requests
 import json
+from backend import http_client
 
 BASE_URL = "https://superteam.fun"
 
@@ -12,7 +12,7 @@ API_KEY = "sk_7ab9f3e289d3ae384bece0e057f1dc256173cd64cded3eaf47b7746aacb3e521"
 print("🔍 Searching for narrative detection bounty...")
 
 # Discover agent-eligible listings
-response = requests.get(
+response = http_client.get(
     f"{BASE_URL}/api/agents/listings/live?take=50",
     headers={"Authorization": f"Bearer {API_KEY}"}
 )
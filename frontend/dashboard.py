@@ -13,7 +13,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from backend.data_refresher import refresh_data, get_minutes_since_refresh
 from backend.historical_tracker import HistoricalTracker
-from backend.sentiment_analyzer import analyze_narrative_sentiment
+from backend.sentiment_analyzer import batch_analyze_narratives
+from backend.metrics_store import MetricsStore
 
 # Page config for Premium Aesthetic
 st.set_page_config(
@@ -278,17 +279,31 @@ def load_data():
     return snapshot, narratives, ideas
 
 @st.cache_data(ttl=300)  # Cache sentiment analysis for 5 minutes
-def get_sentiment_score(narrative):
+def get_sentiment_scores(narratives):
     """
-    AI-powered sentiment analysis using Gemini
+    AI-powered sentiment analysis using Gemini, batched into as few requests as possible
     Falls back to heuristic if AI fails
-    """
-    # Try AI analysis first
-    result = analyze_narrative_sentiment(narrative)
-
-    sentiment = result.get('sentiment', 'neutral')
 
-    return sentiment, ""  # No emojis - neo-brutalism style
+    Returns: dict mapping narrative_name to sentiment label
+    """
+    results = batch_analyze_narratives(narratives)
+    return {name: result.get('sentiment', 'neutral') for name, result in results.items()}
+
+@st.cache_data(ttl=300)
+def load_metric_summaries():
+    """Latest numeric metrics keyed by name (value, change_pct, sparkline)"""
+    return {s["metric"]: s for s in MetricsStore().summaries()}
+
+def format_metric_card(summary, fallback_value):
+    """Value, change line and change colour for a metrics-bar card"""
+    if not summary:
+        return fallback_value, "NO DATA", "#888888"
+    unit = "%" if summary["unit"] == "%" else ""
+    value = f"{summary['value']:,.0f}{unit}"
+    change = summary["change_pct"]
+    arrow = "↑" if change >= 0 else "↓"
+    color = "#14F195" if change >= 0 else "#FF4B4B"
+    return value, f"{arrow} {abs(change):.0f}% {summary['sparkline_text']}", color
 
 def get_trend_indicator(trend):
     """Get text-based indicator and class for trend"""
@@ -377,22 +392,29 @@ SYNC: {minutes_ago}m AGO | <span style='color: {"#14F195" if minutes_ago < 5 els
 """, unsafe_allow_html=True)
 
     # Metrics Bar (Custom HTML for Neo-Brutalist look)
+    metric_summaries = load_metric_summaries()
+    programs_value, programs_change, programs_color = format_metric_card(
+        metric_summaries.get("New Program Deployments"), "—")
+    wallets_value, wallets_change, wallets_color = format_metric_card(
+        metric_summaries.get("Active Developer Wallets"), "—")
+    zk_value, zk_change, zk_color = format_metric_card(
+        metric_summaries.get("ZK-Compression Usage"), "—")
     st.markdown(f"""
 <div class="metrics-container">
 <div class="metric-card">
 <div class="metric-label">PROGRAMS (14D)</div>
-<div class="metric-value">142</div>
-<div style="font-size: 11px; font-weight: 800; color: #14F195; margin-top: 5px;">↑ 12%</div>
+<div class="metric-value">{programs_value}</div>
+<div style="font-size: 11px; font-weight: 800; color: {programs_color}; margin-top: 5px;">{programs_change}</div>
 </div>
 <div class="metric-card">
 <div class="metric-label">DEV DENSITY</div>
-<div class="metric-value">2,450</div>
-<div style="font-size: 11px; font-weight: 800; color: #14F195; margin-top: 5px;">↑ 8%</div>
+<div class="metric-value">{wallets_value}</div>
+<div style="font-size: 11px; font-weight: 800; color: {wallets_color}; margin-top: 5px;">{wallets_change}</div>
 </div>
 <div class="metric-card">
 <div class="metric-label">ZK MOMENTUM</div>
-<div class="metric-value">45%</div>
-<div style="font-size: 11px; font-weight: 800; color: #9945FF; margin-top: 5px;">PEAK</div>
+<div class="metric-value">{zk_value}</div>
+<div style="font-size: 11px; font-weight: 800; color: {zk_color}; margin-top: 5px;">{zk_change}</div>
 </div>
 <div class="metric-card">
 <div class="metric-label">NARRATIVES</div>
@@ -450,8 +472,9 @@ BUILT BY AAKASH
 
     # Filter and sort narratives
     filtered_narratives = []
+    sentiments = get_sentiment_scores(narratives)
     for narrative in narratives:
-        sentiment, _ = get_sentiment_score(narrative)
+        sentiment = sentiments.get(narrative['narrative_name'], 'neutral')
         trend = trends.get(narrative['narrative_name'], 'new')
 
         if sentiment in sentiment_filter and trend in trend_filter:
@@ -475,7 +498,7 @@ BUILT BY AAKASH
     for idx, narrative in enumerate(filtered_narratives):
         with st.container():
             trend_label, trend_class = get_trend_indicator(narrative['trend'])
-            sentiment, _ = get_sentiment_score(narrative)
+            sentiment = narrative['sentiment']
 
             st.markdown(f"""
 <div class="narrative-card">
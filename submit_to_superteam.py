@@ -2,8 +2,8 @@
 Superteam Earn Agent Submission Script
 Submits SignalVane to the narrative detection bounty
 """
-import requests
 import json
+from backend import http_client
 
 BASE_URL = "https://superteam.fun"
 
@@ -11,10 +11,11 @@ def register_agent():
     """Step 1: Register as an agent"""
     print("🤖 Step 1: Registering SignalVane agent...")
 
-    response = requests.post(
+    response = http_client.post(
         f"{BASE_URL}/api/agents",
         headers={"Content-Type": "application/json"},
-        json={"name": "signalvane-agent"}
+        json={"name": "signalvane-agent"},
+        retries=0
     )
 
     if response.status_code in [200, 201]:
@@ -84,13 +85,14 @@ Built entirely by Claude (AI agent) for Superteam Earn's agent-only bounty.""",
         "telegram": "http://t.me/aakashmusic"
     }
 
-    response = requests.post(
+    response = http_client.post(
         f"{BASE_URL}/api/agents/submissions/create",
         headers={
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         },
-        json=submission
+        json=submission,
+        retries=0
     )
 
     if response.status_code in [200, 201]:
@@ -0,0 +1,45 @@
+from backend.burst_detector import BurstDetector
+
+DAY = 24 * 3600
+NOW = 100 * DAY + 3600
+
+def _fill_baseline(detector, days=7):
+    for day in range(1, days + 1):
+        ts = NOW - day * DAY
+        detector.add_documents(
+            [(f"d{day}-{i}", "solana wallet update", ts) for i in range(10)] +
+            [(f"d{day}-fd", "firedancer testnet", ts)]
+        )
+
+def test_surging_term_outranks_always_popular_term(tmp_path):
+    detector = BurstDetector(str(tmp_path / "burst.json"))
+    _fill_baseline(detector)
+    detector.add_documents(
+        [(f"today-{i}", "solana wallet update", NOW) for i in range(10)] +
+        [(f"today-fd-{i}", "firedancer mainnet", NOW) for i in range(8)]
+    )
+
+    ranked = {t["term"]: t for t in detector.emerging_terms(n=20, timestamp=NOW)}
+    assert ranked["Firedancer"]["score"] > ranked["Wallet"]["score"]
+    assert ranked["Firedancer"]["growth"] > 1 > ranked["Wallet"]["growth"]
+    # Never seen in the baseline: growth is undefined rather than infinite
+    assert ranked["Firedancer Mainnet"]["growth"] is None
+
+def test_refetched_documents_are_counted_once_and_state_persists(tmp_path):
+    detector = BurstDetector(str(tmp_path / "burst.json"))
+    docs = [(f"p{i}", "zk compression airdrop", NOW) for i in range(4)]
+    assert detector.add_documents(docs) == 4
+    assert detector.add_documents(docs) == 0
+    detector.save()
+
+    reopened = BurstDetector(str(tmp_path / "burst.json"))
+    assert reopened.add_documents(docs) == 0
+    terms = {t["term"]: t["count"] for t in reopened.emerging_terms(timestamp=NOW)}
+    assert terms["Compression"] == 4
+
+def test_only_baseline_window_is_kept(tmp_path):
+    detector = BurstDetector(str(tmp_path / "burst.json"), baseline_buckets=3)
+    for day in range(10, -1, -1):
+        detector.add_documents([(f"d{day}", "validator client", NOW - day * DAY)])
+    assert len(detector.buckets) == 4
+    assert detector.emerging_terms(timestamp=NOW + 5 * DAY) == []
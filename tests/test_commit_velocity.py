@@ -0,0 +1,134 @@
+import re
+import json
+import threading
+from datetime import timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from backend import commit_velocity
+from backend.commit_velocity import CommitVelocityTracker, _iso, _utcnow
+
+REPO_PATTERN = re.compile(
+    r'(r\d+): repository\(owner: "([^"]*)", name: "([^"]*)"\).*?'
+    r'history\(since: "([^"]+)", first: (\d+)(?:, after: "([^"]+)")?\)',
+    re.DOTALL
+)
+
+class GraphQLFixture(ThreadingHTTPServer):
+    """Answers batched history queries from {full_name: [(oid, committedDate), ...]} (newest first)"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), GraphQLHandler)
+        self.repos = {}
+        self.queries = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/graphql"
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+        self.server.queries.append(query)
+
+        data = {}
+        for alias, owner, name, since, first, after in REPO_PATTERN.findall(query):
+            commits = self.server.repos.get(f"{owner}/{name}")
+            if commits is None:
+                data[alias] = None
+                continue
+            matching = [c for c in commits if c[1] >= since]
+            start = int(after[1:]) if after else 0
+            page = matching[start:start + int(first)]
+            end = start + len(page)
+            data[alias] = {"defaultBranchRef": {"target": {"history": {
+                "nodes": [{"oid": oid, "committedDate": date} for oid, date in page],
+                "pageInfo": {"hasNextPage": end < len(matching), "endCursor": f"c{end}"},
+            }}}}
+
+        body = json.dumps({"data": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def graphql():
+    server = GraphQLFixture()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _commits(prefix, days_ago):
+    now = _utcnow()
+    return [(f"{prefix}{i}", _iso(now - timedelta(days=d, minutes=i))) for i, d in enumerate(days_ago)]
+
+def _tracker(graphql, tmp_path, **kwargs):
+    return CommitVelocityTracker(state_file=str(tmp_path / "velocity.json"), endpoint=graphql.url,
+                                 token="test", **kwargs)
+
+def test_counts_every_page_of_history(graphql, tmp_path):
+    graphql.repos["a/busy"] = _commits("busy", [0, 1, 1, 2, 3, 5, 8, 13])
+    graphql.repos["a/quiet"] = _commits("quiet", [4])
+    # An old commit outside the 14-day window
+    graphql.repos["a/quiet"] += _commits("old", [20])
+
+    repos = [{"name": "a/busy"}, {"name": "a/quiet"}, {"name": "a/missing"}]
+    _tracker(graphql, tmp_path, page_size=3).attach(repos)
+
+    assert [r["commits_14d"] for r in repos] == [8, 1, None]
+    assert repos[0]["commit_velocity"] == round(8 / 14, 2)
+    # Three rounds of pages for the busy repo, each batched into one query
+    assert len(graphql.queries) == 3
+
+def test_overlap_catches_commits_pushed_after_their_commit_date(graphql, tmp_path):
+    graphql.repos["a/repo"] = _commits("first", [0, 2, 6])
+    tracker = _tracker(graphql, tmp_path)
+    tracker.update(["a/repo"])
+    assert tracker.commits_in_window("a/repo") == 3
+
+    # Pushed now, but committed a day before the last watermark
+    graphql.repos["a/repo"] = _commits("late", [1]) + graphql.repos["a/repo"]
+    tracker = _tracker(graphql, tmp_path)
+    tracker.update(["a/repo"])
+
+    assert tracker.commits_in_window("a/repo") == 4
+    # The second run only re-read the overlap, not the whole window
+    since = re.search(r'since: "([^"]+)"', graphql.queries[-1]).group(1)
+    assert since > _iso(_utcnow() - timedelta(days=4))
+
+def test_failed_page_keeps_the_watermark(graphql, tmp_path, monkeypatch):
+    graphql.repos["a/repo"] = _commits("c", [0, 1, 2, 3])
+    tracker = _tracker(graphql, tmp_path, page_size=2)
+    fetch = tracker._fetch_batch
+
+    def fail_second_page(batch):
+        if any(after for _, _, after in batch):
+            raise RuntimeError("boom")
+        return fetch(batch)
+
+    monkeypatch.setattr(tracker, "_fetch_batch", fail_second_page)
+    tracker.update(["a/repo"])
+
+    entry = tracker.state["repos"]["a/repo"]
+    assert "watermark" not in entry
+    assert len(entry["commits"]) == 2
+    assert tracker.commits_in_window("a/repo") is None
+
+def test_page_cap_keeps_the_watermark(graphql, tmp_path, monkeypatch):
+    monkeypatch.setattr(commit_velocity, "MAX_HISTORY_PAGES", 2)
+    graphql.repos["a/busy"] = _commits("busy", [0, 1, 2, 3, 4, 5])
+    graphql.repos["a/quiet"] = _commits("quiet", [1])
+    tracker = _tracker(graphql, tmp_path, page_size=2)
+    tracker.update(["a/busy", "a/quiet"])
+
+    busy = tracker.state["repos"]["a/busy"]
+    assert "watermark" not in busy
+    assert len(busy["commits"]) == 4
+    assert "watermark" in tracker.state["repos"]["a/quiet"]
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from backend import data_refresher
+from backend.metrics_store import MetricsStore
+
+@pytest.fixture
+def quick_refresh(monkeypatch, tmp_path):
+    """Quick-refresh sources stubbed out, state files under tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "narratives.json").write_text(json.dumps([{"narrative_name": "SVM Rollups"}]))
+    monkeypatch.setattr(data_refresher, "collect_github_signals", lambda **kwargs: [{"name": "a/b", "stars": 5}])
+    monkeypatch.setattr(data_refresher, "fetch_onchain_metrics", lambda: [])
+    monkeypatch.setattr(data_refresher, "REDDIT_AVAILABLE", False)
+    monkeypatch.setattr(data_refresher, "MetricsStore", lambda: MetricsStore(str(tmp_path / "metrics_store")))
+    monkeypatch.setattr(data_refresher, "NARRATIVE_GEN_AVAILABLE", True)
+    return tmp_path
+
+def test_failed_generation_is_reported_as_fallback(quick_refresh, monkeypatch):
+    monkeypatch.setattr(data_refresher, "generate_fresh_narratives",
+                        lambda force=False: (False, 0, {"narratives": None, "signal_similarity": 0.42}))
+
+    success, _, outcome = data_refresher.refresh_data(force=True, regenerate_narratives=True)
+
+    assert success
+    assert outcome == {"narratives": "fallback", "signal_similarity": 0.42}
+    # The quick refresh ran instead
+    assert json.loads((quick_refresh / "data" / "snapshot.json").read_text())["github_signals"] == 1
+
+@pytest.mark.parametrize("narratives", ["regenerated", "reused"])
+def test_generator_outcome_is_passed_through(quick_refresh, monkeypatch, narratives):
+    monkeypatch.setattr(data_refresher, "generate_fresh_narratives",
+                        lambda force=False: (True, 3, {"narratives": narratives, "signal_similarity": 0.9}))
+
+    success, _, outcome = data_refresher.refresh_data(force=True, regenerate_narratives=True)
+
+    assert success and outcome["narratives"] == narratives
+    assert not (quick_refresh / "data" / "snapshot.json").exists()
+
+def test_quick_refresh_keeps_narratives(quick_refresh):
+    success, _, outcome = data_refresher.refresh_data(force=True)
+    assert success and outcome == {"narratives": "kept", "signal_similarity": None}
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from backend import llm_resilience
+from backend.llm_analyzer import NarrativeAnalyzer
+from backend.llm_cache import LLMCache
+
+NARRATIVE = {"narrative_name": "SVM Rollups", "explanation": "...",
+             "evidence": {"github": ["a/b"], "market_intel": []}, "novelty_score": 7}
+SIGNALS = {"github_momentum": [{"name": "a/b", "stars": 10, "description": "svm rollup"}]}
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+class Response(Chunk):
+    pass
+
+class FakeModel:
+    """generate_content stand-in: scripted stream outcomes, then a plain text answer"""
+
+    def __init__(self, streams, text=None):
+        self.streams = list(streams)
+        self.text = text
+        self.calls = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls.append("stream" if stream else "generate")
+        if not stream:
+            return Response(self.text)
+        outcome = self.streams.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if callable(outcome):
+            return outcome()
+        return iter([Chunk(text) for text in outcome])
+
+@pytest.fixture
+def analyzer(monkeypatch, tmp_path):
+    # Fresh breakers / latency trackers and no backoff sleeps
+    monkeypatch.setattr(llm_resilience, "_callers", {})
+    monkeypatch.setattr(llm_resilience, "_breakers", {})
+    monkeypatch.setattr(llm_resilience, "BACKOFF_BASE", 0.01)
+    analyzer = NarrativeAnalyzer(api_key="test", use_cache=False)
+    analyzer.cache = LLMCache(str(tmp_path / "llm_cache.json"))
+    return analyzer
+
+def test_stream_setup_is_retried(analyzer):
+    body = json.dumps([NARRATIVE])
+    analyzer.model = FakeModel([TimeoutError("connect timeout"), [body[:20], body[20:]]])
+
+    assert list(analyzer.stream_narratives(SIGNALS)) == [NARRATIVE]
+    assert analyzer.model.calls == ["stream", "stream"]
+    assert llm_resilience.resilience_stats()["call_sites"]["narratives"]["retries"] == 1
+
+def test_unfinished_empty_stream_falls_back(analyzer):
+    # The stream stops before the first object closes
+    analyzer.model = FakeModel([['[{"narrative_name": "SVM']], text=json.dumps([NARRATIVE]))
+
+    assert list(analyzer.stream_narratives(SIGNALS)) == [NARRATIVE]
+    assert analyzer.model.calls == ["stream", "generate"]
+
+def test_failed_mid_stream_falls_back_before_anything_is_yielded(analyzer):
+    def broken():
+        yield Chunk("[")
+        raise TimeoutError("read timeout")
+
+    analyzer.model = FakeModel([broken], text=json.dumps([NARRATIVE]))
+
+    assert list(analyzer.stream_narratives(SIGNALS)) == [NARRATIVE]
+    assert analyzer.model.calls == ["stream", "generate"]
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from backend.llm_json import JSONArrayStream, repair_json, parse_llm_json, parse_stats
+from backend.llm_schemas import validate_narrative, validate_sentiment, valid_items
+
+NARRATIVE = {"narrative_name": "ZK Compression", "explanation": "Cheaper state",
+             "evidence": {"github": ["lightprotocol/light-protocol"], "market_intel": []}, "novelty_score": 8}
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n[{"a": 1}]\n```', [{"a": 1}]),
+    ('Here you go: {"a": [1, 2]} Hope this helps!', {"a": [1, 2]}),
+    ('[{"a": 1}, {"b": "x]}"}] trailing', [{"a": 1}, {"b": "x]}"}]),
+    # Truncated mid-element: only complete members are kept
+    ('[{"a": 1}, {"b": 2}, {"c": "unfinish', [{"a": 1}, {"b": 2}]),
+    ('{"name": "x", "ideas": [{"t": 1}, {"t": 2', {"name": "x", "ideas": [{"t": 1}]}),
+])
+def test_repair_json(text, expected):
+    assert repair_json(text) == expected
+
+def test_repair_json_expect_and_failure():
+    assert repair_json('note {"x": 1} then [1, 2]', expect='[') == [1, 2]
+    with pytest.raises(ValueError):
+        repair_json("no json here")
+
+def test_parse_llm_json_counts_outcomes():
+    site = "test_parse_outcomes"
+    assert parse_llm_json('[{"a": 1}]', site, expect='[') == [{"a": 1}]
+    assert parse_llm_json('[{"a": 1}, {"b"', site, expect='[') == [{"a": 1}]
+    with pytest.raises(ValueError):
+        parse_llm_json("sorry, I cannot help", site)
+    assert parse_stats()[site] == {"ok": 1, "repaired": 1, "failed": 1, "invalid": 0}
+
+def test_stream_yields_objects_as_they_close():
+    parser = JSONArrayStream()
+    text = "```json\n" + json.dumps([NARRATIVE, {"narrative_name": "Agents"}]) + "\n```"
+    seen = []
+    for i in range(0, len(text), 7):
+        seen.extend(parser.feed(text[i:i + 7]))
+    assert seen == [NARRATIVE, {"narrative_name": "Agents"}]
+    assert parser.finished
+
+def test_narrative_validator_and_valid_items():
+    assert validate_narrative(NARRATIVE) == []
+    broken = dict(NARRATIVE, novelty_score="high", evidence={"github": "not a list"})
+    assert validate_narrative(broken) == [
+        "$.evidence.market_intel: missing",
+        "$.evidence.github: expected array",
+        "$.novelty_score: expected number",
+    ]
+    # Booleans are not numbers
+    assert validate_narrative(dict(NARRATIVE, novelty_score=True)) == ["$.novelty_score: expected number"]
+
+    site = "test_valid_items"
+    assert valid_items([NARRATIVE, broken, "text"], validate_narrative, site) == [NARRATIVE]
+    assert valid_items({"not": "a list"}, validate_narrative, site) == []
+    assert parse_stats()[site]["invalid"] == 3
+
+def test_sentiment_enum():
+    sentiment = {"sentiment": "positive", "confidence": 0.8, "reasoning": "...", "momentum_score": 7}
+    assert validate_sentiment(sentiment) == []
+    assert validate_sentiment(dict(sentiment, sentiment="bullish")) == [
+        "$.sentiment: 'bullish' not one of ['negative', 'neutral', 'positive']"
+    ]
@@ -0,0 +1,41 @@
+import statistics
+
+import pytest
+
+from backend.metrics_engine import RollingMetric, MetricsEngine, metric_status, DAY_SECONDS
+
+def test_rolling_metric_add_and_remove_match_direct_stats():
+    values = [10.0, 12.0, 9.0, 15.0, 11.0, 30.0, 8.0]
+    rolling = RollingMetric(window_seconds=3)
+    for ts, value in enumerate(values):
+        rolling.observe(ts, value)
+
+    # Window of 3 seconds keeps ts 3..6 (cutoff is inclusive of ts - 3)
+    window = values[3:]
+    assert [v for _, v in rolling.points] == window
+    assert rolling.mean == pytest.approx(statistics.mean(window))
+    assert rolling.std() == pytest.approx(statistics.stdev(window))
+
+def test_rolling_metric_removes_down_to_empty():
+    rolling = RollingMetric(window_seconds=1, points=[(0, 5.0), (0.5, 7.0)])
+    z_score, pct_change = rolling.observe(10, 100.0)
+    assert (z_score, pct_change) == (0.0, 0.0)
+    assert rolling.n == 1 and rolling.mean == 100.0 and rolling.m2 == 0.0
+
+def test_rolling_metric_scores_against_the_window():
+    rolling = RollingMetric(window_seconds=DAY_SECONDS, points=[(i, v) for i, v in enumerate([10, 12, 8, 10])])
+    z_score, pct_change = rolling.observe(10, 20.0)
+    assert z_score == pytest.approx((20 - 10) / statistics.stdev([10, 12, 8, 10]))
+    assert pct_change == pytest.approx(100.0)
+    assert metric_status(z_score) == "Hot"
+
+def test_reingest_within_interval_replaces_the_point(tmp_path):
+    state = str(tmp_path / "engine.json")
+    MetricsEngine(state).ingest({"TPS": 100}, timestamp=1_000)
+    MetricsEngine(state).ingest({"TPS": 110}, timestamp=1_000 + DAY_SECONDS)
+
+    first = MetricsEngine(state).ingest({"TPS": 200}, timestamp=1_000 + 2 * DAY_SECONDS)
+    again = MetricsEngine(state).ingest({"TPS": 200}, timestamp=1_000 + 2 * DAY_SECONDS + 30)
+
+    assert first == again
+    assert len(MetricsEngine(state).metrics["TPS"].points) == 3
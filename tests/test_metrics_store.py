@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from backend.metrics_store import MetricsStore, refresh_observations, sparkline_text, DAY_SECONDS
+from backend.scout import MOCK_ONCHAIN_METRICS
+
+def test_round_trip_across_instances(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    now = time.time()
+    for i, value in enumerate([10, 12, 15]):
+        store.append_many([{"metric": "TPS", "value": value, "unit": "tx/s"},
+                           {"metric": "Reddit Posts", "value": 100 + i}], timestamp=now - (2 - i) * 60)
+
+    reopened = MetricsStore(str(tmp_path))
+    timestamps, values = reopened.read("TPS")
+    assert list(values) == [10.0, 12.0, 15.0]
+    assert list(timestamps) == [now - 120, now - 60, now]
+    assert reopened.catalog["TPS"]["unit"] == "tx/s"
+
+    _, recent = reopened.read("TPS", since=now - 90)
+    assert list(recent) == [12.0, 15.0]
+    assert len(reopened.read("Unknown")[1]) == 0
+
+def test_summary_change_and_sparkline(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    now = time.time()
+    store.append("Wallets", 100, timestamp=now - 20 * DAY_SECONDS)
+    for i, value in enumerate([200, 250, 300]):
+        store.append("Wallets", value, timestamp=now - (2 - i) * DAY_SECONDS)
+
+    summary = store.summary("Wallets")
+    # The 20-day-old point is outside the 14-day window
+    assert summary["points"] == 3
+    assert summary["value"] == 300
+    assert summary["change_pct"] == pytest.approx(50.0)
+    assert summary["sparkline_text"] == sparkline_text([200, 250, 300]) == "▁▄█"
+
+def test_numpy_read(tmp_path):
+    np = pytest.importorskip("numpy")
+    store = MetricsStore(str(tmp_path))
+    store.append("TPS", 1.5)
+    _, values = store.read("TPS", as_numpy=True)
+    assert isinstance(values, np.ndarray) and values.tolist() == [1.5]
+
+def test_refresh_observations_skip_placeholder_metrics():
+    live = [{"metric": "New Program Deployments", "raw_value": 12.0, "unit": "programs"}]
+    records = refresh_observations(live + MOCK_ONCHAIN_METRICS, [{"name": "a/b"}] * 3, {"post_count": 7})
+
+    assert [(r["metric"], r["value"]) for r in records] == [
+        ("New Program Deployments", 12.0), ("GitHub Active Repos", 3), ("Reddit Posts", 7)
+    ]
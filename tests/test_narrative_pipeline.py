@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from backend import generate_fresh_narratives as pipeline
+from backend import llm_cache, llm_resilience
+from backend.burst_detector import BurstDetector
+from backend.metrics_store import MetricsStore
+from backend.mock_gemini_server import MockConfig, start_mock_server
+from backend.signal_fingerprint import SignalFingerprintStore
+
+REPOS = [
+    {"name": f"org/zk-{i}", "stars": 900 - 40 * i, "language": "Rust", "commits_14d": 30 - i,
+     "description": f"ZK compression toolkit {i} for Solana programs", "url": "", "updated_at": ""}
+    for i in range(8)
+]
+METRICS = [{"metric": "New Program Deployments", "value": "142", "change": "+12%", "status": "Hot",
+            "raw_value": 142.0, "unit": "programs"}]
+
+@pytest.fixture
+def mock_gemini(monkeypatch, tmp_path):
+    """The generator wired to a local mock Gemini server, with every state file under tmp_path"""
+    server = start_mock_server(config=MockConfig(latency_median=0.01, latency_sigma=0))
+    monkeypatch.setenv("GEMINI_BASE_URL", server.base_url)
+    monkeypatch.setenv("GEMINI_API_KEY", "mock")
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setattr(pipeline, "collect_github_signals", lambda **kwargs: [dict(r) for r in REPOS])
+    monkeypatch.setattr(pipeline, "fetch_onchain_metrics", lambda: [dict(m) for m in METRICS])
+    monkeypatch.setattr(pipeline, "REDDIT_AVAILABLE", False)
+    monkeypatch.setattr(pipeline, "BurstDetector", lambda: BurstDetector(str(tmp_path / "burst.json")))
+    monkeypatch.setattr(pipeline, "MetricsStore", lambda: MetricsStore(str(tmp_path / "metrics_store")))
+    monkeypatch.setattr(pipeline, "SignalFingerprintStore",
+                        lambda: SignalFingerprintStore(str(tmp_path / "fingerprint.json")))
+    monkeypatch.setattr(llm_cache, "_llm_cache", llm_cache.LLMCache(str(tmp_path / "llm_cache.json")))
+    monkeypatch.setattr(llm_resilience, "_callers", {})
+    monkeypatch.setattr(llm_resilience, "_breakers", {})
+
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_generates_then_reuses(mock_gemini, tmp_path, stream):
+    success, count, outcome = pipeline.generate_fresh_narratives(idea_concurrency=4, stream=stream)
+
+    assert success and count > 0
+    assert outcome == {"narratives": "regenerated", "signal_similarity": None}
+    narratives = json.loads((tmp_path / "data" / "narratives.json").read_text())
+    ideas = json.loads((tmp_path / "data" / "ideas.json").read_text())
+    assert len(narratives) == count == len(ideas)
+    assert all(idea_set["ideas"] for idea_set in ideas)
+    snapshot = json.loads((tmp_path / "data" / "snapshot.json").read_text())
+    assert snapshot["narratives_count"] == count
+    assert MetricsStore(str(tmp_path / "metrics_store")).summary("New Program Deployments")["value"] == 142
+
+    calls = mock_gemini.stats_snapshot()
+    assert calls["narratives"] == 1 and calls["ideas"] == count
+
+    # Same signals again: the fingerprint matches and the LLM is not called
+    success, reused, outcome = pipeline.generate_fresh_narratives(idea_concurrency=4, stream=stream)
+    assert success and reused == count
+    assert outcome == {"narratives": "reused", "signal_similarity": 1.0}
+    assert mock_gemini.stats_snapshot() == calls
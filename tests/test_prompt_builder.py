@@ -0,0 +1,80 @@
+from backend.prompt_builder import PromptBuilder, build_signal_prompt, estimate_tokens, RESERVED_LINES
+
+def _lines(prefix, n, width=40):
+    return [(n - i, f"{prefix} {i} " + "x" * width, None) for i in range(n)]
+
+def test_build_stays_within_budget_and_keeps_best_lines():
+    builder = PromptBuilder(budget=200)
+    builder.add_section("Repos", _lines("repo", 50), priority=2)
+    text, report = builder.build()
+
+    assert report["tokens"] <= 200
+    stats = report["sections"]["Repos"]
+    assert 0 < stats["included"] < stats["total"] == 50
+    # Highest scores first, and nothing from the tail
+    assert text.index("repo 0 ") < text.index("repo 1 ")
+    assert "repo 49 " not in text
+
+def test_every_section_gets_reserved_lines_before_any_section_grows():
+    builder = PromptBuilder(budget=150)
+    builder.add_section("High", _lines("high", 40), priority=3)
+    builder.add_section("Low", _lines("low", 40), priority=1)
+    _, report = builder.build()
+
+    assert report["sections"]["Low"]["included"] == RESERVED_LINES
+    assert report["sections"]["High"]["included"] > RESERVED_LINES
+
+def test_max_share_caps_a_section_until_others_are_served():
+    builder = PromptBuilder(budget=400)
+    builder.add_section("Repos", _lines("repo", 100), priority=2, max_share=0.25)
+    builder.add_section("Intel", _lines("intel", 6), priority=1)
+    text, report = builder.build()
+
+    # Intel fits entirely, then Repos takes the leftover budget
+    assert report["sections"]["Intel"]["included"] == 6
+    assert report["sections"]["Repos"]["tokens"] > 0.25 * 400
+    assert report["tokens"] <= 400
+
+def test_duplicate_evidence_is_dropped_across_sections():
+    builder = PromptBuilder()
+    builder.add_section("A", [(2, "ZK Compression surging", None), (1, "zk-compression  surging!", None)], priority=2)
+    builder.add_section("B", [(1, "zk compression surging", None), (0, "Agents", None)], priority=1)
+    text, report = builder.build()
+
+    assert text.lower().count("surging") == 1
+    assert report["sections"]["A"]["duplicates"] == 1
+    assert report["sections"]["B"]["duplicates"] == 1
+
+def test_signal_prompt_trims_repos_to_budget():
+    signals = {
+        "github_momentum": [
+            {"name": f"org/repo{i}", "stars": 1000 - i, "language": "Rust", "description": f"Project number {i} " * 8}
+            for i in range(15)
+        ],
+        "onchain_metrics": [{"metric": "Program Deployments", "value": "142", "change": "+12%",
+                             "z_score": 3.1, "anomaly": True}],
+        "market_intelligence": [{"source": "Reddit", "term": "firedancer", "summary": "firedancer surging"}],
+    }
+    text, report = build_signal_prompt(signals, budget=300, clustered=False)
+
+    assert estimate_tokens(text) == report["tokens"] <= 300
+    assert "Program Deployments: 142 (+12%)" in text
+    assert "firedancer surging" in text
+    assert report["sections"]["GitHub Activity (Last 14 Days)"]["included"] < 15
+
+def test_clustered_prompt_shows_commit_velocity():
+    signals = {
+        "github_momentum": [
+            {"name": f"org/zk-{i}", "stars": 900 - i, "commits_14d": 40 + i,
+             "description": "ZK compression toolkit for Solana programs"}
+            for i in range(12)
+        ],
+        "onchain_metrics": [],
+        "market_intelligence": [{"source": "Reddit", "term": f"term{i}", "summary": f"term{i} surging"}
+                                for i in range(10)],
+    }
+    text, report = build_signal_prompt(signals, clustered=True)
+
+    assert any(title.startswith("Signal Clusters") for title in report["sections"])
+    # The most active repo is the cluster's lead evidence line
+    assert "org/zk-11 (889 stars, 51 commits/14d)" in text
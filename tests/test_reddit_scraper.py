@@ -0,0 +1,113 @@
+import time
+import threading
+
+from backend import http_client, reddit_scraper
+from backend.burst_detector import BurstDetector
+from backend.reddit_ingest import RedditIngestState
+from backend.text_signals import TextSignalEngine
+
+def test_queued_listings_get_their_own_timeout(monkeypatch):
+    release = threading.Event()
+
+    def fake_fetch(name, listing, limit, params=None):
+        if name == "slow":
+            release.wait(5)
+            return []
+        time.sleep(0.2)
+        return [f"{name}-{listing}"]
+
+    monkeypatch.setattr(reddit_scraper, "_fetch_listing_isolated", fake_fetch)
+    tasks = [("slow", "hot", 10, None)] + [(f"r{i}", "hot", 10, None) for i in range(4)]
+    try:
+        # Two workers: the last task starts after two 0.2s waves, well past a shared 0.3s timeout
+        listings = reddit_scraper._run_listing_tasks(tasks, max_workers=2, timeout=0.3)
+    finally:
+        release.set()
+
+    assert ("slow", "hot") not in listings
+    assert listings == {(f"r{i}", "hot"): [f"r{i}-hot"] for i in range(4)}
+
+def test_failed_listing_is_skipped(monkeypatch):
+    def fake_fetch(name, listing, limit, params=None):
+        if name == "broken":
+            raise RuntimeError("boom")
+        return [name]
+
+    monkeypatch.setattr(reddit_scraper, "_fetch_listing_isolated", fake_fetch)
+    listings = reddit_scraper._run_listing_tasks(
+        [("broken", "new", 5, None), ("ok", "new", 5, None)], max_workers=8, timeout=1
+    )
+    assert listings == {("ok", "new"): ["ok"]}
+
+class FakeSubmission:
+    def __init__(self, post_id, title, created_utc, score=10):
+        self.id = post_id
+        self.fullname = f"t3_{post_id}"
+        self.title = title
+        self.created_utc = created_utc
+        self.score = score
+        self.permalink = f"/r/solana/comments/{post_id}"
+
+def _isolate_state(monkeypatch, tmp_path):
+    monkeypatch.setattr(reddit_scraper, "TextSignalEngine",
+                        lambda: TextSignalEngine(str(tmp_path / "corpus.json")))
+    monkeypatch.setattr(reddit_scraper, "BurstDetector",
+                        lambda: BurstDetector(str(tmp_path / "burst.json")))
+    return RedditIngestState(str(tmp_path / "reddit_state.json"))
+
+def test_deleted_anchor_falls_back_to_unanchored_listing(monkeypatch, tmp_path):
+    now = time.time()
+    state = _isolate_state(monkeypatch, tmp_path)
+    state.add_post("solana", "old1", now - 3600, [])
+    state.set_newest("solana", "t3_deleted")
+    posts = [FakeSubmission("new1", "validator client release", now - 60),
+             FakeSubmission("old1", "already counted", now - 3600)]
+    calls = []
+
+    def fake_fetch(name, listing, limit, params=None):
+        calls.append((listing, params))
+        if listing == "new" and params:
+            # Nothing is ever "before" a deleted post
+            return []
+        return posts if listing == "new" else []
+
+    monkeypatch.setattr(reddit_scraper, "_fetch_listing_isolated", fake_fetch)
+    result = reddit_scraper._ingest_incremental(["solana"], days=7, limit=10, max_workers=2,
+                                                timeout=5, state=state)
+
+    assert ("new", {"before": "t3_deleted"}) in calls and ("new", None) in calls
+    assert state.newest("solana") == "t3_new1"
+    # old1 was deduped by is_seen
+    assert result["post_count"] == 2
+
+def test_timed_out_comment_scans_never_touch_the_engine(monkeypatch, tmp_path):
+    release = threading.Event()
+    finished = threading.Event()
+
+    def fake_scan(post_id, max_depth, max_comments):
+        if post_id == "slow":
+            release.wait(5)
+            finished.set()
+            return ["late firedancer comment"] * 50
+        return ["firedancer testnet is live", "firedancer mainnet soon"]
+
+    monkeypatch.setattr(reddit_scraper, "_scan_comments", fake_scan)
+    engine = TextSignalEngine(str(tmp_path / "corpus.json"))
+    results = reddit_scraper.fetch_comment_signals(["fast", "slow"], engine=engine, timeout=0.3)
+
+    release.set()
+    assert finished.wait(5)
+    assert set(results) == {"fast"}
+    assert results["fast"][0] == 2 and results["fast"][1]["Firedancer"] == 2
+    # The abandoned scan finished after the call returned but counted nothing
+    assert engine.documents == 2
+
+def test_praw_does_not_share_the_global_session():
+    reddit = reddit_scraper._make_reddit()
+    session = reddit._core.requestor._http
+
+    assert session is not http_client.get_session()
+    assert session is reddit_scraper._make_reddit()._core.requestor._http
+    # prawcore appends its own User-Agent to the session it is given
+    assert "PRAW" in session.headers["User-Agent"]
+    assert http_client.get_session().headers["User-Agent"] == "SignalVane/1.0"
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import threading
+from email.utils import formatdate
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from backend import http_client, scout
+from backend.http_cache import HTTPCache
+from backend.rate_limiter import GitHubTokenPool
+
+class FakeGitHub(ThreadingHTTPServer):
+    """
+    Search endpoint serving `per_page` items per page. `limited_pages` are
+    rejected as rate limited; `limited_tokens` are rejected on every page.
+    """
+
+    def __init__(self, total=6):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.total = total
+        self.limited_pages = set()
+        self.limited_tokens = set()
+        self.limit_headers = {}
+        self.seen_tokens = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/search/repositories"
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params.get("page", ["1"])[0])
+        per_page = int(params.get("per_page", ["30"])[0])
+        token = self.headers.get("Authorization", "").replace("token ", "")
+        server.seen_tokens.append(token)
+
+        if page in server.limited_pages or token in server.limited_tokens:
+            self._send(403, {"message": "API rate limit exceeded"}, server.limit_headers)
+            return
+
+        start = (page - 1) * per_page
+        items = [{
+            "full_name": f"org/repo{i}", "stargazers_count": 1000 - i, "description": f"repo {i}",
+            "html_url": f"https://github.com/org/repo{i}", "language": "Rust", "pushed_at": "2026-10-01T00:00:00Z",
+        } for i in range(start, min(start + per_page, server.total))]
+
+        headers = {"X-RateLimit-Remaining": "25", "X-RateLimit-Limit": "30",
+                   "X-RateLimit-Reset": str(int(time.time()) + 60), "X-RateLimit-Resource": "search"}
+        if start + per_page < server.total:
+            query = self.path.split("?", 1)[1].replace(f"&page={page}", "")
+            headers["Link"] = f'<{server.url}?{query}&page={page + 1}>; rel="next"'
+        self._send(200, {"items": items}, headers)
+
+@pytest.fixture
+def github(tmp_path, monkeypatch):
+    server = FakeGitHub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setattr(scout, "GITHUB_SEARCH_URL", server.url)
+    monkeypatch.setattr(scout, "_http_cache", HTTPCache(str(tmp_path / "http_cache")))
+    monkeypatch.setattr(scout, "record_star_counts", lambda repos: repos)
+    monkeypatch.setattr(http_client, "DEFAULT_RETRIES", 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _use_pool(monkeypatch, tokens):
+    pool = GitHubTokenPool(tokens=tokens, max_wait=1)
+    monkeypatch.setattr(scout, "get_token_pool", lambda: pool)
+    return pool
+
+def test_rate_limited_deeper_page_keeps_earlier_pages(github, monkeypatch):
+    _use_pool(monkeypatch, ["a"])
+    github.limited_pages = {2}
+    github.limit_headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Limit": "30",
+                            "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+
+    repos = scout.collect_github_signals(queries=["solana"], pages=3, per_page=2)
+
+    assert [r["name"] for r in repos] == ["org/repo0", "org/repo1"]
+
+def test_rate_limited_token_falls_through_to_the_next(github, monkeypatch):
+    pool = _use_pool(monkeypatch, ["a", "b"])
+    github.limited_tokens = {"a"}
+    github.limit_headers = {"Retry-After": formatdate(time.time() + 3600, usegmt=True)}
+
+    repos = scout.collect_github_signals(queries=["solana"], pages=3, per_page=2)
+
+    assert len(repos) == 6
+    assert "b" in github.seen_tokens
+    # Token "a" is parked until the HTTP-date in Retry-After
+    parked = {b["token"]: b for b in pool.status()}["...a"]
+    assert parked["remaining"] == 0 and parked["reset"] > time.time() + 3000
+
+def test_retry_after_parsing():
+    now = time.time()
+    assert scout._retry_after_seconds({"Retry-After": "30"}) == 30
+    assert 590 < scout._retry_after_seconds({"Retry-After": formatdate(now + 600, usegmt=True)}) <= 600
+    assert 890 < scout._retry_after_seconds({"X-RateLimit-Reset": str(int(now) + 900)}) <= 900
+    assert scout._retry_after_seconds({"Retry-After": "soon"}) == 60
+
+def test_unvalidated_responses_are_served_stale(github, monkeypatch):
+    # FakeGitHub sends no ETag / Last-Modified
+    _use_pool(monkeypatch, ["a"])
+    fresh = scout.collect_github_signals(queries=["solana"], pages=1, per_page=2)
+
+    github.limited_tokens = {"a"}
+    github.limit_headers = {"Retry-After": "3600"}
+    stale = scout.collect_github_signals(queries=["solana"], pages=1, per_page=2)
+
+    assert [r["name"] for r in stale] == [r["name"] for r in fresh] == ["org/repo0", "org/repo1"]
+    # Cached without validators, so later requests stay unconditional
+    cache_dir = scout._http_cache.cache_dir
+    entries = [json.load(open(os.path.join(cache_dir, name))) for name in os.listdir(cache_dir)]
+    assert entries and all(scout._http_cache.conditional_headers(e) == {} for e in entries)
@@ -0,0 +1,42 @@
+from backend.signal_fingerprint import SignalFingerprintStore, signal_features, weighted_jaccard, fingerprint_digest
+
+def _signals(repos, terms, status="Hot"):
+    return {
+        "github_momentum": [{"name": name, "stars": stars} for name, stars in repos],
+        "market_intelligence": [{"term": term, "summary": f"{term} surging"} for term in terms],
+        "onchain_metrics": [{"metric": "New Program Deployments", "status": status}],
+    }
+
+BASE = _signals([("a/zk", 900), ("b/agents", 400), ("c/depin", 120)], ["zk compression", "agents", "depin"])
+
+def test_features_are_case_and_whitespace_insensitive():
+    shouted = _signals([("A/ZK", 900), ("B/Agents", 400), ("c/depin", 120)],
+                       ["ZK  Compression", "agents", "DePIN"])
+    assert fingerprint_digest(signal_features(shouted)) == fingerprint_digest(signal_features(BASE))
+    assert weighted_jaccard({}, {}) == 1.0
+
+def test_first_generation_always_runs(tmp_path):
+    store = SignalFingerprintStore(str(tmp_path / "fingerprint.json"))
+    assert store.should_regenerate(signal_features(BASE)) == (True, None)
+
+def test_reuse_until_signals_move(tmp_path):
+    store = SignalFingerprintStore(str(tmp_path / "fingerprint.json"))
+    store.record(signal_features(BASE))
+    reopened = SignalFingerprintStore(str(tmp_path / "fingerprint.json"))
+
+    regenerate, similarity = reopened.should_regenerate(signal_features(BASE))
+    assert not regenerate and similarity == 1.0
+
+    # A few more stars barely shift the log-scaled weights
+    drifted = _signals([("a/zk", 950), ("b/agents", 410), ("c/depin", 125)], ["zk compression", "agents", "depin"])
+    regenerate, similarity = reopened.should_regenerate(signal_features(drifted))
+    assert not regenerate and similarity > 0.95
+
+    # New repos, new surging terms and a cooling metric are a different story
+    shifted = _signals([("d/rollups", 700), ("e/payments", 500), ("a/zk", 900)],
+                       ["svm rollups", "stablecoins", "zk compression"], status="Cooling")
+    regenerate, similarity = reopened.should_regenerate(signal_features(shifted))
+    assert regenerate and similarity < 0.85
+
+    regenerate, _ = reopened.should_regenerate(signal_features(BASE), force=True)
+    assert regenerate
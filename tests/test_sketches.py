@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from backend.sketches import HyperLogLog, CountMinSketch
+
+def test_hyperloglog_estimates_within_error():
+    hll = HyperLogLog()
+    hll.update(f"wallet-{i}" for i in range(20000))
+    # p=12 gives ~1.6% standard error
+    assert hll.count() == pytest.approx(20000, rel=0.05)
+
+    small = HyperLogLog()
+    small.update(["a", "b", "c", "a", "b"])
+    assert small.count() == 3
+
+def test_hyperloglog_merge_is_a_union_and_survives_json():
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(f"w{i}" for i in range(0, 6000))
+    right.update(f"w{i}" for i in range(3000, 9000))
+
+    restored = HyperLogLog.from_dict(json.loads(json.dumps(left.to_dict())))
+    assert restored.count() == left.count()
+    assert restored.merge(right).count() == pytest.approx(9000, rel=0.05)
+
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(p=10))
+
+def test_count_min_never_undercounts():
+    cms = CountMinSketch(width=64, depth=4)
+    truth = {f"program-{i}": i % 7 + 1 for i in range(300)}
+    for key, count in truth.items():
+        cms.add(key, count)
+
+    assert all(cms.estimate(key) >= count for key, count in truth.items())
+    assert cms.total == sum(truth.values())
+
+def test_count_min_merge_and_round_trip():
+    a, b = CountMinSketch(), CountMinSketch()
+    a.add("deploy", 3)
+    b.add("deploy", 2)
+    b.add("upgrade")
+
+    merged = CountMinSketch.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    assert merged.estimate("deploy") == 5
+    assert merged.estimate("upgrade") == 1
+    assert merged.total == 6
+
+    with pytest.raises(ValueError):
+        a.merge(CountMinSketch(width=1024))
@@ -0,0 +1,230 @@
+import json
+import time
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from backend import solana_rpc
+from backend.solana_rpc import (
+    SolanaRPCClient, BPF_UPGRADEABLE_LOADER, collect_program_activity, fetch_loader_signatures, get_rpc_client
+)
+from backend.onchain_aggregator import (
+    DailySketch, OnchainSketchStore, aggregate_onchain_activity, MAX_PROGRAM_CANDIDATES
+)
+
+class MockRPC(ThreadingHTTPServer):
+    """
+    JSON-RPC batch server over a newest-first list of loader signature entries
+    and their jsonParsed transactions.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockRPCHandler)
+        self.entries = []
+        self.transactions = {}
+        self.calls = Counter()
+        self.http_requests = 0
+        self.slot = 1000
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def add(self, kind, slot, program=None, signer="dev", err=None):
+        signature = f"sig{len(self.entries)}"
+        block_time = int(time.time()) - 3600
+        self.entries.insert(0, {"signature": signature, "slot": slot, "blockTime": block_time, "err": err})
+        instruction_type = {"deploy": "deployWithMaxDataLen", "upgrade": "upgrade", "write": "write"}[kind]
+        self.transactions[signature] = {
+            "blockTime": block_time,
+            "transaction": {"message": {
+                "accountKeys": [{"pubkey": signer, "signer": True}],
+                "instructions": [{"programId": BPF_UPGRADEABLE_LOADER, "parsed": {
+                    "type": instruction_type, "info": {"programAccount": program},
+                }}],
+            }},
+        }
+        return signature
+
+    def answer(self, method, params):
+        self.calls[method] += 1
+        if method == "getSlot":
+            return self.slot
+        if method == "getTransaction":
+            return self.transactions.get(params[0])
+        if method == "getSignaturesForAddress":
+            options = params[1]
+            signatures = [e["signature"] for e in self.entries]
+            start = signatures.index(options["before"]) + 1 if options.get("before") else 0
+            end = signatures.index(options["until"]) if options.get("until") else len(signatures)
+            return self.entries[start:end][:options["limit"]]
+        raise ValueError(method)
+
+class MockRPCHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        requests = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.http_requests += 1
+        replies = [{"jsonrpc": "2.0", "id": r["id"], "result": self.server.answer(r["method"], r["params"])}
+                   for r in requests]
+        body = json.dumps(replies).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def rpc():
+    server = MockRPC()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(rpc):
+    client = SolanaRPCClient(url=rpc.url, max_batch=10)
+    yield client
+    client.close()
+
+def test_transactions_are_batched_and_cached(rpc, client):
+    signatures = [rpc.add("deploy", slot=i, program=f"P{i}") for i in range(25)]
+
+    first = client.get_transactions(signatures)
+    assert [tx["blockTime"] for tx in first] == [rpc.transactions[s]["blockTime"] for s in signatures]
+    assert rpc.http_requests == 3
+
+    client.get_transactions(signatures)
+    assert rpc.http_requests == 3
+    assert rpc.calls["getTransaction"] == 25
+
+def test_upload_bursts_and_failures_are_not_fetched(rpc, client):
+    for i in range(40):
+        rpc.add("write", slot=10 + i // 20, signer="alice")
+    rpc.add("deploy", slot=20, program="A", signer="alice")
+    rpc.add("deploy", slot=21, program="B", signer="bob", err={"InstructionError": [0, "Custom"]})
+    rpc.add("upgrade", slot=22, program="C", signer="carol")
+
+    activity = collect_program_activity(client)
+
+    assert rpc.calls["getTransaction"] == 2
+    assert activity["program_deployments"] == 1
+    assert activity["program_upgrades"] == 1
+    assert activity["active_developer_wallets"] == 2
+    assert activity["truncated"] is False
+
+def test_signature_pages_stop_at_the_until_watermark(rpc, client):
+    old = rpc.add("deploy", slot=1, program="old")
+    new = [rpc.add("deploy", slot=2 + i, program=f"P{i}") for i in range(5)]
+
+    signatures, newest, resume = fetch_loader_signatures(client, 14, max_pages=10, until=old, page_size=2)
+
+    assert signatures == new[::-1]
+    assert newest == new[-1] and resume is None
+
+def test_truncated_scan_is_backfilled_on_later_runs(rpc, client, tmp_path):
+    store = OnchainSketchStore(str(tmp_path / "sketches"))
+    for i in range(7):
+        rpc.add("deploy", slot=i, program=f"P{i}", signer=f"dev{i}")
+
+    result = aggregate_onchain_activity(client, store=store, max_transactions=3)
+    assert result["new_transactions"] == 3 and result["pending_gaps"] == 1
+
+    # New activity arrives; the head is scanned first, then the gap resumes
+    rpc.add("upgrade", slot=100, program="P0", signer="dev0")
+    result = aggregate_onchain_activity(client, store=store, max_transactions=3)
+    assert result["new_transactions"] == 3 and result["pending_gaps"] == 1
+
+    result = aggregate_onchain_activity(client, store=store, max_transactions=3)
+    assert result["new_transactions"] == 2 and result["pending_gaps"] == 0
+    assert result["program_deployments"] == 7
+    assert result["program_upgrades"] == 1
+    assert rpc.calls["getTransaction"] == 8
+
+def test_default_client_is_shared_across_refreshes(rpc, monkeypatch, tmp_path):
+    monkeypatch.setenv("SOLANA_RPC_URL", rpc.url)
+    monkeypatch.setattr(solana_rpc, "_client", None)
+    rpc.add("deploy", slot=1, program="A")
+    threads_before = threading.active_count()
+
+    for _ in range(3):
+        aggregate_onchain_activity(store=OnchainSketchStore(str(tmp_path / "sketches")))
+
+    client = get_rpc_client()
+    assert client is get_rpc_client()
+    assert client.requests_sent > 0
+    assert threading.active_count() <= threads_before + client._executor._max_workers
+    client.close()
+
+def test_client_context_manager_shuts_down_its_pool(rpc):
+    with SolanaRPCClient(url=rpc.url) as client:
+        assert client.refresh_slot() == rpc.slot
+    assert client._executor._shutdown
+
+def test_most_active_programs_are_reported(rpc, client, tmp_path):
+    store = OnchainSketchStore(str(tmp_path / "sketches"))
+    rpc.add("deploy", slot=1, program="A")
+    rpc.add("deploy", slot=2, program="B")
+    for i in range(3):
+        rpc.add("upgrade", slot=10 + i, program="B")
+    rpc.add("upgrade", slot=20, program="A")
+
+    result = aggregate_onchain_activity(client, store=store)
+    assert result["most_active_programs"] == [{"program": "B", "activity": 4}, {"program": "A", "activity": 2}]
+
+    # Candidates persist with the daily sketch, so the window still ranks them on the next run
+    rpc.add("upgrade", slot=30, program="A")
+    rpc.add("upgrade", slot=31, program="A")
+    rpc.add("upgrade", slot=32, program="A")
+    result = aggregate_onchain_activity(client, store=store)
+    assert [p["program"] for p in result["most_active_programs"]] == ["A", "B"]
+
+def test_program_candidates_stay_bounded():
+    sketch = DailySketch()
+    for i in range(3 * MAX_PROGRAM_CANDIDATES):
+        activity = {"signers": [], "deployed": [f"P{i}"], "upgraded": [f"P{i}"] * (i % 2)}
+        sketch.add(activity)
+        sketch.add({"signers": [], "deployed": [], "upgraded": ["hot"] * 2})
+
+    assert len(sketch.candidates) <= 2 * MAX_PROGRAM_CANDIDATES
+    assert sketch.most_active(1)[0]["program"] == "hot"
+    restored = DailySketch(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.most_active() == sketch.most_active()
+
+def test_unavailable_transactions_are_not_cached(rpc, client):
+    signature = rpc.add("deploy", slot=5, program="A")
+    transaction = rpc.transactions.pop(signature)
+
+    # Not indexed yet: the node answers null
+    assert client.get_transactions([signature]) == [None]
+    rpc.transactions[signature] = transaction
+    assert client.get_transactions([signature]) == [transaction]
+    assert client.get_transactions([signature]) == [transaction]
+    assert rpc.calls["getTransaction"] == 2
+
+def test_upload_burst_split_across_pages_is_filtered(rpc, client):
+    old = rpc.add("deploy", slot=30, program="A")
+    for _ in range(6):
+        rpc.add("write", slot=40)
+    new = rpc.add("upgrade", slot=50, program="A")
+
+    # Pages of 4: the slot-40 burst straddles the first page boundary
+    signatures, _, resume = fetch_loader_signatures(client, 14, max_pages=10, page_size=4)
+    assert signatures == [new, old] and resume is None
+
+def test_page_cap_leaves_the_oldest_slot_for_the_next_run(rpc, client):
+    old = rpc.add("deploy", slot=30, program="A")
+    for _ in range(6):
+        rpc.add("write", slot=40)
+    new = rpc.add("upgrade", slot=50, program="A")
+
+    signatures, _, resume = fetch_loader_signatures(client, 14, max_pages=1, page_size=4)
+    assert signatures == [new] and resume == new
+
+    signatures, _, resume = fetch_loader_signatures(client, 14, max_pages=10, page_size=4, before=resume)
+    assert signatures == [old] and resume is None
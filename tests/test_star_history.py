@@ -0,0 +1,85 @@
+from backend.star_history import StarHistory, DAY_SECONDS
+
+HOUR = 60 * 60
+
+def _record(history, ts, stars):
+    repo = {"name": "a/repo", "stars": stars}
+    history.record([repo], timestamp=ts)
+    return repo
+
+def test_delta_interpolates_to_24h_ago(tmp_path):
+    history = StarHistory(str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t = 1_000_000
+    _record(history, t, 100)
+    _record(history, t + 4 * HOUR, 140)
+    repo = _record(history, t + DAY_SECONDS + 2 * HOUR, 200)
+
+    # t-24h falls halfway between the first two points (120 stars)
+    assert repo["star_delta_24h"] == 80
+
+    # The first point is no longer needed once a later one is older than 24h
+    _record(history, t + DAY_SECONDS + 6 * HOUR, 210)
+    assert [p[0] for p in history.index["repos"]["a/repo"]["recent"]] == [
+        t + 4 * HOUR, t + DAY_SECONDS + 2 * HOUR, t + DAY_SECONDS + 6 * HOUR
+    ]
+
+def test_delta_is_none_when_refreshes_are_sparse(tmp_path):
+    history = StarHistory(str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t = 1_000_000
+    _record(history, t, 100)
+    repo = _record(history, t + 4 * DAY_SECONDS, 180)
+    assert repo["star_delta_24h"] is None
+
+    # Daily refreshes anchor on the previous point
+    repo = _record(history, t + 5 * DAY_SECONDS, 190)
+    assert repo["star_delta_24h"] == 10
+
+def test_state_survives_a_reload(tmp_path):
+    paths = (str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t = 1_000_000
+    _record(StarHistory(*paths), t, 100)
+    _record(StarHistory(*paths), t + 12 * HOUR, 110)
+    repo = _record(StarHistory(*paths), t + DAY_SECONDS, 130)
+
+    assert repo["star_delta_24h"] == 30
+    assert StarHistory(*paths).read_series("a/repo") == [(t, 100), (t + 12 * HOUR, 110), (t + DAY_SECONDS, 130)]
+
+def test_close_refreshes_do_not_create_rate_samples(tmp_path):
+    history = StarHistory(str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t = 1_000_000
+    for i in range(6):
+        # Slightly uneven hourly growth so the baseline has some spread
+        repo = _record(history, t + i * HOUR, 100 + 10 * i + i % 2)
+    state = history.index["repos"]["a/repo"]
+    samples, z = state["n"], repo["star_spike_z"]
+
+    # One star five minutes later would be a 288 stars/day "spike"
+    repo = _record(history, t + 5 * HOUR + 5 * 60, 152)
+    assert state["n"] == samples
+    assert repo["star_spike_z"] == z
+    assert abs(z) < 3
+
+def test_baseline_decays_old_launch_spikes(tmp_path):
+    history = StarHistory(str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t, stars = 1_000_000, 0
+    # A launch week at ~1000 stars/day, then five quiet weeks at ~10/day
+    for day in range(42):
+        stars += 1000 if day < 7 else 10 + day % 3
+        _record(history, t + day * DAY_SECONDS, stars)
+
+    repo = _record(history, t + 42 * DAY_SECONDS, stars + 200)
+    # Against a lifetime mean the launch would hide this; against the decayed baseline it stands out
+    assert repo["star_spike_z"] > 3
+
+def test_lifetime_state_from_older_index_files_is_converted(tmp_path):
+    history = StarHistory(str(tmp_path / "stars.bin"), str(tmp_path / "index.json"))
+    t = 1_000_000
+    history.index["repos"]["a/repo"] = {"last_ts": t, "last_stars": 100, "n": 4, "mean": 10.0, "m2": 30.0,
+                                        "recent": [[t, 100]]}
+    repo = _record(history, t + DAY_SECONDS, 110)
+
+    state = history.index["repos"]["a/repo"]
+    assert "mean" not in state and "m2" not in state
+    assert state["n"] == 5
+    # The first rate after the conversion is scored against the old baseline (10/day)
+    assert repo["star_spike_z"] == 0.0